@@ -0,0 +1,46 @@
+"""Import-time benchmark.
+Measures the time to import foodunits and its entry points in fresh interpreters,
+and fails if the median exceeds the budget.
+
+    $ python benchmarks/bench_import.py
+"""
+import statistics
+import subprocess
+import sys
+
+# statement -> budget in milliseconds, on top of the bare interpreter start
+BUDGETS = {
+    "import foodunits": 10,
+    "from foodunits import units_validator": 60,
+    "from foodunits import units_convertor": 70,
+    "from foodunits import units_convertor_batch": 200,
+}
+REPEAT = 7
+
+
+def _time(statement: str) -> float:
+    """Internal: Median wall time in milliseconds of a statement in a fresh interpreter."""
+    script = (
+        "import time; start = time.perf_counter(); "
+        f"{statement}; "
+        "print((time.perf_counter() - start) * 1000)"
+    )
+    timings = [
+        float(subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout)
+        for _ in range(REPEAT)
+    ]
+    return statistics.median(timings)
+
+
+def main() -> int:
+    failed = False
+    for statement, budget in BUDGETS.items():
+        elapsed = _time(statement)
+        status = "ok" if elapsed <= budget else "OVER BUDGET"
+        failed |= elapsed > budget
+        print(f"{statement:<48} {elapsed:8.1f} ms  (budget {budget} ms)  {status}")
+    return int(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""Arithmetic mode benchmark.
+Measures the cost of one `units_convertor` call in every arithmetic mode, on the same inputs.
+
+    $ python benchmarks/bench_modes.py
+"""
+import sys
+import timeit
+from foodunits.convertor import units_convertor, MODES
+
+# (value, to_unit, from_unit, ingredient, ingredient_density, country)
+CASES = {
+    "metric": ("250 ml", "l", None, None, None, None),
+    "metric to imperial": ("1 1/2 fluid ounces", "ml", None, None, None, None),
+    "container + density": ("2.5 cups", "g", None, "skimmed milk", None, "US"),
+}
+NUMBER = 2000
+REPEAT = 5
+
+
+def main() -> int:
+    print(f"{'case':<22}" + "".join(f"{mode:>12}" for mode in MODES) + "   (us per call)")
+    for name, case in CASES.items():
+        timings = []
+        for mode in MODES:
+            units_convertor(*case, mode=mode)  # warm the caches
+            best = min(timeit.repeat(lambda: units_convertor(*case, mode=mode), number=NUMBER, repeat=REPEAT))
+            timings.append(best / NUMBER * 1e6)
+        print(f"{name:<22}" + "".join(f"{timing:12.2f}" for timing in timings))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
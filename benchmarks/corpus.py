@@ -0,0 +1,114 @@
+"""Synthetic recipe corpora for the benchmarks, generated from a fixed seed so runs are comparable."""
+import random
+from typing import Dict, List, Tuple
+from foodunits.utils.units import Convert_Dict
+
+SEED = 20230701
+
+QUANTITIES = ["1", "2", "3", "1/2", "1 1/2", "2.5", "0.75", "one", "two", "twenty five", "1/4", "100", "250", "1.5"]
+VOLUME_UNITS = ["cup", "cups", "tbsp", "tablespoons", "tsp", "teaspoon", "ml", "mls", "l", "fl oz", "fluid ounces", "pint", "qt"]
+MASS_UNITS = ["g", "grams", "kg", "oz", "ounces", "lb", "lbs", "mg"]
+OTHER_UNITS = ["slice", "pinch", "can", "clove", "bunch"]
+COUNTRIES = ["US", "United States", "uk", "United Kingdom", "Canada", "au", "Japan", "metric", "fr", "Germany"]
+TYPOS = str.maketrans({"a": "e", "o": "0", "i": "y"})
+
+
+def _rng() -> random.Random:
+    return random.Random(SEED)
+
+
+def ingredient_lines(size: int) -> List[str]:
+    """Quantity + unit strings, with the punctuation and spacing of scraped recipes."""
+    rng = _rng()
+    units = VOLUME_UNITS + MASS_UNITS + OTHER_UNITS
+    lines = []
+    for _ in range(size):
+        line = f"{rng.choice(QUANTITIES)} {rng.choice(units)}"
+        if rng.random() < 0.2:
+            line = line.replace(" ", "  ", 1) + "."
+        if rng.random() < 0.1:
+            line = line.title()
+        lines.append(line)
+    return lines
+
+
+def recipe_lines(size: int) -> List[str]:
+    """Full ingredient lines: quantity or range, unit, descriptors, ingredient and notes."""
+    rng = _rng()
+    units = VOLUME_UNITS + MASS_UNITS + OTHER_UNITS
+    names = list(Convert_Dict.ml_to_g_by_ingredient_dict())
+    lines = []
+    for _ in range(size):
+        quantity = rng.choice(QUANTITIES)
+        if rng.random() < 0.1:
+            quantity = f"{rng.randint(1, 3)}-{rng.randint(4, 6)}"
+        line = f"{quantity} {rng.choice(units)} {rng.choice(['', 'chopped ', 'sifted '])}{rng.choice(names)}"
+        if rng.random() < 0.2:
+            line += ", to taste"
+        lines.append(line)
+    return lines
+
+
+def localized_lines(size: int) -> List[Tuple[str, str]]:
+    """(locale, quantity + unit string) pairs of a multilingual feed."""
+    rng = _rng()
+    templates = {
+        "de": ["1,5 l", "2 EL", "1 TL", "zwei Tassen", "250 Gramm", "eine Prise"],
+        "fr": ["1,5 l", "2 c. à soupe", "1 c. à café", "deux tasses", "250 grammes"],
+        "ja": ["大さじ1", "小さじ½", "200cc", "1 カップ", "250グラム"],
+        "en": ["1 1/2 cups", "2 tbsp", "one teaspoon", "250 g"],
+    }
+    locales = list(templates)
+    return [(locale, rng.choice(templates[locale])) for locale in (rng.choice(locales) for _ in range(size))]
+
+
+def ingredients(size: int) -> List[str]:
+    """Ingredient names from the density table, a quarter of them with a typo or another word order."""
+    rng = _rng()
+    names = list(Convert_Dict.ml_to_g_by_ingredient_dict())
+    queries = []
+    for _ in range(size):
+        name = rng.choice(names)
+        roll = rng.random()
+        if roll < 0.15:
+            name = name.translate(TYPOS)
+        elif roll < 0.25:
+            name = " ".join(reversed(name.split()))
+        queries.append(name)
+    return queries
+
+
+def density_table(size: int) -> Dict[str, float]:
+    """Density dictionary of the given size: the built-in table padded with generated ingredient names."""
+    rng = _rng()
+    table = dict(Convert_Dict.ml_to_g_by_ingredient_dict())
+    words = [word for name in table for word in name.split()]
+    while len(table) < size:
+        name = " ".join(rng.choice(words) for _ in range(rng.randint(1, 4))) + f" {len(table)}"
+        table[name] = round(rng.uniform(0.2, 2.5), 3)
+    return dict(list(table.items())[:size])
+
+
+def countries(size: int) -> List[str]:
+    rng = _rng()
+    return [rng.choice(COUNTRIES) for _ in range(size)]
+
+
+def conversions(size: int) -> List[Tuple]:
+    """Realistic `units_convertor` arguments: (value, to_unit, from_unit, ingredient, ingredient_density, country)."""
+    rng = _rng()
+    names = ingredients(size)
+    rows = []
+    for i in range(size):
+        kind = rng.random()
+        quantity = rng.choice(QUANTITIES)
+        if kind < 0.4:
+            # Container to mass, e.g. "2 cups flour -> g"
+            rows.append((f"{quantity} {rng.choice(['cup', 'tbsp', 'tsp'])}", "g", None, names[i], None, rng.choice(["US", "uk", "au"])))
+        elif kind < 0.7:
+            rows.append((f"{quantity} {rng.choice(VOLUME_UNITS[6:])}", rng.choice(VOLUME_UNITS[6:]), None, None, None, None))
+        elif kind < 0.9:
+            rows.append((quantity, rng.choice(MASS_UNITS), rng.choice(MASS_UNITS), None, None, None))
+        else:
+            rows.append((quantity, "g", rng.choice(VOLUME_UNITS[6:]), None, round(rng.uniform(0.5, 2), 2), None))
+    return rows
@@ -0,0 +1,209 @@
+"""Benchmark suite.
+Times the parsing, unit resolution, density matching, validation and end-to-end conversion on synthetic
+recipe corpora (see corpus.py), measures the import time and peak memory, and compares every result
+with a stored baseline so regressions are caught.
+
+    $ python benchmarks/run.py                    # compare with benchmarks/baseline.json
+    $ python benchmarks/run.py --filter density   # only the benchmarks whose name contains "density"
+    $ python benchmarks/run.py --save-baseline    # store the results as the new baseline
+
+Baselines are machine dependent, save one on the machine running the comparison.
+The exit status is 1 if a benchmark is slower or uses more memory than the baseline beyond the tolerance.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import timeit
+import tracemalloc
+import warnings
+from typing import Callable, Dict, Iterator, Tuple
+
+import corpus
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# statement -> name of the import benchmark
+IMPORTS = {
+    "import foodunits": "import foodunits",
+    "from foodunits import units_validator": "import units_validator",
+    "from foodunits import units_convertor": "import units_convertor",
+    "from foodunits import units_convertor_batch": "import units_convertor_batch",
+}
+
+
+def _quietly(func: Callable, *args):
+    """Internal: Call a function, conversion failures are part of realistic corpora."""
+    try:
+        return func(*args)
+    except Exception:
+        return None
+
+
+def benchmarks(size: int) -> Iterator[Tuple[str, int, Callable[[], object]]]:
+    """
+    Yield (name, number of items, function processing all items) for every benchmark.
+    The corpora are generated and the lookup tables warmed before timing.
+    """
+    from foodunits import units_convertor, units_validator, units_convertor_batch
+    from foodunits.utils.utils import preprocess, validate_numeric_string, split_quantity_unit
+    from foodunits.utils.utils import get_ingredient_density, find_country
+    from foodunits.utils.parser import parse_quantity_unit
+    from foodunits.lines import parse_ingredient_line
+    from foodunits.locales import get_locale
+    from foodunits.utils.ingredients import IngredientIndex
+
+    lines = corpus.ingredient_lines(size)
+    quantities = [line.split(" ", 1)[0] for line in lines]
+    yield "preprocess", size, lambda: [preprocess(line) for line in lines]
+    yield "validate_numeric_string", size, lambda: [_quietly(validate_numeric_string, q) for q in quantities]
+    yield "split_quantity_unit", size, lambda: [_quietly(split_quantity_unit, line) for line in lines]
+    yield "parse_quantity_unit", size, lambda: [parse_quantity_unit(line) for line in lines]
+    localized = [(get_locale(locale), value) for locale, value in corpus.localized_lines(size)]
+    yield "locale parse_quantity_unit", size, lambda: [pack.parse_quantity_unit(value) for pack, value in localized]
+    recipe_lines = corpus.recipe_lines(size)
+    yield "parse_ingredient_line", size, lambda: [parse_ingredient_line(line) for line in recipe_lines]
+
+    queries = corpus.ingredients(min(size, 500))
+    for table_size in (100, 1000, 10000):
+        table = corpus.density_table(table_size)
+        yield f"ingredient index build {table_size}", table_size, lambda table=table: IngredientIndex(table)
+        get_ingredient_density(queries[0], table)
+        yield (
+            f"get_ingredient_density {table_size}", len(queries),
+            lambda table=table: [get_ingredient_density(query, table) for query in queries],
+        )
+
+    countries = corpus.countries(size)
+    for country in set(countries):
+        find_country(country)
+    yield "find_country", size, lambda: [find_country(country) for country in countries]
+
+    yield "units_validator", size, lambda: [units_validator(line) for line in lines]
+
+    rows = corpus.conversions(size)
+    for row in rows:
+        _quietly(units_convertor, *row)
+    yield "units_convertor", size, lambda: [_quietly(units_convertor, *row) for row in rows]
+    yield "units_convertor fast", size, lambda: [_quietly(units_convertor, *row, None, "fast") for row in rows]
+    yield "units_convertor compact", size, lambda: [
+        _quietly(units_convertor, *row, None, "fast", False) for row in rows
+    ]
+    columns = list(zip(*rows))
+    yield "units_convertor_batch", size, lambda: units_convertor_batch(
+        columns[0], columns[1], columns[2],
+        ingredients=columns[3], ingredient_densities=columns[4], countries=columns[5],
+    )
+
+
+def _measure(function: Callable, repeat: int) -> Tuple[float, float]:
+    """Internal: Median seconds of one call, and peak traced memory in KiB of one call."""
+    number, _ = timeit.Timer(function).autorange()
+    seconds = statistics.median(timeit.repeat(function, number=number, repeat=repeat)) / number
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1024
+
+
+def _measure_import(statement: str, repeat: int) -> Tuple[float, float]:
+    """Internal: Median seconds of an import in fresh interpreters, and the peak resident memory in KiB."""
+    script = (
+        "import resource, time; start = time.perf_counter(); "
+        f"{statement}; "
+        "print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    )
+    runs = [
+        subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout.split()
+        for _ in range(repeat)
+    ]
+    return statistics.median(float(run[0]) for run in runs), statistics.median(float(run[1]) for run in runs)
+
+
+def run(size: int, repeat: int, name_filter: str = None) -> Dict[str, Dict[str, float]]:
+    """
+    Run the benchmarks.
+    Returns:
+        Dict: benchmark name -> {"seconds": per call, "per_item_us": per item, "peak_kib": peak memory}
+    """
+    results = {}
+    for statement, name in IMPORTS.items():
+        if name_filter and name_filter not in name:
+            continue
+        seconds, peak = _measure_import(statement, repeat)
+        results[name] = {"seconds": seconds, "per_item_us": seconds * 1e6, "peak_kib": peak}
+        _report(name, results[name])
+    for name, items, function in benchmarks(size):
+        if name_filter and name_filter not in name:
+            continue
+        seconds, peak = _measure(function, repeat)
+        results[name] = {"seconds": seconds, "per_item_us": seconds / items * 1e6, "peak_kib": peak}
+        _report(name, results[name])
+    return results
+
+
+def _report(name: str, result: Dict[str, float], baseline: Dict[str, float] = None, status: str = ""):
+    """Internal: Print one result line."""
+    line = f"{name:<36} {result['per_item_us']:12.2f} us/item {result['peak_kib']:12.1f} KiB"
+    if baseline:
+        line += f"   x{result['seconds'] / baseline['seconds']:5.2f} time  x{result['peak_kib'] / max(baseline['peak_kib'], 1):5.2f} memory  {status}"
+    print(line)
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> bool:
+    """
+    Compare results with a baseline.
+    Returns:
+        bool: True if a benchmark regressed beyond the tolerance, e.g. 0.25 for 25% slower or larger
+    """
+    regressed = False
+    print(f"\nComparison with the baseline (tolerance {tolerance:.0%}):")
+    for name, result in results.items():
+        if name not in baseline:
+            _report(name, result, status="new")
+            continue
+        slower = result["seconds"] > baseline[name]["seconds"] * (1 + tolerance)
+        larger = result["peak_kib"] > baseline[name]["peak_kib"] * (1 + tolerance) + 64
+        regressed |= slower or larger
+        status = " ".join(flag for flag, failed in (("SLOWER", slower), ("LARGER", larger)) if failed) or "ok"
+        _report(name, result, baseline[name], status)
+    return regressed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="foodunits benchmark suite")
+    parser.add_argument("--size", type=int, default=2000, help="number of items per corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing repeats")
+    parser.add_argument("--filter", help="only run the benchmarks whose name contains this text")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing")
+    args = parser.parse_args(argv)
+
+    # Failed conversions are logged and warned about, silence them while timing
+    logging.disable(logging.CRITICAL)
+    warnings.simplefilter("ignore")
+    results = run(args.size, args.repeat, args.filter)
+
+    if args.save_baseline:
+        baseline = {}
+        if args.filter and os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        baseline.update(results)
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}, run with --save-baseline first")
+        return 0
+    with open(args.baseline) as file:
+        return int(compare(results, json.load(file), args.tolerance))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
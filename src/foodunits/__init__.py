@@ -1,7 +1,63 @@
-# read version from installed package
-from importlib.metadata import version
-__version__ = version("foodunits")
+"""Validate or convert food units.
+Public names are loaded lazily on first access, so importing the package stays cheap
+and a process only pays for the submodules and third-party libraries it uses.
+"""
+from importlib import import_module
 
-# populate package namespace
-from foodunits.convertor import units_convertor
-from foodunits.validator import units_validator
+# public name -> module defining it
+_LAZY_ATTRIBUTES = {
+    "units_convertor": "foodunits.convertor",
+    "ConversionResult": "foodunits.base",
+    "units_convertor_batch": "foodunits.batch",
+    "BatchResult": "foodunits.batch",
+    "units_convertor_parallel": "foodunits.parallel",
+    "convert_columns": "foodunits.frame",
+    "cached_units_convertor": "foodunits.cache",
+    "ResultCache": "foodunits.cache",
+    "invalidate_caches": "foodunits.cache",
+    "register_unit": "foodunits.registration",
+    "register_alias": "foodunits.registration",
+    "register_container_size": "foodunits.registration",
+    "register_density": "foodunits.registration",
+    "build_database": "foodunits.database",
+    "Database": "foodunits.database",
+    "use_database": "foodunits.database",
+    "convert_async": "foodunits.aio",
+    "AsyncConvertor": "foodunits.aio",
+    "parse_ingredient_line": "foodunits.lines",
+    "parse_ingredient_lines": "foodunits.lines",
+    "convert_ingredient_line": "foodunits.lines",
+    "IngredientLine": "foodunits.lines",
+    "Recipe": "foodunits.recipe",
+    "ScaledIngredient": "foodunits.recipe",
+    "scale_recipe": "foodunits.recipe",
+    "LocalePack": "foodunits.locales",
+    "register_locale": "foodunits.locales",
+    "get_locale": "foodunits.locales",
+    "units_validator": "foodunits.validator",
+    "units_validator_many": "foodunits.validator",
+    "ValidationResult": "foodunits.validator",
+    "Convert_Dict": "foodunits.utils.units",
+    "ConversionFailure": "foodunits.exceptions",
+    "ErrorCode": "foodunits.exceptions",
+}
+
+__all__ = ["__version__", *_LAZY_ATTRIBUTES]
+
+
+def __getattr__(name: str):
+    """Load a public name on first access."""
+    if name == "__version__":
+        # read version from installed package
+        from importlib.metadata import version
+        value = version("foodunits")
+    elif name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
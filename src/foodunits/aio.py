@@ -0,0 +1,294 @@
+"""Module run food unit conversion from asyncio"""
+import asyncio
+import time
+import weakref
+from collections import deque
+from functools import partial
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+from foodunits.batch import units_convertor_batch
+from foodunits.convertor import units_convertor, get_si, _parse_value, _normalize_unit, _infer_decimal_places
+from foodunits.exceptions import ErrorCode
+
+# value, to_unit, from_unit, ingredient, ingredient_density, country, decimal_places
+Request = Tuple[Any, str, str, str, float, str, int]
+
+
+def _parse_request_value(value: Any) -> Tuple[Any, str]:
+    """
+    Internal: Number and unit of a request value, strings are parsed once for the batch and the decimal places.
+    """
+    if not isinstance(value, str):
+        return value, None
+    try:
+        return _parse_value(value)
+    except (ValueError, TypeError, ZeroDivisionError):
+        return None, None
+
+
+def _si(unit: str) -> str:
+    """
+    Internal: SI form of a unit, as compared by `units_convertor`.
+    """
+    return get_si(_normalize_unit(unit))
+
+
+def _convert_many(requests: List[Request]) -> List[Any]:
+    """
+    Internal: Convert a batch of requests with one vectorized pass.
+    Returns:
+        One `units_convertor` response or exception per request
+    """
+    _, to_units, from_units, ingredients, densities, countries, _ = zip(*requests)
+    numbers, units = zip(*map(_parse_request_value, (request[0] for request in requests)))
+    from_units = [from_unit or unit for from_unit, unit in zip(from_units, units)]
+    result = units_convertor_batch(
+        numbers, to_units, from_units,
+        ingredients=ingredients,
+        ingredient_densities=densities,
+        countries=countries,
+    )
+    responses = []
+    for i, request in enumerate(requests):
+        if result.errors[i] != ErrorCode.OK:
+            # Failures are rare, run the single conversion for its exact response or exception
+            try:
+                responses.append(units_convertor(*request))
+            except Exception as exc:
+                responses.append(exc)
+            continue
+        if _si(from_units[i]) == _si(to_units[i]):
+            # Same unit, the value is returned unchanged as by `units_convertor`
+            responses.append({"converted value": numbers[i], "unit": result.units[i]})
+            continue
+        decimal_places = request[6] or _infer_decimal_places(numbers[i])
+        responses.append({
+            "converted value": round(float(result.values[i]), decimal_places),
+            "unit": result.units[i],
+        })
+    return responses
+
+
+class AsyncConvertor:
+    """
+    Asyncio facade of `units_convertor`.
+    Conversions run in a bounded executor, so the event loop is never blocked. Identical in-flight requests
+    with hashable values are coalesced into one conversion, and concurrent requests are converted together in one vectorized pass.
+
+    Examples:
+        >>> convertor = AsyncConvertor()
+        >>> await convertor.convert("1 fluid ounce", to_unit="ml")
+        # Output: {"converted value": 29.573, "unit": "ml"}
+        >>> convertor.metrics()["requests"]
+        # Output: 1
+    """
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_batch: int = 256,
+        batch_window: float = 0.0005,
+        executor: Executor = None,
+        latency_window: int = 1024,
+    ):
+        """
+        Initialization
+        Args:
+            max_workers: Maximum number of batches converted at the same time
+            max_batch: A batch is started as soon as it has this many requests
+            batch_window: Otherwise, seconds to wait for more requests before starting a batch
+            executor: An existing executor to use instead of starting a thread pool
+            latency_window: Number of recent requests the latency metrics are computed on
+        """
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self._owned = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers, thread_name_prefix="foodunits")
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._queue = []
+        self._inflight = {}
+        self._pending = 0
+        self._tasks = set()
+        self._flush_handle = None
+        self._running = 0
+        self._latencies = deque(maxlen=latency_window)
+        self._counters = {"requests": 0, "coalesced": 0, "batches": 0, "batched_requests": 0}
+
+    async def convert(
+        self,
+        value: Any,
+        to_unit: str,
+        from_unit: str = None,
+        ingredient: str = None,
+        ingredient_density: float = None,
+        country: str = None,
+        decimal_places: int = None,
+    ) -> Dict:
+        """
+        Convert the given value from the source unit to the target unit, see `units_convertor`.
+        Returns:
+            Dict: Dictionary of converted value and unit
+        Raises:
+            ConversionFailure: If the conversion is not possible
+        """
+        start = time.perf_counter()
+        request = (value, to_unit, from_unit, ingredient, ingredient_density, country, decimal_places)
+        self._counters["requests"] += 1
+        try:
+            future = self._inflight.get(request)
+        except TypeError:
+            # Unhashable values, e.g. lists, are never coalesced
+            request_key = future = None
+        else:
+            request_key = request
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            if request_key is not None:
+                self._inflight[request_key] = future
+            self._enqueue(request_key, request, future)
+        else:
+            self._counters["coalesced"] += 1
+        try:
+            response = await asyncio.shield(future)
+        finally:
+            self._latencies.append(time.perf_counter() - start)
+        # Coalesced requests get their own copy
+        return dict(response)
+
+    def _enqueue(self, request_key, request: Request, future: asyncio.Future):
+        """
+        Internal: Queue a request, the batch is started when it is full or after the batch window.
+        """
+        self._pending += 1
+        self._queue.append((request_key, request, future))
+        if len(self._queue) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+
+    def _flush(self):
+        """
+        Internal: Start converting the queued requests.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._queue = self._queue, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(partial(self._settle, batch))
+
+    async def _run(self, batch: List[Tuple[Any, Request, asyncio.Future]]):
+        """
+        Internal: Convert one batch in the executor and resolve its futures.
+        """
+        async with self._semaphore:
+            self._running += 1
+            self._counters["batches"] += 1
+            self._counters["batched_requests"] += len(batch)
+            try:
+                responses = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, _convert_many, [request for _, request, _ in batch]
+                )
+            except Exception as exc:
+                responses = [exc] * len(batch)
+            finally:
+                self._running -= 1
+        for (_, _, future), response in zip(batch, responses):
+            if isinstance(response, BaseException):
+                future.set_exception(response)
+            else:
+                future.set_result(response)
+
+    def _settle(self, batch: List[Tuple[Any, Request, asyncio.Future]], task: asyncio.Task):
+        """
+        Internal: Forget the requests of a finished batch. If the batch was cancelled, even before it started,
+        its futures are cancelled so that no request waits forever.
+        """
+        self._tasks.discard(task)
+        self._pending -= len(batch)
+        for request_key, _, future in batch:
+            if request_key is not None and self._inflight.get(request_key) is future:
+                del self._inflight[request_key]
+            if not future.done():
+                future.cancel()
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Snapshot of the service metrics.
+        Returns:
+            Dict: queue depth (requests waiting for a batch), in-flight requests, running batches,
+            request/coalesced/batch counters, mean batch size and latency percentiles in seconds
+        """
+        latencies = sorted(self._latencies)
+
+        def percentile(rank: float) -> float:
+            return latencies[min(len(latencies) - 1, int(rank * len(latencies)))] if latencies else 0.0
+
+        batches = self._counters["batches"]
+        return {
+            "queue_depth": len(self._queue),
+            "in_flight": self._pending,
+            "running_batches": self._running,
+            **self._counters,
+            "mean_batch_size": self._counters["batched_requests"] / batches if batches else 0.0,
+            "latency_p50": percentile(.5),
+            "latency_p99": percentile(.99),
+            "latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+    async def close(self):
+        """
+        Wait for the running batches, then shut the executor down if it was started by the convertor.
+        """
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._owned:
+            self._executor.shutdown(wait=False)
+
+
+_DEFAULT_CONVERTORS = weakref.WeakKeyDictionary()
+_SHARED_EXECUTOR = None
+
+
+def default_convertor() -> AsyncConvertor:
+    """
+    Load the AsyncConvertor used by `convert_async` in the running event loop.
+    The convertors of all event loops share one thread pool.
+    """
+    global _SHARED_EXECUTOR
+    loop = asyncio.get_running_loop()
+    convertor = _DEFAULT_CONVERTORS.get(loop)
+    if convertor is None:
+        if _SHARED_EXECUTOR is None:
+            _SHARED_EXECUTOR = ThreadPoolExecutor(4, thread_name_prefix="foodunits")
+        convertor = _DEFAULT_CONVERTORS[loop] = AsyncConvertor(executor=_SHARED_EXECUTOR)
+    return convertor
+
+
+async def convert_async(
+    value: Any,
+    to_unit: str,
+    from_unit: str = None,
+    ingredient: str = None,
+    ingredient_density: float = None,
+    country: str = None,
+    decimal_places: int = None,
+) -> Dict:
+    """
+    Convert the given value from the source unit to the target unit without blocking the event loop.
+    The arguments and response are the same as `units_convertor`, requests are coalesced and batched
+    by the shared `default_convertor()`.
+
+    Examples:
+        >>> await convert_async("2.5 cups", to_unit="g", ingredient="skimmed milk", country="United States")
+        # Output: {"converted value": 618.0, "unit": "g"}
+    """
+    return await default_convertor().convert(
+        value, to_unit, from_unit,
+        ingredient=ingredient,
+        ingredient_density=ingredient_density,
+        country=country,
+        decimal_places=decimal_places,
+    )
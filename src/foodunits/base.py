@@ -1,17 +1,63 @@
-from foodunits.utils.units import Convert_Dict
-from foodunits.exceptions import ConversionFailure
+import warnings
+from typing import Any, Callable, Dict, NamedTuple, Optional
+from foodunits.utils.planner import container_sizes, get_plan, exact
+from foodunits.utils.registry import CONTAINER_UNITS, REGISTRY
+from foodunits.utils.units import Convert_Dict, G_PER_L_DENSITY
+
+
+class ConversionResult(NamedTuple):
+    """
+    Compact result of a conversion, without the per-result dictionary of the dict shape.
+    Attributes:
+        value: The converted value
+        unit: The SI form of the target unit
+    """
+    value: Any
+    unit: str
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        The dict shape returned by `units_convertor`, e.g. {"converted value": 29.574, "unit": "ml"}.
+        """
+        return {"converted value": self.value, "unit": self.unit}
+
+
+def _deprecated(name: str, replacement: str):
+    """
+    Internal: Warn that a member of FoodUnitConvertor is deprecated.
+    """
+    warnings.warn(
+        f"FoodUnitConvertor.{name} is deprecated, use {replacement} instead", DeprecationWarning, stacklevel=3
+    )
+
+
+class _DeprecatedTable:
+    """
+    Internal: Class attribute serving the live conversion table returned by `load`, with a DeprecationWarning.
+    """
+
+    def __init__(self, load: Callable[[], Dict]):
+        self.load = load
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        _deprecated(self.name, "Convert_Dict")
+        return self.load()
+
 
 class FoodUnitConvertor:
-    """Class contains mainly food conversion functions."""
-    # Assign the available dictionary
-    metric_dict = Convert_Dict.metric_dict()
-    imperial_vol_dict = Convert_Dict.imperial_vol_dict()
-    imperial_mass_dict = Convert_Dict.imperial_mass_dict()
-    physical_container_unit = {
-        "cup": Convert_Dict.cup_by_country_dict(),
-        "teaspoon": Convert_Dict.teaspoon_by_country_dict(),
-        "tablespoon": Convert_Dict.tablespoon_by_country_dict()
-    }
+    """
+    Class contains mainly food conversion functions.
+    Instances hold the arguments of one conversion in slots; `apply` converts without any instance.
+    """
+    __slots__ = ("value", "units_from", "units_to", "density", "country", "decimal_places", "is_exact")
+    # Deprecated, the conversions go through the compiled plans of the planner
+    metric_dict = _DeprecatedTable(Convert_Dict.metric_dict)
+    imperial_vol_dict = _DeprecatedTable(Convert_Dict.imperial_vol_dict)
+    imperial_mass_dict = _DeprecatedTable(Convert_Dict.imperial_mass_dict)
+    physical_container_unit = _DeprecatedTable(lambda: {unit: container_sizes(unit) for unit in CONTAINER_UNITS})
 
     def __init__(
         self,
@@ -21,175 +67,119 @@ class FoodUnitConvertor:
         density: float = None,
         country: str = "US",
         decimal_places: int = None,
+        is_exact: bool = False,
         **kwargs
     ):
-        """Initialization"""
+        """
+        Initialization.
+        Extra keyword arguments are deprecated and ignored, the instances have no attribute dictionary.
+        """
+        if kwargs:
+            warnings.warn(
+                f"FoodUnitConvertor ignores the extra arguments {', '.join(kwargs)}", DeprecationWarning, stacklevel=2
+            )
         self.value = value
         self.units_from = units_from
         self.units_to = units_to
         self.decimal_places = decimal_places
         self.density = density
         self.country = country
-        self.metric_units_from = units_from[:-1] if len(units_from) > 1 else None
-        self.metric_units_to = units_to[:-1] if len(units_to) > 1 else None
-        self.__dict__.update(kwargs)
+        self.is_exact = is_exact
+
+    def _involves_container(self):
+        """
+        Check if the units include physical container units, e.g. cup.
+        """
+        return REGISTRY.is_container(self.units_from) or REGISTRY.is_container(self.units_to)
+
+    @staticmethod
+    def apply(
+        value,
+        units_from: str,
+        units_to: str,
+        density: float = None,
+        country: str = "US",
+        decimal_places: int = None,
+        is_exact: bool = False,
+    ) -> Optional[ConversionResult]:
+        """
+        Convert a value by applying the compiled plan between the units, without creating a convertor.
+        In exact mode, the value, density and plan factor are exact Fractions.
+        Returns:
+            ConversionResult: The converted value and unit, None if there is no conversion between the units
+        """
+        plan = get_plan(units_from, units_to, country, is_exact)
+        if not plan:
+            return None
+        if is_exact:
+            converted_value = plan.apply(exact(value), density and exact(density))
+        else:
+            converted_value = plan.apply(value, density)
+        if decimal_places is not None:
+            converted_value = round(converted_value, decimal_places)
+        return ConversionResult(converted_value, units_to)
+
+    def convert(self):
+        """
+        Convert the value of this convertor, see `apply`.
+        Returns:
+            Dict: Dictionary of converted value and unit, False if there is no conversion between the units
+        """
+        result = self.apply(
+            self.value, self.units_from, self.units_to, self.density, self.country, self.decimal_places, self.is_exact
+        )
+        return result.as_dict() if result else False
 
     def check_metric_imperial(self):
         """
         Conversion between metric and imperial units.
         """
-        converted_value = None
-        # Metric and Imperial volumes （metric volumetric units should be l and m³)
-        if self.metric_units_from in self.metric_dict and self.units_to in self.imperial_vol_dict:
-            metric_base = self.metric_dict.get(self.metric_units_from, None)
-            imperial_base = self.imperial_vol_dict.get(self.units_to, None)
-            converted_value = self.metric_to_imperial(self.value, metric_base, imperial_base, 33.814)
-            # Mass to volume
-            if "g" in self.units_from:
-                converted_value = self.volume_mass_conversion(converted_value, self.density, vol_to_mass=False)
-
-        elif self.units_from in self.imperial_vol_dict and self.metric_units_to in self.metric_dict:
-            imperial_base = self.imperial_vol_dict.get(self.units_from, None)
-            metric_base = self.metric_dict.get(self.metric_units_to, None)
-            converted_value = self.imperial_to_metric(self.value, metric_base, imperial_base, 0.0295735)
-            # Volume to mass
-            if "g" in self.units_to:
-                converted_value = self.volume_mass_conversion(converted_value, self.density, vol_to_mass=True)
-
-        # Metric and Imperial masses （metric mass units should be g, but exception is l or m³)
-        elif self.metric_units_from in self.metric_dict and self.units_to in self.imperial_mass_dict:
-            metric_base = self.metric_dict.get(self.metric_units_from, None)
-            imperial_base = self.imperial_mass_dict.get(self.units_to, None)
-            # Volume to mass
-            if "l" in self.units_from:
-                converted_value = self.metric_to_imperial(
-                    self.volume_mass_conversion(self.value, self.density, vol_to_mass=True),
-                    metric_base, imperial_base, 0.00220462
-                )
-            else:
-                converted_value = self.metric_to_imperial(self.value, metric_base, imperial_base, 0.00220462)
-
-        elif self.units_from in self.imperial_mass_dict and self.metric_units_to in self.metric_dict:
-            imperial_base = self.imperial_mass_dict.get(self.units_from, None)
-            metric_base = self.metric_dict.get(self.metric_units_to, None)
-            converted_value = self.imperial_to_metric(self.value, metric_base, imperial_base, 453.592)
-            # Mass to volume
-            if "l" in self.units_to:
-                converted_value = self.volume_mass_conversion(converted_value, self.density, vol_to_mass=False)
-
-        if converted_value:
-            return {
-                "converted value": round(converted_value, self.decimal_places),
-                "unit": self.units_to
-            }
-        else:
+        if self._involves_container():
             return False
+        return self.convert()
 
     def check_physical_container_unit(self):
         """
         Conversion from or to physical container units, e.g. cup to ml, or vice versa.
         """
-        if not self.units_from in self.physical_container_unit and not self.units_to in self.physical_container_unit:
-            return False
-        #TODO Add converstion from cup to teaspoon/tablespoon etc.
-        if self.units_from in self.physical_container_unit and self.units_to in self.physical_container_unit:
-            raise ConversionFailure(
-                    f"""
-                    Can not convert between cup, teaspoon and tablespoon yet. To be added...
-                    """
-                )
-
-        converted_value = None
-        if self.units_from in self.physical_container_unit.keys():
-            country_base = self.physical_container_unit[self.units_from].get(self.country, None)
-
-            # No country is found
-            if not country_base:
-                raise ConversionFailure(
-                    f"""
-                    The converted units involve physical containers, such as cup, teaspoon, or tablespoon, which depend on the country.
-                    Provide the accepted value from the followings(or corresponding full name) for the "country" argument:
-                        {self.physical_container_unit[self.units_from].keys()}
-                    """
-                )
-
-            if self.units_to in self.imperial_vol_dict:
-                imperial_base = self.imperial_vol_dict.get(self.units_to, None)
-                # convert cup etc. to liter first, then other imperial units
-                converted_ml = self.value * country_base
-                converted_value =  self.metric_to_imperial(converted_ml, 1, imperial_base, 33.814)
-
-            elif self.metric_units_to in self.metric_dict:
-                metric_base = self.metric_dict.get(self.metric_units_to, None)
-                converted_value = country_base * self.value / metric_base
-
-                if "g" in self.units_to:
-                    converted_value = self.volume_mass_conversion(converted_value, self.density, vol_to_mass=True)
-
-        if self.units_to in self.physical_container_unit.keys():
-            country_base = self.physical_container_unit[self.units_to].get(self.country, None)
-
-            # No country is found
-            if not country_base:
-                raise ConversionFailure(
-                    f"""
-                    The converted units involve physical containers, such as cup, teaspoon or tablespoon which is country-matters.
-                    Provide the accepted value for argument "country":
-                        {self.physical_container_unit[self.units_to].keys()}
-                    """
-                )
-
-            if self.units_from in self.imperial_vol_dict:
-                # convert imperial units to liter first, then cup etc.
-                imperial_base = self.imperial_vol_dict.get(self.units_from, None)
-                converted_value = self.imperial_to_metric(self.value, 1, imperial_base, 0.0295735) / country_base
-
-            elif self.metric_units_from in self.metric_dict:
-                metric_base = self.metric_dict.get(self.metric_units_from, None)
-                # convert to volume first
-                if "g" in self.units_from:
-                    converted_value = self.volume_mass_conversion(self.value, self.density, vol_to_mass=False) * metric_base / country_base
-                else:
-                    converted_value = self.value * metric_base / country_base
-
-
-
-        if converted_value:
-            return {
-                "converted value": round(converted_value, self.decimal_places),
-                "unit": self.units_to
-            }
-        else:
+        if not self._involves_container():
             return False
+        return self.convert()
 
     @staticmethod
     def volume_mass_conversion(value, density, vol_to_mass: bool = True):
         """
         Convert between mass and volume using a certain density.
+        Deprecated, use `get_plan` or `apply`.
         """
+        _deprecated("volume_mass_conversion", "get_plan")
         if vol_to_mass:
-            result = 1000 * value * density
-        else:
-            result = value / (1000 * density)
-        return result
+            return G_PER_L_DENSITY * value * density
+        return value / (G_PER_L_DENSITY * density)
 
     @staticmethod
     def metric_to_imperial(value, metric_base, imperial_base, imperial_multiplier):
         """
         Convert from metric to imperial units.
+        Deprecated, use `get_plan` or `apply`.
         """
+        _deprecated("metric_to_imperial", "get_plan")
         return value * metric_base * imperial_multiplier / imperial_base
 
     @staticmethod
     def imperial_to_metric(value, metric_base, imperial_base, metric_multiplier):
         """
         Convert from imperial to metric units.
+        Deprecated, use `get_plan` or `apply`.
         """
+        _deprecated("imperial_to_metric", "get_plan")
         return value * imperial_base * metric_multiplier / metric_base
 
     @staticmethod
     def metric_to_metric(value, metric_base, metric_multiplier):
         """
         Convert between metric units.
+        Deprecated, use `get_plan` or `apply`.
         """
+        _deprecated("metric_to_metric", "get_plan")
         return value * metric_base * metric_multiplier
@@ -0,0 +1,244 @@
+"""Module run food unit conversion over columns of values"""
+from itertools import repeat
+from numbers import Number
+from typing import Any, List, NamedTuple, Sequence, Tuple, Union
+import numpy as np
+from foodunits.convertor import _parse_value, _normalize_unit
+from foodunits.utils.registry import REGISTRY
+from foodunits.utils.planner import get_plan
+from foodunits.utils.units import Convert_Dict
+from foodunits.utils.utils import get_ingredient_density, find_country
+from foodunits.exceptions import ConversionFailure, ErrorCode
+from foodunits import instrumentation
+
+_THRESHOLD = 85
+
+
+class BatchResult(NamedTuple):
+    """
+    Columnar result of a batch conversion.
+    Attributes:
+        values: Converted values, NaN where the row failed
+        units: Target unit of every row, None where the row failed
+        errors: ErrorCode of every row, ErrorCode.OK (0) where the row succeeded
+    """
+    values: np.ndarray
+    units: np.ndarray
+    errors: np.ndarray
+
+
+def _is_scalar(column: Any) -> bool:
+    """Internal: Check if an argument is a single value shared by all rows."""
+    return column is None or isinstance(column, (str, Number))
+
+
+def _column(column: Any, size: int, name: str):
+    """Internal: Iterate over a column, a single value is repeated for every row."""
+    if _is_scalar(column):
+        return repeat(column, size)
+    if len(column) != size:
+        raise ValueError(f"Argument {name} has {len(column)} rows, expected {size}")
+    return column
+
+
+def _parse_values(values: Sequence, locale: "LocalePack" = None) -> Tuple[np.ndarray, List[str]]:
+    """
+    Internal: Convert a column of values to floats, strings are parsed with the grammar of the locale.
+    Returns:
+        The numeric values (NaN if invalid) and the units found in value + unit strings (None if there is no unit)
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+        return values.astype(float), None
+
+    numbers = np.empty(len(values), dtype=float)
+    units = [None] * len(values)
+    parsed = {}
+    for i, value in enumerate(values):
+        if isinstance(value, str):
+            if value not in parsed:
+                try:
+                    parsed[value] = instrumentation.stage("parse", _parse_value, value, locale=locale)
+                except (ValueError, TypeError, ZeroDivisionError):
+                    parsed[value] = (None, None)
+            value, units[i] = parsed[value]
+        numbers[i] = value if isinstance(value, Number) and not isinstance(value, bool) else np.nan
+    return numbers, units
+
+
+class _Resolver:
+    """
+    Internal: Resolve rows to one conversion factor, each unit, ingredient and country is only resolved once.
+    Unit aliases of the locale are resolved to the unit they stand for.
+    """
+    def __init__(self, locale: "LocalePack" = None):
+        self.locale = locale
+        self.units = {}
+        self.densities = {}
+        self.countries = {}
+        self.factors = {}
+
+    def unit(self, unit: str):
+        if unit not in self.units:
+            spelling = unit if self.locale is None else self.locale.unit(unit)
+            if not isinstance(spelling, str):
+                self.units[unit] = None
+            else:
+                self.units[unit] = REGISTRY.get(instrumentation.stage("normalize_unit", _normalize_unit, spelling))
+        return self.units[unit]
+
+    def density(self, ingredient: str):
+        if ingredient not in self.densities:
+            if not ingredient:
+                self.densities[ingredient] = None
+            else:
+                self.densities[ingredient] = instrumentation.stage(
+                    "density", get_ingredient_density, ingredient,
+                    ingredient_dict=Convert_Dict.ml_to_g_by_ingredient_dict(), threshold=_THRESHOLD,
+                )
+        return self.densities[ingredient]
+
+    def country(self, country: str):
+        if country not in self.countries:
+            self.countries[country] = instrumentation.stage("country", find_country, country)
+        return self.countries[country]
+
+    def factor(self, from_si: str, to_si: str, density: float, country: str):
+        key = (from_si, to_si, country, density)
+        if key not in self.factors:
+            self.factors[key] = instrumentation.stage("math", _group_factor, from_si, to_si, density, country)
+        return self.factors[key]
+
+    def resolve(self, from_unit: str, to_unit: str, ingredient: str, density: float, country: str):
+        """
+        Resolve one group of rows.
+        Returns:
+            The conversion factor, the target unit and the ErrorCode
+        """
+        from_record, to_record = self.unit(from_unit), self.unit(to_unit)
+        if not from_record or not to_record or \
+            from_record.category not in ("weight", "volume") or \
+            to_record.category not in ("weight", "volume"):
+            return np.nan, None, ErrorCode.UNKNOWN_UNIT
+        if from_record.si == to_record.si:
+            return 1.0, to_record.si, ErrorCode.OK
+
+        if from_record.category != to_record.category:
+            if not density or density != density:
+                density = self.density(ingredient)
+            if not density:
+                return np.nan, None, ErrorCode.MISSING_DENSITY
+        else:
+            density = None
+        if "container" in (from_record.system, to_record.system):
+            country = self.country(country)
+        else:
+            country = None
+        factor, code = self.factor(from_record.si, to_record.si, density, country)
+        return factor, (to_record.si if code == ErrorCode.OK else None), code
+
+
+def _group_factor(from_si: str, to_si: str, density: float, country: str):
+    """
+    Internal: Conversion factor between two units, from the compiled plan.
+    Returns:
+        The factor (NaN if the conversion failed) and the ErrorCode
+    """
+    try:
+        plan = get_plan(from_si, to_si, country)
+    except ConversionFailure:
+        return np.nan, ErrorCode.MISSING_COUNTRY
+    if not plan:
+        return np.nan, ErrorCode.UNSUPPORTED
+    return plan.apply(1.0, density), ErrorCode.OK
+
+
+def units_convertor_batch(
+    values: Sequence,
+    to_units: Any,
+    from_units: Any = None,
+    ingredients: Any = None,
+    ingredient_densities: Any = None,
+    countries: Any = None,
+    decimal_places: int = None,
+    locale: Union[str, "LocalePack"] = None,
+) -> BatchResult:
+    """
+    Convert columns of values from the source units to the target units.
+    Rows are grouped by units, ingredient density and country, every group is resolved once
+    and converted with one vectorized multiplication. Failed rows are reported with an error code
+    instead of raising an exception.
+
+    Args:
+        values: Values to convert, a sequence or NumPy array of numbers or strings accepted by `units_convertor`
+            (e.g., "1 mls", "1", 1, "one")
+        to_units: Target unit(s) to convert to
+        from_units: Source unit(s) to convert from, can be omitted for value + unit strings
+        ingredients: If converting between mass and volume, ingredient(s) or their densities should be present
+        ingredient_densities: If converting between mass and volume, ingredient(s) or their densities should be
+            present, the density of the ingredient is used where a density is missing or NaN
+        countries: Country (or countries) for unit conversions (default: None)
+        decimal_places: Number of decimal places for the converted values (default: None, not rounded). Unlike
+            `units_convertor`, the decimal places are not inferred from the values by default
+        locale: Locale pack, or its name, of the values and units of the whole batch (e.g., "de" for "1,5 l"),
+            its country is used if countries is None (default: None, English)
+        The unit, ingredient, density and country arguments accept one value for all rows, or one value per row.
+    Returns:
+        BatchResult: Columns of converted values, units and error codes
+
+    Examples:
+        >>> result = units_convertor_batch(np.array([1, 2.5]), "ml", "fl oz", decimal_places=3)
+        >>> result.values
+        # Output: array([29.573, 73.934])
+        >>> result.units
+        # Output: array(['ml', 'ml'], dtype=object)
+    """
+    size = len(values)
+    if locale is not None:
+        from foodunits.locales import get_locale  # deferred, the packs are only compiled when requested
+        locale = get_locale(locale)
+        countries = locale.country if countries is None else countries
+    numbers, parsed_units = _parse_values(values, locale)
+    columns = (from_units, to_units, ingredients, ingredient_densities, countries)
+    resolver = _Resolver(locale)
+
+    if parsed_units is None and all(_is_scalar(column) for column in columns):
+        # All rows share the same conversion
+        factor, unit, code = resolver.resolve(*columns)
+        converted = numbers * factor
+        units = np.full(size, unit, dtype=object)
+        errors = np.full(size, int(code), dtype=np.int8)
+    else:
+        if parsed_units is None:
+            parsed_units = repeat(None, size)
+        groups = {}
+        group_ids = np.empty(size, dtype=np.intp)
+        rows = zip(
+            _column(from_units, size, "from_units"),
+            parsed_units,
+            _column(to_units, size, "to_units"),
+            _column(ingredients, size, "ingredients"),
+            _column(ingredient_densities, size, "ingredient_densities"),
+            _column(countries, size, "countries"),
+        )
+        for i, (from_unit, parsed_unit, to_unit, ingredient, density, country) in enumerate(rows):
+            if density != density:
+                # NaN, e.g. a missing value of a density column
+                density = None
+            key = (from_unit or parsed_unit, to_unit, ingredient, density, country)
+            group_id = groups.get(key)
+            if group_id is None:
+                group_id = groups[key] = len(groups)
+            group_ids[i] = group_id
+
+        resolved = [resolver.resolve(*key) for key in groups]
+        factors = np.array([factor for factor, _, _ in resolved], dtype=float)
+        converted = numbers * factors[group_ids]
+        units = np.array([unit for _, unit, _ in resolved] or [None], dtype=object)[group_ids]
+        errors = np.array([code for _, _, code in resolved] or [0], dtype=np.int8)[group_ids]
+
+    invalid = np.isnan(numbers)
+    errors[invalid] = ErrorCode.INVALID_VALUE
+    units[invalid] = None
+    if decimal_places is not None:
+        converted = np.round(converted, decimal_places)
+    return BatchResult(converted, units, errors)
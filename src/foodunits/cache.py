@@ -0,0 +1,180 @@
+"""Module cache food unit conversion results"""
+import time
+import weakref
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, NamedTuple, Optional
+from foodunits.convertor import units_convertor, _normalize_unit
+
+_RESULT_CACHES = weakref.WeakSet()
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of a result cache, in the style of `functools.lru_cache`.
+    """
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    ttl: Optional[float]
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResultCache:
+    """
+    Memoize `units_convertor` responses.
+    Entries are keyed on the inputs with normalized units, evicted least recently used once `maxsize`
+    entries are stored, and expire `ttl` seconds after they were stored. The cache is thread-safe.
+    Failed conversions are not cached.
+
+    Examples:
+        >>> cache = ResultCache(maxsize=1024, ttl=3600)
+        >>> cache.convert("1 cup", to_unit="g", ingredient="flour", country="US")
+        # Output: {"converted value": 127, "unit": "g"}
+        >>> cache.cache_info()
+        # Output: CacheInfo(hits=0, misses=1, maxsize=1024, currsize=1, ttl=3600)
+    """
+    def __init__(self, maxsize: int = 4096, ttl: float = None):
+        """
+        Initialization
+        Args:
+            maxsize: Maximum number of cached responses
+            ttl: Seconds a response stays valid (default: None, until evicted or invalidated)
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize should be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        _RESULT_CACHES.add(self)
+
+    @staticmethod
+    def _key(value, to_unit, from_unit, ingredient, ingredient_density, country, decimal_places, mode) -> tuple:
+        """
+        Internal: Cache key of a conversion.
+        """
+        # type(value): 1 and 1.0 are equal keys but give different decimal places
+        return (
+            type(value), value,
+            _normalize_unit(to_unit),
+            _normalize_unit(from_unit) if from_unit else None,
+            ingredient, ingredient_density, country, decimal_places, mode,
+        )
+
+    def convert(
+        self,
+        value: Any,
+        to_unit: str,
+        from_unit: str = None,
+        ingredient: str = None,
+        ingredient_density: float = None,
+        country: str = None,
+        decimal_places: int = None,
+        mode: str = "auto",
+    ) -> Dict:
+        """
+        Convert the given value from the source unit to the target unit, see `units_convertor`.
+        Returns:
+            Dict: Dictionary of converted value and unit
+        Raises:
+            ConversionFailure: If the conversion is not possible
+        """
+        key = self._key(value, to_unit, from_unit, ingredient, ingredient_density, country, decimal_places, mode)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return dict(entry[1])
+            self._misses += 1
+
+        response = units_convertor(
+            value, to_unit, from_unit, ingredient, ingredient_density, country, decimal_places, mode
+        )
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires, dict(response))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return response
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Report the cache statistics.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries), self.ttl)
+
+    def cache_clear(self):
+        """
+        Remove all cached responses and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+
+    def invalidate(self):
+        """
+        Remove all cached responses, the statistics are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+_DEFAULT_CACHE = ResultCache()
+
+
+def cached_units_convertor(
+    value: Any,
+    to_unit: str,
+    from_unit: str = None,
+    ingredient: str = None,
+    ingredient_density: float = None,
+    country: str = None,
+    decimal_places: int = None,
+    mode: str = "auto",
+) -> Dict:
+    """
+    Opt-in memoized `units_convertor`, backed by a shared ResultCache of 4096 responses.
+    Use `cached_units_convertor.cache_info()` and `cached_units_convertor.cache_clear()` like `functools.lru_cache`.
+    """
+    return _DEFAULT_CACHE.convert(
+        value, to_unit, from_unit, ingredient, ingredient_density, country, decimal_places, mode
+    )
+
+
+cached_units_convertor.cache_info = _DEFAULT_CACHE.cache_info
+cached_units_convertor.cache_clear = _DEFAULT_CACHE.cache_clear
+
+
+def invalidate_results():
+    """
+    Drop every cached response, the conversion plans and indexes are kept.
+    Enough after a change which only affects the responses, e.g. a new density.
+    """
+    for cache in list(_RESULT_CACHES):
+        cache.invalidate()
+
+
+def invalidate_caches():
+    """
+    Drop every cached response, conversion plan, country lookup and ingredient index.
+    Call it after changing the unit, density or country tables, or an ingredient dictionary in place.
+    """
+    from foodunits.utils import utils, planner
+    from foodunits.utils.units import Convert_Dict
+    Convert_Dict.version += 1
+    invalidate_results()
+    planner._cached_plan.cache_clear()
+    planner.volume_graph.cache_clear()
+    utils._country_aliases.cache_clear()
+    utils._search_country.cache_clear()
@@ -1,12 +1,17 @@
 """Module run food unit conversion"""
-import re
 import logging
-from typing import Tuple, Dict, Any
-from pattern.text.en import singularize
-from foodunits.utils.utils import split_quantity_unit, validate_numeric_string, preprocess, get_ingredient_density, find_country
-from foodunits.utils.units import UNITS, Convert_Dict
-from foodunits.base import FoodUnitConvertor
+from decimal import Decimal
+from fractions import Fraction
+from typing import Tuple, Dict, Any, Union
+from foodunits.utils.singular import singularize
+from foodunits.utils.utils import get_ingredient_density, find_country
+from foodunits.utils.parser import parse_quantity_unit, normalize_unit
+from foodunits.utils.units import Convert_Dict
+from foodunits.utils.planner import exact
+from foodunits.utils.registry import REGISTRY
+from foodunits.base import FoodUnitConvertor, ConversionResult
 from foodunits.exceptions import ConversionFailure
+from foodunits import instrumentation
 
 
 def can_convert(
@@ -30,19 +35,18 @@ def can_convert(
     _threshold =85
 
     # Check if units belong to acceptable categories
-    from_unit_category = _find_unit_category(from_unit)
-    to_unit_category = _find_unit_category(to_unit)
-    if not from_unit_category or not to_unit_category or \
-        from_unit_category["name"] not in acceptable_cats or \
-        to_unit_category["name"] not in acceptable_cats:
+    from_record = REGISTRY.get(from_unit)
+    to_record = REGISTRY.get(to_unit)
+    if not from_record or not to_record or \
+        from_record.category not in acceptable_cats or \
+        to_record.category not in acceptable_cats:
         raise ConversionFailure(f"Both units should be in {acceptable_cats} category")
 
-    if from_unit_category["name"] != to_unit_category["name"]:
+    if from_record.category != to_record.category:
         if not ingredient_density:
-            ingredient_density = get_ingredient_density(
-                ingredient,
-                ingredient_dict = Convert_Dict.ml_to_g_by_ingredient_dict(),
-                threshold = _threshold
+            ingredient_density = instrumentation.stage(
+                "density", get_ingredient_density, ingredient,
+                ingredient_dict=Convert_Dict.ml_to_g_by_ingredient_dict(), threshold=_threshold,
             )
             if not ingredient_density:
                 raise ConversionFailure(
@@ -53,7 +57,7 @@ def can_convert(
                     """
                 )
 
-    return get_si(from_unit), get_si(to_unit), ingredient_density
+    return from_record.si, to_record.si, ingredient_density
 
 
 def get_si(unit: str) -> str:
@@ -62,46 +66,51 @@ def get_si(unit: str) -> str:
     Args:
         unit: The unit for which the SI string should be loaded
     Returns:
-        str: SI string or None if none was found
+        str: SI string, full name for "cup", "teaspoon", "tablespoon", or the unit itself if none was found
     """
-    cat_unit = _find_unit(unit)
-    if cat_unit:
-        # return full name only for "cup", "teaspoon", "tablespoon"
-        if cat_unit["name"] in ["cup", "teaspoon", "tablespoon"]:
-            return cat_unit["name"]
-        si = cat_unit["si"]
-    return si if si else unit
+    record = REGISTRY.get(unit)
+    return record.si if record else unit
 
 
-def _find_unit_category(unit: str) -> Dict:
+def _parse_value(value: str, is_exact: bool = False, locale: "LocalePack" = None) -> Tuple[Any, str]:
     """
-    Internal: Load the category of one unit from the UNITS array.
+    Internal: Parse a value or value + unit string.
     Args:
-        unit: The unit which should be included in the '_internal_accepted_names'
-            in a category of the UNITS array
+        value: String to parse (e.g., "1 mls", "1", "one")
+        is_exact: Parse decimals and fractions as exact Fractions
+        locale: Grammar of the string, English if None
     Returns:
-        Dict: The category from the UNITS array or None if none was found
+        The numeric value (None if it is not numeric or is a range) and the unit found in the string
+        (None if there is no unit)
     """
-    for category in UNITS:
-        for cat_unit in category["units"]:
-            if unit == cat_unit["name"] or unit == cat_unit["si"]:
-                return category
-    return None
+    parsed = parse_quantity_unit(value, is_exact) if locale is None else locale.parse_quantity_unit(value, is_exact)
+    return (parsed.quantity if parsed.quantity_max is None else None), parsed.unit
 
 
-def _find_unit(unit: str) -> Dict:
+def _normalize_unit(unit: str) -> str:
     """
-    Internal: Load one specific unit from the UNITS array.
-    Args:
-        unit: The name of the unit (should be included in the '_internal_accepted_names' or 'name')
-    Returns:
-        Dict: The unit from the UNITS array or None if none was found
+    Internal: Normalize a unit string; keep only alphabets and one space, singularize and lower it.
     """
-    for category in UNITS:
-        for cat_unit in category["units"]:
-            if unit == cat_unit["name"] or unit == cat_unit["si"]:
-                return cat_unit
-    return None
+    return singularize(normalize_unit(unit)).lower()
+
+
+def _infer_decimal_places(value) -> int:
+    """
+    Internal: Number of decimal places written in a numeric value, e.g. 2 for 1.25.
+    """
+    value = str(value)
+    return len(value) - value.index('.') - 1 if "." in value else 0
+
+
+# Arithmetic modes of `units_convertor`
+MODES = ("auto", "fast", "exact", "decimal")
+
+
+def _as_decimal(value: Fraction) -> Decimal:
+    """
+    Internal: Decimal of an exact result, with the precision of the current decimal context.
+    """
+    return Decimal(value.numerator) / Decimal(value.denominator)
 
 
 def units_convertor(
@@ -112,7 +121,10 @@ def units_convertor(
     ingredient_density: float = None,
     country: str = None,
     decimal_places: int = None,
-) -> Dict:
+    mode: str = "auto",
+    as_dict: bool = True,
+    locale: Union[str, "LocalePack"] = None,
+) -> Union[Dict, ConversionResult]:
     """
     Convert the given value from the source unit to the target unit.
     Args:
@@ -124,22 +136,31 @@ def units_convertor(
         ingredient_density: If converting between mass and volume, ingredient or its density should be present
         country: Country for unit conversions (default: None)
         decimal_places: Number of decimal places for the converted value (default: None)
+        mode: Arithmetic of the conversion (default: "auto"):
+            "auto": float, rounded to the decimal places of the value unless decimal_places is given
+            "fast": float, only rounded if decimal_places is given
+            "exact": Fraction computed from the exact values of the tables, only rounded if decimal_places is given
+            "decimal": as "exact", returned as a Decimal
+        as_dict: Return the dictionary of converted value and unit, or a compact ConversionResult if False
+        locale: Locale pack, or its name, of the value and units (e.g., "de" for "1,5 l" or "2 EL"),
+            its country is used if country is None (default: None, English)
     Returns:
-        Dict: Dictionary of converted value and unit
+        Dict: Dictionary of converted value and unit, or ConversionResult
     """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+    is_exact = mode in ("exact", "decimal")
+    if locale is not None:
+        from foodunits.locales import get_locale  # deferred, the packs are only compiled when requested
+        locale = get_locale(locale)
+        from_unit, to_unit = locale.unit(from_unit), locale.unit(to_unit)
+        country = country or locale.country
     # Convert string input to value or value + unit
     if isinstance(value, str):
-        cleaned_value = preprocess(value)
-        valid, valid_value = validate_numeric_string(cleaned_value)
-        if valid:
-            value = valid_value
-        else:
-            value, unit_split = split_quantity_unit(cleaned_value)
-            valid, valid_value = validate_numeric_string(value)
-            from_unit = from_unit if from_unit else unit_split
-            value = valid_value if valid else None
+        value, unit_split = instrumentation.stage("parse", _parse_value, value, is_exact, locale)
+        from_unit = from_unit if from_unit else unit_split
     # Check the converted value
-    if not isinstance(value, (int, float)):
+    if not isinstance(value, (int, float, Fraction, Decimal) if is_exact else (int, float)):
         raise ConversionFailure(
             f"""
             The input value {value} should be either int or float or convertable strings, such as:
@@ -153,11 +174,13 @@ def units_convertor(
         )
 
     # Process unit; keep only alphabets and one space
-    from_unit = singularize(re.sub(r"\s+", " ", re.sub(r'[^A-Za-z\s\d]+', '', from_unit)).strip()).lower()
-    to_unit = singularize(re.sub(r"\s+", " ", re.sub(r'[^A-Za-z\s\d]+', '', to_unit)).strip()).lower()
+    from_unit = instrumentation.stage("normalize_unit", _normalize_unit, from_unit)
+    to_unit = instrumentation.stage("normalize_unit", _normalize_unit, to_unit)
     # Check if units can be converted
     try:
-        from_unit, to_unit, ingredient_density = can_convert(from_unit, to_unit, ingredient, ingredient_density)
+        from_unit, to_unit, ingredient_density = instrumentation.stage(
+            "can_convert", can_convert, from_unit, to_unit, ingredient, ingredient_density
+        )
     except ConversionFailure as e:
         # Handle the specific custom error (ConversionFailure)
         logging.error("Conversion error: %s", str(e))
@@ -168,33 +191,30 @@ def units_convertor(
         raise
 
     # Extract the numeric value from the string
-    if not decimal_places:
-        if "." in str(value):
-            decimal_places = len(str(value)[str(value).index('.') + 1:])
-        else:
-            decimal_places = 0
+    if not decimal_places and mode == "auto":
+        decimal_places = _infer_decimal_places(value)
 
     # Return the value if units are the same
     if from_unit == to_unit:
-        return {"converted value": value, "unit": get_si(to_unit)}
-
-    # Get the country code
-    country = find_country(country)
-
-    convertor = FoodUnitConvertor(
-        value, from_unit, to_unit,
-        density=ingredient_density,
-        country=country,
-        decimal_places=decimal_places
+        if is_exact:
+            value = exact(value) if decimal_places is None else round(exact(value), decimal_places)
+            value = _as_decimal(value) if mode == "decimal" else value
+        result = ConversionResult(value, get_si(to_unit))
+        return result.as_dict() if as_dict else result
+
+    # Get the country code, only containers depend on the country
+    if not REGISTRY.is_container(from_unit) and not REGISTRY.is_container(to_unit):
+        country = None
+    else:
+        country = instrumentation.stage("country", find_country, country)
+
+    result = instrumentation.stage(
+        "math", FoodUnitConvertor.apply, value, from_unit, to_unit, ingredient_density, country, decimal_places,
+        is_exact,
     )
-    responses = [
-        convertor.check_metric_imperial(),  # Metric and Imperial units
-        convertor.check_physical_container_unit()  # Cup and Teaspoon
-    ]
-
-    for response in responses:
-        if response:
-            return response
-
-    # Return a default response if no conversions found
-    return {"converted value": None, "unit": None}
+    if result is None:
+        # Return a default response if no conversions found
+        result = ConversionResult(None, None)
+    elif mode == "decimal":
+        result = ConversionResult(_as_decimal(result.value), result.unit)
+    return result.as_dict() if as_dict else result
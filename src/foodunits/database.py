@@ -0,0 +1,519 @@
+"""Module compile the conversion tables into a memory-mapped database"""
+import csv
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from os import PathLike
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from foodunits.utils.ingredients import IngredientIndex, normalize_ingredient, _trigrams
+from foodunits.utils.units import Convert_Dict
+from foodunits.utils.registry import CONTAINER_UNITS, REGISTRY, UnitRegistry
+
+MAGIC = b"FUDB"
+VERSION = 1
+# magic, version, number of sections
+_HEADER = struct.Struct("<4sHH")
+# name, offset, length
+_SECTION = struct.Struct("<8sQQ")
+_ALIGNMENT = 8
+
+Source = Union[str, PathLike, Dict, List]
+# Separator of the aliases and plurals of a unit in CSV files
+_LIST_SEPARATOR = "|"
+
+
+def _read_source(source: Source) -> Any:
+    """
+    Internal: Load a JSON or CSV file, other sources are returned as is.
+    CSV files are read as a list of rows keyed by the header.
+    """
+    if not isinstance(source, (str, PathLike)):
+        return source
+    with open(source, newline="", encoding="utf-8") as file:
+        if os.fspath(source).lower().endswith(".csv"):
+            return list(csv.DictReader(file))
+        return json.load(file)
+
+
+def _ingredients(source: Source) -> Dict[str, float]:
+    """
+    Internal: Ingredient densities from {ingredient: density} or rows with "ingredient" and "density" columns.
+    """
+    source = _read_source(source)
+    if isinstance(source, Mapping):
+        return {str(key): float(value) for key, value in source.items()}
+    return {row["ingredient"]: float(row["density"]) for row in source}
+
+
+def _spelling_list(value) -> List[str]:
+    """
+    Internal: Aliases or plurals of a unit, given as a list or a "|" separated string.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(_LIST_SEPARATOR)
+    return [spelling.strip() for spelling in value if spelling.strip()]
+
+
+def _units(source: Source) -> List[Dict[str, Any]]:
+    """
+    Internal: Unit definitions from {name: {field: value}} or rows with a "name" column,
+    the fields are the arguments of `register_unit` without the sizes.
+    They are checked against each other the way `UnitRegistry.add` checks them.
+    """
+    source = _read_source(source)
+    if isinstance(source, Mapping):
+        source = [{"name": name, **fields} for name, fields in source.items()]
+    units = []
+    registry = UnitRegistry([])
+    for row in source:
+        factor = row.get("factor")
+        unit = {
+            "name": row["name"],
+            "category": row["category"],
+            "si": row.get("si") or None,
+            "system": row.get("system") or None,
+            "factor": float(factor) if factor not in (None, "") else None,
+            "aliases": _spelling_list(row.get("aliases")),
+            "plurals": _spelling_list(row.get("plurals")),
+        }
+        registry.add(**unit)
+        units.append(unit)
+    return units
+
+
+def _aliases(source: Source) -> Dict[str, str]:
+    """
+    Internal: Unit of each alias from {alias: unit} or rows with "alias" and "unit" columns.
+    """
+    source = _read_source(source)
+    if isinstance(source, Mapping):
+        return {str(alias): str(unit) for alias, unit in source.items()}
+    return {row["alias"]: row["unit"] for row in source}
+
+
+def _containers(source: Source, units: List[Dict[str, Any]] = ()) -> Dict[str, Dict[str, float]]:
+    """
+    Internal: Container sizes in liter from {unit: {country: size}} or rows with "unit", "country" and "size" columns.
+    The units are cup, teaspoon, tablespoon, the container units of the database and the registered container units.
+    """
+    source = _read_source(source)
+    if isinstance(source, Mapping):
+        sizes = {unit: {country.lower(): float(size) for country, size in source[unit].items()} for unit in source}
+    else:
+        sizes = {}
+        for row in source:
+            sizes.setdefault(row["unit"], {})[row["country"].lower()] = float(row["size"])
+    known = {unit["name"] for unit in units if unit["system"] == "container"}
+    unknown = [unit for unit in sizes if unit not in CONTAINER_UNITS and unit not in known]
+    for unit in unknown:
+        if not REGISTRY.is_container(unit):
+            raise ValueError(f"Unknown container unit {unit!r}, expected {list(CONTAINER_UNITS)} or a container unit")
+        # Keyed by full name, as the sizes of the registered container units
+        sizes.setdefault(REGISTRY.get(unit).name, {}).update(sizes.pop(unit))
+    return sizes
+
+
+def _string_table(strings: List[str]) -> Tuple[bytes, np.ndarray]:
+    """
+    Internal: Concatenated UTF-8 strings and their offsets.
+    """
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(string) for string in encoded], out=offsets[1:])
+    return b"".join(encoded), offsets
+
+
+def _compile_sections(
+    containers: Dict[str, Dict[str, float]],
+    ingredients: Dict[str, float],
+    units: List[Dict[str, Any]] = (),
+    aliases: Dict[str, str] = None,
+) -> Dict[str, bytes]:
+    """
+    Internal: Compile the tables into binary sections, the small unit tables go in the JSON header.
+    """
+    keys = list(ingredients)
+    normalized = [normalize_ingredient(key) for key in keys]
+    # Positions sorted by key and by normalized name, for binary searches
+    key_bytes = [key.encode("utf-8") for key in keys]
+    normalized_bytes = [name.encode("ascii") for name in normalized]
+    key_order = sorted(range(len(keys)), key=key_bytes.__getitem__)
+    normalized_order = sorted(range(len(keys)), key=lambda position: (normalized_bytes[position], position))
+
+    # Trigram inverted index, postings are sorted by position
+    postings = {}
+    for position, name in enumerate(normalized):
+        for trigram in _trigrams(name):
+            postings.setdefault(trigram.encode("ascii"), []).append(position)
+    trigrams = sorted(postings)
+    posting_offsets = np.zeros(len(trigrams) + 1, dtype=np.uint64)
+    np.cumsum([len(postings[trigram]) for trigram in trigrams], out=posting_offsets[1:])
+    posting_lists = [postings[trigram] for trigram in trigrams]
+    flat_postings = np.fromiter(
+        (position for positions in posting_lists for position in positions),
+        dtype=np.uint32, count=int(posting_offsets[-1]),
+    )
+
+    key_blob, key_offsets = _string_table(keys)
+    normalized_blob, normalized_offsets = _string_table(normalized)
+    return {
+        "meta": json.dumps({"containers": containers, "units": list(units), "aliases": aliases or {}}).encode("utf-8"),
+        "keys": key_blob,
+        "keyoff": key_offsets.tobytes(),
+        "keyord": np.asarray(key_order, dtype=np.uint32).tobytes(),
+        "norm": normalized_blob,
+        "normoff": normalized_offsets.tobytes(),
+        "normord": np.asarray(normalized_order, dtype=np.uint32).tobytes(),
+        "density": np.asarray([ingredients[key] for key in keys], dtype=np.float64).tobytes(),
+        "trigram": np.asarray(trigrams, dtype="S3").tobytes(),
+        "postoff": posting_offsets.tobytes(),
+        "post": flat_postings.tobytes(),
+    }
+
+
+def build_database(
+    path: Union[str, PathLike],
+    ingredients: Source = None,
+    containers: Source = None,
+    units: Source = None,
+    aliases: Source = None,
+) -> str:
+    """
+    Compile the ingredient densities, container sizes, units and aliases into a database file, see `Database`.
+    Densities and container sizes default to the built-in tables, units and aliases extend the built-in ones.
+    Every table can be given as a Python object or a JSON or CSV file.
+
+    Args:
+        path: Database file to write, it is replaced atomically so running readers keep their mapping
+        ingredients: {ingredient: density in g/ml}, or a CSV file with "ingredient" and "density" columns
+        containers: {unit: {country: size in liter}} for cup, teaspoon, tablespoon and the container units,
+            or a CSV file with "unit", "country" and "size" columns
+        units: {name: {"category": ..., "si": ..., "system": ..., "factor": ..., "aliases": [...], "plurals": [...]}}
+            with the arguments of `register_unit`, or a CSV file with these columns and "|" separated lists
+        aliases: {alias: unit} of the built-in or database units, or a CSV file with "alias" and "unit" columns
+    Returns:
+        str: The database path
+
+    Examples:
+        >>> build_database("foods.fudb", ingredients="densities.csv")
+        # Output: 'foods.fudb'
+        >>> build_database(
+        ...     "japanese.fudb",
+        ...     units={"gō": {"category": "volume", "system": "container"}},
+        ...     containers={"gō": {"jp": 0.18}},
+        ... )
+        # Output: 'japanese.fudb'
+    """
+    units = _units(units) if units is not None else []
+    sections = _compile_sections(
+        _containers(containers, units) if containers is not None else {
+            unit: dict(getattr(Convert_Dict, f"{unit}_by_country_dict")()) for unit in CONTAINER_UNITS
+        },
+        _ingredients(ingredients) if ingredients is not None else Convert_Dict.ml_to_g_by_ingredient_dict(),
+        units,
+        _aliases(aliases) if aliases is not None else {},
+    )
+
+    directory = []
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    for name, data in sections.items():
+        offset += -offset % _ALIGNMENT
+        directory.append((name, offset, len(data)))
+        offset += len(data)
+
+    path = os.fspath(path)
+    temporary = f"{path}.tmp{os.getpid()}"
+    with open(temporary, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, len(sections)))
+        for name, offset, length in directory:
+            file.write(_SECTION.pack(name.encode("ascii"), offset, length))
+        for (name, offset, _), data in zip(directory, sections.values()):
+            file.write(b"\0" * (offset - file.tell()))
+            file.write(data)
+    os.replace(temporary, path)
+    return path
+
+
+class CompiledIngredients(IngredientIndex, Mapping):
+    """
+    Read-only ingredient densities of a database, and their search index.
+    It is a mapping of ingredient to density, and matches ingredients like `IngredientIndex`
+    without building anything in memory: lookups are binary searches over the memory-mapped tables.
+    """
+    def __init__(self, database: "Database"):
+        self._database = database
+        self._size = len(database._density)
+
+    @property
+    def ingredient_dict(self) -> "CompiledIngredients":
+        return self
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def add(self, key: str):
+        raise TypeError("A compiled database is read-only, rebuild it with build_database")
+
+    def _position(self, key: str) -> Optional[int]:
+        """
+        Internal: Position of an ingredient name, None if it is missing.
+        """
+        database = self._database
+        position = database._search(key.encode("utf-8"), database._key_order, database._key)
+        if position is None or database._key(position) != key.encode("utf-8"):
+            return None
+        return position
+
+    def __getitem__(self, key: str) -> float:
+        position = self._position(key) if isinstance(key, str) else None
+        if position is None:
+            raise KeyError(key)
+        return float(self._database._density[position])
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._position(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self._size):
+            yield self._database._key(position).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._size
+
+    def match(self, ingredient: str) -> Optional[Tuple[str, int]]:
+        """Find the closest ingredient name, with the same results as `IngredientIndex.match`.
+        Args:
+            ingredient: The ingredient to search for.
+        Returns:
+            The matching key and its `fuzz.token_sort_ratio` score, or None if there is no candidate.
+        """
+        if not ingredient:
+            return None
+        if ingredient in self:
+            return ingredient, 100
+        normalized = normalize_ingredient(ingredient)
+        if not normalized:
+            return None
+        database = self._database
+        encoded = normalized.encode("ascii")
+        position = database._search(encoded, database._normalized_order, database._normalized)
+        if position is not None and database._normalized(position) == encoded:
+            return database._key(position).decode("utf-8"), 100
+
+        trigrams = np.array(sorted(trigram.encode("ascii") for trigram in _trigrams(normalized)), dtype="S3")
+        if not len(database._trigrams):
+            return None
+        found = np.minimum(np.searchsorted(database._trigrams, trigrams), len(database._trigrams) - 1)
+        found = found[database._trigrams[found] == trigrams]
+        if not len(found):
+            return None
+        positions, overlaps = np.unique(
+            np.concatenate([database._postings[database._posting_offsets[i]:database._posting_offsets[i + 1]] for i in found]),
+            return_counts=True,
+        )
+        # Most overlapping trigrams first, then the lowest positions, as `IngredientIndex`
+        shortlist = np.sort(positions[np.lexsort((positions, -overlaps))[:self.candidates]])
+
+        best_position, best_score = None, 0
+        for position in shortlist.tolist():
+            score = self._score(normalized, database._normalized(position).decode("ascii"))
+            if score > best_score:
+                best_position, best_score = position, score
+        if best_position is None:
+            return None
+        return database._key(best_position).decode("utf-8"), best_score
+
+
+class Database:
+    """
+    Conversion tables compiled by `build_database`, loaded with `mmap`.
+    Nothing is parsed or copied when the database is opened besides a small JSON header of container sizes, units
+    and aliases: densities, ingredient names and the ingredient search index are read in place, so worker processes
+    opening the same file share one page-cached copy.
+
+    Examples:
+        >>> database = Database("foods.fudb")
+        >>> database.ingredients.density("skimme milk")
+        # Output: 1.033
+        >>> use_database(database)  # serve units_convertor from the database
+    """
+    def __init__(self, path: Union[str, PathLike]):
+        """
+        Initialization
+        Args:
+            path: The database file
+        """
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a foodunits database")
+        if version != VERSION:
+            raise ValueError(f"{self.path} has version {version}, expected {VERSION}; rebuild it with build_database")
+        self._sections = {}
+        for i in range(count):
+            name, offset, length = _SECTION.unpack_from(self._mmap, _HEADER.size + i * _SECTION.size)
+            self._sections[name.rstrip(b"\0").decode("ascii")] = (offset, length)
+
+        meta = json.loads(self._bytes("meta"))
+        self._containers = meta["containers"]
+        self.units = meta.get("units", [])
+        self.aliases = meta.get("aliases", {})
+        self._key_blob = self._array("keys", np.uint8)
+        self._key_offsets = self._array("keyoff", np.uint64)
+        self._key_order = self._array("keyord", np.uint32)
+        self._normalized_blob = self._array("norm", np.uint8)
+        self._normalized_offsets = self._array("normoff", np.uint64)
+        self._normalized_order = self._array("normord", np.uint32)
+        self._density = self._array("density", np.float64)
+        self._trigrams = self._array("trigram", "S3")
+        self._posting_offsets = self._array("postoff", np.uint64)
+        self._postings = self._array("post", np.uint32)
+        self.ingredients = CompiledIngredients(self)
+
+    def _bytes(self, name: str) -> bytes:
+        """
+        Internal: Copy of a section.
+        """
+        offset, length = self._sections[name]
+        return self._mmap[offset:offset + length]
+
+    def _array(self, name: str, dtype) -> np.ndarray:
+        """
+        Internal: Read-only array view of a section, without copy.
+        """
+        offset, length = self._sections[name]
+        dtype = np.dtype(dtype)
+        return np.frombuffer(self._mmap, dtype=dtype, count=length // dtype.itemsize, offset=offset)
+
+    def _key(self, position: int) -> bytes:
+        """
+        Internal: UTF-8 ingredient name at a position.
+        """
+        return self._key_blob[self._key_offsets[position]:self._key_offsets[position + 1]].tobytes()
+
+    def _normalized(self, position: int) -> bytes:
+        """
+        Internal: Normalized ingredient name at a position.
+        """
+        return self._normalized_blob[self._normalized_offsets[position]:self._normalized_offsets[position + 1]].tobytes()
+
+    @staticmethod
+    def _search(value: bytes, order: np.ndarray, read) -> Optional[int]:
+        """
+        Internal: Binary search of the first position whose string is not below value, in a sorted order.
+        """
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if read(int(order[middle])) < value:
+                low = middle + 1
+            else:
+                high = middle
+        return int(order[low]) if low < len(order) else None
+
+    def container_sizes(self, unit: str) -> Dict[str, float]:
+        """
+        Load the size in liter of a physical container unit per country.
+        Args:
+            unit: "cup", "teaspoon", "tablespoon" or the full name of a container unit
+        Returns:
+            Dict: Country or region to size in liter
+        """
+        return self._containers.get(unit, {})
+
+    def close(self):
+        """
+        Release the memory map; arrays read from the database must not be used afterwards.
+        """
+        self.ingredients = None
+        for name in list(vars(self)):
+            if isinstance(getattr(self, name), np.ndarray):
+                setattr(self, name, None)
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views are still referenced elsewhere, the map is released with them
+            pass
+
+    def __enter__(self) -> "Database":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _register_units(database: Database):
+    """
+    Internal: Register the units, aliases and container sizes of a database.
+    The units and aliases already registered the same way are skipped, so a database can be used again.
+    """
+    # deferred, registration imports the caches and the convertor
+    from foodunits.registration import register_alias, register_unit
+    from foodunits.utils.planner import container_sizes
+    # Records the units would have, to recognize the ones registered by a previous use
+    expected = UnitRegistry([])
+    for unit in database.units:
+        if REGISTRY.get(unit["name"]) != expected.add(**unit):
+            register_unit(**unit)
+    for alias, unit in database.aliases.items():
+        if REGISTRY.get(alias) is None or REGISTRY.get(alias) != REGISTRY.get(unit):
+            register_alias(alias, unit)
+    for unit, sizes in database._containers.items():
+        if unit not in CONTAINER_UNITS:
+            container_sizes(unit).update(sizes)
+
+
+def use_database(database: Union[str, PathLike, Database, None]) -> Optional[Database]:
+    """
+    Serve the ingredient densities and container sizes of the conversions from a compiled database,
+    and register its units and aliases.
+    The units, aliases and container sizes of units other than cup, teaspoon and tablespoon stay registered
+    when the built-in tables are restored, as with `register_unit`.
+    Args:
+        database: A Database or a database file, None restores the built-in tables
+    Returns:
+        Database: The database in use
+    Raises:
+        ValueError: If a unit or alias of the database conflicts with a registered one
+    """
+    from foodunits.cache import invalidate_caches
+    if database is not None and not isinstance(database, Database):
+        database = Database(database)
+    if database is not None:
+        # Registered first, so that a conflicting unit leaves the tables in use
+        _register_units(database)
+    Convert_Dict.load_tables(
+        ml_to_g_by_ingredient_dict=database and database.ingredients,
+        **{f"{unit}_by_country_dict": database and database.container_sizes(unit) for unit in CONTAINER_UNITS},
+    )
+    invalidate_caches()
+    return database
+
+
+def main(argv: List[str] = None):
+    """
+    Command line builder:
+    python -m foodunits.database OUTPUT [--ingredients FILE] [--containers FILE] [--units FILE] [--aliases FILE]
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m foodunits.database", description="Compile a foodunits database")
+    parser.add_argument("path", help="database file to write")
+    for table in ("ingredients", "containers", "units", "aliases"):
+        parser.add_argument(f"--{table}", help=f"JSON or CSV file of {table} (default: built-in)")
+    args = parser.parse_args(argv)
+    path = build_database(args.path, args.ingredients, args.containers, args.units, args.aliases)
+    with Database(path) as database:
+        print(f"{path}: {len(database.ingredients)} ingredients, {len(database.units)} units, "
+              f"{len(database.aliases)} aliases")
+
+
+if __name__ == "__main__":
+    main()
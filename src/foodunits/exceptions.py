@@ -1,4 +1,5 @@
 """Exceptions"""
+from enum import IntEnum
 from typing import Callable, Dict, Any
 
 class ValidationFailure(Exception):
@@ -37,3 +38,15 @@ class ConversionFailure(Exception):
     def __repr__(self):
         """Return the string representation of ConversionFailure."""
         return f"ConversionFailure: {self.reason}"
+
+
+class ErrorCode(IntEnum):
+    """
+    Error codes reported per row by the bulk APIs instead of raising exceptions.
+    """
+    OK = 0
+    INVALID_VALUE = 1  # value is not numeric or convertable string
+    UNKNOWN_UNIT = 2  # unit is missing, unknown, or not a weight or volume unit
+    MISSING_DENSITY = 3  # mass <-> volume without a matching ingredient or density
+    MISSING_COUNTRY = 4  # cup, teaspoon or tablespoon without a supported country
+    UNSUPPORTED = 5  # no conversion available between the units
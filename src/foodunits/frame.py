@@ -0,0 +1,160 @@
+"""Module convert food unit columns of pandas DataFrames and Arrow tables
+
+Importing the module registers the `foodunits` DataFrame accessor:
+
+    >>> import foodunits.frame
+    >>> df.foodunits.convert("amount", to_unit="g", unit="unit", ingredient="ingredient", country="country")
+"""
+from typing import Any, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from foodunits.batch import _Resolver, _parse_values
+from foodunits.exceptions import ErrorCode
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+def _to_numpy(table: Any, name: str) -> np.ndarray:
+    """
+    Internal: Column of a DataFrame or Arrow table as a NumPy array, numeric columns are not copied.
+    """
+    if pa is not None and isinstance(table, pa.Table):
+        return table.column(name).to_numpy()
+    return table[name].to_numpy()
+
+
+def _factorize(column: np.ndarray) -> Tuple[np.ndarray, List]:
+    """
+    Internal: Integer codes of a column and its unique values, missing values are coded as None.
+    """
+    codes, uniques = pd.factorize(column)
+    uniques = [None if pd.isna(unique) else unique for unique in uniques]
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(uniques), codes)
+        uniques.append(None)
+    return codes, uniques
+
+
+def _combine(codes: np.ndarray, others: np.ndarray, size: int) -> np.ndarray:
+    """
+    Internal: Codes of the unique pairs of two code columns, kept dense so combining many columns cannot overflow.
+    """
+    return pd.factorize(codes * size + others)[0]
+
+
+def _values(table: Any, value: str) -> Tuple[np.ndarray, Optional[np.ndarray], List]:
+    """
+    Internal: Numeric values of the value column, and the codes and uniques of the units of value + unit strings.
+    """
+    column = _to_numpy(table, value)
+    if column.dtype.kind in "biuf":
+        return column.astype(float, copy=False), None, []
+    codes, uniques = _factorize(column)
+    # Every distinct string is only parsed once
+    numbers, units = _parse_values(uniques)
+    unit_codes, unit_uniques = _factorize(np.array(units if units is not None else [None] * len(uniques), dtype=object))
+    return numbers[codes], unit_codes[codes], unit_uniques
+
+
+def convert_columns(
+    table: Any,
+    value: str,
+    to_unit: str,
+    unit: str = None,
+    ingredient: str = None,
+    country: str = None,
+    density: str = None,
+    decimal_places: int = None,
+    output: str = "converted_value",
+    errors: str = "conversion_error",
+) -> Any:
+    """
+    Convert a column of a DataFrame or Arrow table to a target unit, the results are written into new columns.
+    The unique unit, ingredient, density and country combinations are factorized and resolved once each,
+    the values are then converted with one vectorized multiplication. The input columns are not copied.
+
+    Args:
+        table: pandas DataFrame, updated in place, or pyarrow Table
+        value: Name of the column of values, numbers or strings accepted by `units_convertor` (e.g., "1 cup", "one")
+        to_unit: Target unit to convert to
+        unit: Name of the column of source units, can be omitted for value + unit strings;
+            where both are given the unit of the column is used, and the unit of the string where the column is missing
+        ingredient: Name of the column of ingredients, for conversions between mass and volume
+        country: Name of the column of countries, for cup, teaspoon and tablespoon
+        density: Name of the column of ingredient densities, overriding the ingredients
+        decimal_places: Number of decimal places for the converted values (default: None, not rounded), see
+            `units_convertor_batch`
+        output: Name of the column of converted values, NaN where the row failed
+        errors: Name of the column of ErrorCode of every row, ErrorCode.OK (0) where the row succeeded
+    Returns:
+        The DataFrame, or a new Arrow table sharing the columns of the input table
+
+    Examples:
+        >>> df = pd.DataFrame({"amount": [1, 2.5], "unit": ["cup", "lb"], "ingredient": ["flour", None]})
+        >>> convert_columns(df, "amount", "g", unit="unit", ingredient="ingredient", country="US")
+        # Output: df with the columns converted_value [127.0, 1133.98] and conversion_error [0, 0]
+    """
+    numbers, parsed_codes, parsed_uniques = _values(table, value)
+    size = len(numbers)
+
+    # Codes of the unique (unit, parsed unit, ingredient, density, country) combinations
+    names, keys, group_ids = [], [], np.zeros(size, dtype=np.intp)
+    for name in (unit, None, ingredient, density, country):
+        if name is None:
+            codes, uniques = np.zeros(size, dtype=np.intp), [None]
+        else:
+            codes, uniques = _factorize(_to_numpy(table, name))
+        names.append(uniques)
+        keys.append(codes)
+    if parsed_codes is not None:
+        names[1], keys[1] = parsed_uniques, parsed_codes
+    for codes, uniques in zip(keys, names):
+        group_ids = _combine(group_ids, codes, len(uniques))
+
+    # One row per group is enough to recover its combination
+    _, first_rows = np.unique(group_ids, return_index=True)
+    resolver = _Resolver()
+    factors = np.empty(len(first_rows), dtype=float)
+    codes = np.empty(len(first_rows), dtype=np.int8)
+    for group, row in enumerate(first_rows):
+        column_unit, parsed_unit, row_ingredient, row_density, row_country = (
+            uniques[column[row]] for uniques, column in zip(names, keys)
+        )
+        # The unit column wins over the unit of the value string, as in `units_convertor_batch`
+        factors[group], _, codes[group] = resolver.resolve(
+            column_unit or parsed_unit, to_unit, row_ingredient, row_density, row_country
+        )
+
+    converted = numbers * factors[group_ids]
+    row_errors = codes[group_ids]
+    row_errors[np.isnan(numbers)] = ErrorCode.INVALID_VALUE
+    if decimal_places is not None:
+        converted = np.round(converted, decimal_places)
+
+    if pa is not None and isinstance(table, pa.Table):
+        for name, column in ((output, converted), (errors, row_errors)):
+            index = table.schema.get_field_index(name)
+            array = pa.array(column)
+            table = table.set_column(index, name, array) if index >= 0 else table.append_column(name, array)
+        return table
+    table[output] = converted
+    table[errors] = row_errors
+    return table
+
+
+@pd.api.extensions.register_dataframe_accessor("foodunits")
+class FoodUnitsAccessor:
+    """
+    DataFrame accessor of the food unit conversions, e.g. `df.foodunits.convert("amount", "g", unit="unit")`.
+    """
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+
+    def convert(self, value: str, to_unit: str, **kwargs) -> pd.DataFrame:
+        """
+        Convert a column to a target unit in place, see `convert_columns`.
+        """
+        return convert_columns(self._df, value, to_unit, **kwargs)
@@ -0,0 +1,285 @@
+"""Module instrument the conversion stages
+
+Instrumentation is off by default. The conversion stages are called through `stage`, which checks the module
+flag `ENABLED`, so a disabled instrumentation costs one call and one flag check per stage and records nothing,
+whatever the order the modules were imported in.
+
+    >>> from foodunits import instrumentation
+    >>> with instrumentation.profile() as report:
+    ...     units_convertor("2.5 cups", to_unit="g", ingredient="skimmed milk", country="US")
+    >>> report.stages["density"]
+    # Output: StageStats(calls=1, errors=0, seconds=0.00021)
+    >>> print(instrumentation.export_metrics())
+"""
+import sys
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable, Dict, List, NamedTuple
+
+# The timed stages of a conversion, they may nest: "can_convert" includes "density",
+# and "normalize_unit" includes the singularize fallback
+STAGES = ("parse", "normalize_unit", "can_convert", "density", "country", "math")
+# The counted fallback and inner paths
+EVENTS = ("ingredient_candidate_scored", "singularize_fallback", "country_fuzzy_search")
+# Checked by `stage` and the call sites of the events, set by `enable` and `disable`
+ENABLED = False
+
+
+class StageStats(NamedTuple):
+    """
+    Statistics of one stage.
+    Attributes:
+        calls: Number of calls
+        errors: Number of calls which raised an exception
+        seconds: Total time spent in the stage
+    """
+    calls: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+
+class _Recorder:
+    """
+    Internal: Thread-safe accumulator of the stage statistics and event counters.
+    """
+    def __init__(self):
+        self.lock = Lock()
+        self.stages = {}
+        self.events = {}
+        self.hooks = []
+
+    def record(self, stage: str, seconds: float, failed: bool):
+        with self.lock:
+            calls, errors, total = self.stages.get(stage, StageStats())
+            self.stages[stage] = StageStats(calls + 1, errors + failed, total + seconds)
+        for hook in self.hooks:
+            hook(stage, seconds, failed)
+
+    def count(self, event: str, number: int = 1):
+        with self.lock:
+            self.events[event] = self.events.get(event, 0) + number
+
+    def reset(self):
+        with self.lock:
+            self.stages.clear()
+            self.events.clear()
+
+
+_RECORDER = _Recorder()
+
+
+def _resolve(module_name: str, path: str):
+    """
+    Internal: Owner object and attribute name of a dotted path in a loaded module, None if the module is not loaded.
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        return None
+    *owners, attribute = path.split(".")
+    owner = module
+    for name in owners:
+        owner = getattr(owner, name)
+    return owner, attribute
+
+
+def stage(name: str, function: Callable, *args, **kwargs):
+    """
+    Call the function of a stage, its time is recorded if the instrumentation is enabled.
+    Examples:
+        >>> stage("country", find_country, "United States")
+        # Output: 'us'
+    """
+    if not ENABLED:
+        return function(*args, **kwargs)
+    return timed(name, function, *args, **kwargs)
+
+
+def timed(stage: str, function: Callable, *args, **kwargs):
+    """
+    Call a function and record its time under a stage, whether the instrumentation is enabled or not.
+    """
+    start = time.perf_counter()
+    try:
+        result = function(*args, **kwargs)
+    except BaseException:
+        _RECORDER.record(stage, time.perf_counter() - start, True)
+        raise
+    _RECORDER.record(stage, time.perf_counter() - start, False)
+    return result
+
+
+def count(event: str, number: int = 1):
+    """
+    Count an event, call sites only use it if `ENABLED` is set.
+    """
+    _RECORDER.count(event, number)
+
+
+def enable():
+    """
+    Start recording the stages of the conversions.
+    """
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    """
+    Stop recording, the statistics are kept.
+    """
+    global ENABLED
+    ENABLED = False
+
+
+def is_enabled() -> bool:
+    return ENABLED
+
+
+def reset():
+    """
+    Clear the statistics.
+    """
+    _RECORDER.reset()
+
+
+def add_hook(hook: Callable[[str, float, bool], None]):
+    """
+    Call a function after every recorded stage.
+    Args:
+        hook: Called with the stage name, its duration in seconds and whether it raised an exception
+    """
+    _RECORDER.hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[str, float, bool], None]):
+    _RECORDER.hooks.remove(hook)
+
+
+def _cache_stats() -> Dict[str, tuple]:
+    """
+    Internal: (hits, misses, size) of the lookup and result caches of the loaded modules.
+    """
+    caches = {}
+    for module_name, path, name in (
+        ("foodunits.utils.planner", "_cached_plan", "plan"),
+        ("foodunits.utils.singular", "singularize", "singularize"),
+        ("foodunits.utils.utils", "_search_country", "country"),
+    ):
+        resolved = _resolve(module_name, path)
+        if resolved is not None:
+            info = getattr(*resolved).cache_info()
+            caches[name] = (info.hits, info.misses, info.currsize)
+    cache = sys.modules.get("foodunits.cache")
+    if cache is not None:
+        infos = [result_cache.cache_info() for result_cache in list(cache._RESULT_CACHES)]
+        caches["result"] = tuple(sum(info[i] for info in infos) for i in (0, 1, 3))
+    return caches
+
+
+def snapshot() -> Dict[str, Dict]:
+    """
+    Copy the current statistics.
+    Returns:
+        Dict: {"stages": {stage: StageStats}, "events": {event: count}, "caches": {cache: (hits, misses, size)}}
+    """
+    with _RECORDER.lock:
+        stages, events = dict(_RECORDER.stages), dict(_RECORDER.events)
+    return {"stages": stages, "events": events, "caches": _cache_stats()}
+
+
+class Profile:
+    """
+    Statistics of a profiled block, see `profile`.
+    Attributes:
+        seconds: Wall time of the block
+        stages: {stage: StageStats} recorded in the block
+        events: {event: count} recorded in the block
+    """
+    def __init__(self):
+        self.seconds = 0.0
+        self.stages = {}
+        self.events = {}
+
+    def report(self) -> str:
+        """
+        Human readable table of the stages, slowest first.
+        """
+        lines = [f"{'stage':<16}{'calls':>10}{'errors':>8}{'seconds':>12}{'share':>8}"]
+        for stage, stats in sorted(self.stages.items(), key=lambda item: -item[1].seconds):
+            share = stats.seconds / self.seconds if self.seconds else 0.0
+            lines.append(f"{stage:<16}{stats.calls:>10}{stats.errors:>8}{stats.seconds:>12.6f}{share:>8.1%}")
+        lines += [f"{event:<16}{count:>10}" for event, count in sorted(self.events.items())]
+        lines.append(f"{'total':<16}{'':>18}{self.seconds:>12.6f}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile():
+    """
+    Profile the conversions of a block, instrumentation is enabled for the block if it was not.
+    Yields:
+        Profile: Filled in when the block exits
+    """
+    result = Profile()
+    was_enabled = is_enabled()
+    enable()
+    before = snapshot()
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result.seconds = time.perf_counter() - start
+        after = snapshot()
+        if not was_enabled:
+            disable()
+        for stage, stats in after["stages"].items():
+            previous = before["stages"].get(stage, StageStats())
+            if stats.calls != previous.calls:
+                result.stages[stage] = StageStats(*(now - then for now, then in zip(stats, previous)))
+        for event, count in after["events"].items():
+            if count != before["events"].get(event, 0):
+                result.events[event] = count - before["events"].get(event, 0)
+
+
+def _labels(name: str, value: str) -> str:
+    return '{%s="%s"}' % (name, value.replace("\\", "\\\\").replace('"', '\\"'))
+
+
+def export_metrics(openmetrics: bool = False) -> str:
+    """
+    Export the statistics in the Prometheus text format.
+    Args:
+        openmetrics: Use the OpenMetrics text format instead
+    Returns:
+        str: The exposition, e.g. for a /metrics endpoint
+    """
+    current = snapshot()
+    lines: List[str] = []
+
+    def family(name: str, kind: str, help_text: str, samples):
+        # OpenMetrics names the counter family without the _total suffix of its samples
+        family_name = name[:-len("_total")] if openmetrics and kind == "counter" else name
+        lines.append(f"# HELP {family_name} {help_text}")
+        lines.append(f"# TYPE {family_name} {kind}")
+        lines.extend(f"{name}{labels} {value!r}" for labels, value in samples)
+
+    stages = sorted(current["stages"].items())
+    family("foodunits_stage_calls_total", "counter", "Calls of a conversion stage.",
+           [(_labels("stage", stage), stats.calls) for stage, stats in stages])
+    family("foodunits_stage_errors_total", "counter", "Calls of a conversion stage which raised an exception.",
+           [(_labels("stage", stage), stats.errors) for stage, stats in stages])
+    family("foodunits_stage_seconds_total", "counter", "Time spent in a conversion stage.",
+           [(_labels("stage", stage), stats.seconds) for stage, stats in stages])
+    family("foodunits_events_total", "counter", "Fallback and inner paths taken.",
+           [(_labels("event", event), count) for event, count in sorted(current["events"].items())])
+    caches = sorted(current["caches"].items())
+    family("foodunits_cache_hits_total", "counter", "Cache hits.",
+           [(_labels("cache", cache), stats[0]) for cache, stats in caches])
+    family("foodunits_cache_misses_total", "counter", "Cache misses.",
+           [(_labels("cache", cache), stats[1]) for cache, stats in caches])
+    family("foodunits_cache_entries", "gauge", "Cached entries.",
+           [(_labels("cache", cache), stats[2]) for cache, stats in caches])
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""Module parse and convert recipe ingredient lines"""
+import re
+from fractions import Fraction
+from functools import lru_cache
+from os import PathLike
+from typing import IO, Any, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+from foodunits.utils.parser import _LEADING_NUMBER, normalize_unit
+from foodunits.utils.registry import REGISTRY
+from foodunits.validator import _lines
+from foodunits.convertor import units_convertor
+from foodunits.locales import LocalePack, get_locale
+from foodunits.exceptions import ConversionFailure
+from foodunits import instrumentation
+
+# Preparation, size and texture words, they describe the ingredient but are not part of its name
+DESCRIPTORS = frozenset((
+    "beaten", "chilled", "chopped", "coarsely", "cold", "crushed", "cubed", "diced", "drained", "finely",
+    "firmly", "fresh", "freshly", "grated", "halved", "heaped", "heaping", "hot", "large", "level", "lightly",
+    "loosely", "medium", "melted", "minced", "packed", "peeled", "quartered", "rinsed", "roughly", "shredded",
+    "sifted", "sliced", "small", "softened", "thinly", "trimmed", "warm", "whisked",
+))
+
+_PARENTHESES = re.compile(r"\(([^)]*)\)")
+# Longest unit spelling tried, in words, e.g. "stick of butter"
+_UNIT_WORDS = 3
+_FILLERS = frozenset(("of",))
+# Words starting an alternative, e.g. "or" in "1 cup or 2 tbsp water" and "butter or margarine"
+_ALTERNATIVES = frozenset(("or",))
+
+
+class IngredientLine(NamedTuple):
+    """
+    Result of parsing one ingredient line.
+    Attributes:
+        quantity: The quantity, the lower bound of a range, None if there is no quantity or it is not a valid number
+        quantity_max: The upper bound of a range, e.g. 3 for "2-3 eggs", otherwise None
+        unit: The SI form of the unit, None if the line has no known unit
+        ingredient: The ingredient name without descriptors, None if there is none
+        descriptors: The preparation and size words, and the notes after a comma or between parentheses
+        valid: False if the line starts with a quantity which is not a valid number, or a range whose upper bound
+            is below its lower bound
+    """
+    quantity: Optional[Union[int, float, Fraction]]
+    quantity_max: Optional[Union[int, float, Fraction]]
+    unit: Optional[str]
+    ingredient: Optional[str]
+    descriptors: Tuple[str, ...] = ()
+    valid: bool = True
+
+
+def _split_unit(text: str, locale: LocalePack = None) -> Tuple[Optional[str], str]:
+    """
+    Internal: Unit at the start of a text and the rest of the text, the longest known spelling wins.
+    The unit aliases of the locale are tried before the spellings of the registry.
+    """
+    if locale is not None:
+        unit, rest = locale.split_unit(text)
+        if unit is not None:
+            return REGISTRY.get(unit).si, rest
+    words = text.split(" ", _UNIT_WORDS)
+    for count in range(min(_UNIT_WORDS, len(words)), 0, -1):
+        record = REGISTRY.get(normalize_unit(" ".join(words[:count])))
+        if record is not None:
+            return record.si, " ".join(words[count:])
+    return None, text
+
+
+def _split_descriptors(
+    text: str, descriptors: list, vocabulary: frozenset = DESCRIPTORS, fillers: frozenset = _FILLERS
+) -> Optional[str]:
+    """
+    Internal: Ingredient name of a text, its descriptor words and the notes after commas are added to descriptors.
+    A leading filler word is dropped, e.g. "of" in "2 cups of flour", and an alternative ends the name,
+    e.g. "or margarine" in "butter or margarine".
+    """
+    name, *notes = text.split(",")
+    words, phrase = [], []
+    names = name.split()
+    for index, word in enumerate(names):
+        if word in _ALTERNATIVES and words:
+            if phrase:
+                descriptors.append(" ".join(phrase))
+                phrase = []
+            descriptors.append(" ".join(names[index:]))
+            break
+        if word in vocabulary:
+            phrase.append(word)
+            continue
+        if phrase:
+            descriptors.append(" ".join(phrase))
+            phrase = []
+        words.append(word)
+    if phrase:
+        descriptors.append(" ".join(phrase))
+    if words and words[0] in fillers:
+        words = words[1:]
+    descriptors.extend(note for note in (" ".join(note.split()) for note in notes) if note)
+    return " ".join(words) or None
+
+
+@lru_cache(maxsize=None)
+def _vocabulary(locale: LocalePack) -> frozenset:
+    """
+    Internal: Descriptor words of the lines of a locale, English descriptors included for mixed feeds.
+    """
+    return DESCRIPTORS | locale.descriptors
+
+
+def parse_ingredient_line(line: str, is_exact: bool = False, locale: Union[str, LocalePack] = None) -> IngredientLine:
+    """
+    Parse a recipe ingredient line in a single pass.
+    The quantity can be anything `parse_quantity_unit` accepts, or a range of two of them.
+    Args:
+        line: The line to parse, e.g. "2 1/2 cups sifted all-purpose flour"
+        is_exact: Return decimals, fractions and mixed numbers as exact Fractions instead of floats
+        locale: Locale pack, or its name, of the line (default: None, English). Localized lines may also
+            end with the unit and quantity, e.g. "砂糖 大さじ1"
+    Returns:
+        IngredientLine: The quantity, unit, ingredient and descriptors
+
+    Examples:
+        >>> parse_ingredient_line("2 1/2 cups sifted all-purpose flour")
+        # Output: IngredientLine(quantity=2.5, quantity_max=None, unit='cup', ingredient='all-purpose flour',
+        #                        descriptors=('sifted',), valid=True)
+        >>> parse_ingredient_line("2-3 large eggs, beaten")
+        # Output: IngredientLine(quantity=2, quantity_max=3, unit=None, ingredient='eggs',
+        #                        descriptors=('large', 'beaten'), valid=True)
+        >>> parse_ingredient_line("2 EL Mehl, gesiebt", locale="de")
+        # Output: IngredientLine(quantity=2, quantity_max=None, unit='tablespoon', ingredient='mehl',
+        #                        descriptors=('gesiebt',), valid=True)
+    """
+    # English lines are read with the English pack, so both spellings of the default parse alike
+    locale = get_locale("en" if locale is None else locale)
+    lexicon = locale.lexicon
+    text = " ".join(lexicon.normalize(line).split()).rstrip(".")
+    descriptors = [" ".join(note.split()) for note in _PARENTHESES.findall(text)]
+    if descriptors:
+        text = " ".join(_PARENTHESES.sub(" ", text).split())
+        descriptors = [note for note in descriptors if note]
+
+    low = high = unit = None
+    valid = True
+    evaluate = lexicon.evaluate
+    match = locale.line_quantity(text)
+    if match is None and _LEADING_NUMBER.match(text):
+        # The line starts with a number which is not a valid quantity, e.g. "1,5" in English
+        valid = False
+        text = text.partition(" ")[2]
+    trailing = match is None and valid and locale.trailing_quantity(text)
+    if trailing:
+        # The unit and quantity end the line, e.g. "砂糖 大さじ1"
+        match = trailing
+    if match:
+        low = evaluate(match.group("low"), is_exact)
+        if match.group("high"):
+            high = evaluate(match.group("high"), is_exact)
+            valid = high is not None and low is not None and high >= low
+        valid = valid and low is not None
+        if not valid:
+            low = high = None
+        if trailing:
+            unit = _split_unit(match.group("unit"), locale)[0] if match.group("unit") else None
+            # A word before the quantity which is not a unit is part of the ingredient, e.g. "Eier 2"
+            text = text[:match.start()] if unit else text[:match.start("low")]
+            if unit is None and match.group("counter"):
+                unit = _split_unit(match.group("counter"), locale)[0]
+        else:
+            text = text[match.end():]
+
+    if not trailing:
+        unit, text = _split_unit(text, locale)
+        word, _, rest = text.partition(" ")
+        alternative = word in _ALTERNATIVES and locale.line_quantity(rest)
+        if alternative:
+            # An alternative measure is a descriptor, e.g. "or 2 tbsp" in "1 cup or 2 tbsp water"
+            rest = _split_unit(rest[alternative.end():], locale)[1]
+            descriptors.append(text[:len(text) - len(rest)].strip())
+            text = rest
+    ingredient = _split_descriptors(text, descriptors, _vocabulary(locale), locale.fillers)
+    return IngredientLine(low, high, unit, ingredient, tuple(descriptors), valid)
+
+
+def parse_ingredient_lines(
+    lines: Union[str, PathLike, IO, Iterable[str]],
+    is_exact: bool = False,
+    cache_size: int = 4096,
+    locale: Union[str, LocalePack] = None,
+) -> Iterator[IngredientLine]:
+    """
+    Parse many ingredient lines as a stream.
+    Results of repeated lines are reused from a bounded cache, so memory stays flat for any input size.
+    Args:
+        lines: Iterable of lines, or a path or file object read line by line
+        is_exact: Return decimals, fractions and mixed numbers as exact Fractions instead of floats
+        cache_size: Number of distinct lines whose results are kept
+        locale: Locale pack, or its name, of all the lines (default: None, English)
+    Returns:
+        Iterator[IngredientLine]: One result per line, in the order of the input
+    """
+    if locale is not None:
+        locale = get_locale(locale)
+    cache = {}
+    for line in _lines(lines):
+        result = cache.get(line)
+        if result is None:
+            result = instrumentation.stage("parse", parse_ingredient_line, line, is_exact, locale)
+            if len(cache) >= cache_size:
+                cache.clear()
+            cache[line] = result
+        yield result
+
+
+def convert_ingredient_line(
+    line: Union[str, IngredientLine],
+    to_unit: str,
+    ingredient_density: float = None,
+    country: str = None,
+    decimal_places: int = None,
+    mode: str = "auto",
+    locale: Union[str, LocalePack] = None,
+) -> Dict[str, Any]:
+    """
+    Convert the quantity of an ingredient line, the parsed ingredient is used for the density lookup.
+    Args:
+        line: The line, or an already parsed IngredientLine
+        to_unit: Target unit to convert to
+        ingredient_density: Density overriding the one of the parsed ingredient
+        country, decimal_places, mode: See `units_convertor`
+        locale: Locale pack, or its name, of the line, its country is used if country is None (default: None, English)
+    Returns:
+        Dict: Dictionary of converted value and unit, with the "converted value max" of the upper bound of a range
+    Raises:
+        ConversionFailure: If the line has no quantity or unit, or the conversion is not possible
+
+    Examples:
+        >>> convert_ingredient_line("2-3 tbsp melted butter", "g", country="US")
+        # Output: {"converted value": 27.0, "unit": "g", "converted value max": 40.0}
+    """
+    if locale is not None:
+        locale = get_locale(locale)
+        country = country or locale.country
+    if not isinstance(line, str):
+        parsed = line
+    else:
+        parsed = instrumentation.stage("parse", parse_ingredient_line, line, mode in ("exact", "decimal"), locale)
+    if parsed.quantity is None or parsed.unit is None:
+        raise ConversionFailure(f"The ingredient line {line!r} should have a quantity and a unit")
+    response = units_convertor(
+        parsed.quantity, to_unit, parsed.unit, parsed.ingredient, ingredient_density, country, decimal_places, mode
+    )
+    if parsed.quantity_max is not None:
+        response["converted value max"] = units_convertor(
+            parsed.quantity_max, to_unit, parsed.unit, parsed.ingredient, ingredient_density, country,
+            decimal_places, mode,
+        )["converted value"]
+    return response
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""Module parse quantities and units written in other languages
+
+A locale pack is the grammar of one language: its number words, decimal separator, range words and unit
+spellings. A pack is compiled once into lookup tables and regular expressions, the built-in ones the first
+time they are requested, and is selected per call or per batch with the `locale` argument of the convertors
+and line parsers.
+
+    >>> units_convertor("1,5 l", to_unit="ml", locale="de")
+    # Output: {"converted value": 1500.0, "unit": "ml"}
+    >>> parse_ingredient_line("2 EL Mehl", locale="de")
+    # Output: IngredientLine(quantity=2, quantity_max=None, unit='tablespoon', ingredient='mehl', ...)
+"""
+import re
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple, Union
+from foodunits.utils.numbers import ENGLISH, Lexicon
+from foodunits.utils.parser import ParsedQuantity, _compile_grammar, _parse_match, clean
+from foodunits.utils.registry import REGISTRY
+
+
+def _alias_key(text: str) -> str:
+    """
+    Internal: Lookup form of a unit spelling: lower case, without dots and with one space, e.g. "c. à s." -> "c à s".
+    """
+    return " ".join(text.lower().replace(".", " ").split())
+
+
+class LocalePack:
+    """
+    Immutable parsing grammar of a language, compiled once when the pack is created.
+
+    Examples:
+        >>> pack = LocalePack("de", decimal_separator=",", unit_aliases={"el": "tablespoon"}, country="metric")
+        >>> pack.parse_quantity_unit("1,5 EL")
+        # Output: ParsedQuantity(quantity=1.5, unit='tablespoon', valid=True)
+        >>> pack.unit("EL")
+        # Output: 'tablespoon'
+    """
+    __slots__ = (
+        "name", "lexicon", "unit_aliases", "country", "descriptors", "fillers",
+        "_alias_words", "_quantity_unit", "_unit_quantity", "_line", "_trailing",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        decimal_separator: str = ".",
+        number_words: Mapping[str, int] = None,
+        scales: Iterable[str] = (),
+        range_words: Iterable[str] = (),
+        conjunctions: Iterable[str] = (),
+        unit_aliases: Mapping[str, str] = None,
+        country: str = None,
+        descriptors: Iterable[str] = (),
+        fillers: Iterable[str] = (),
+        lexicon: Lexicon = None,
+    ):
+        """
+        Initialization
+        Args:
+            name: Name of the locale, e.g. "de"
+            decimal_separator: "." or ",", e.g. "1,5" in German
+            number_words: Number words and their values, e.g. {"zwei": 2}
+            scales: Words multiplying the number before them, e.g. "hundert"
+            range_words: Words joining the two ends of a range, besides dashes, e.g. "bis"
+            conjunctions: Words joining number words, e.g. "und"
+            unit_aliases: Unit spellings of the language and the unit they stand for, any spelling in the
+                unit registry, e.g. {"el": "tablespoon"}
+            country: Country of the cup, teaspoon and tablespoon when the call gives none
+            descriptors: Preparation and size words of ingredient lines, e.g. "gehackt"
+            fillers: Words between a unit and its ingredient, e.g. "de" in "2 tasses de farine"
+            lexicon: Number grammar used instead of the number arguments, e.g. the English one
+        Raises:
+            ValueError: If a unit alias stands for an unknown unit
+        """
+        setattr_ = object.__setattr__
+        if lexicon is None:
+            lexicon = Lexicon(number_words or {}, scales, decimal_separator, range_words, conjunctions)
+        aliases = {}
+        for alias, unit in (unit_aliases or {}).items():
+            if REGISTRY.get(unit) is None:
+                raise ValueError(f"The alias {alias!r} of locale {name!r} stands for the unknown unit {unit!r}")
+            aliases[_alias_key(alias)] = unit
+        setattr_(self, "name", name.lower())
+        setattr_(self, "lexicon", lexicon)
+        setattr_(self, "unit_aliases", MappingProxyType(aliases))
+        setattr_(self, "country", country)
+        setattr_(self, "descriptors", frozenset(word.lower() for word in descriptors))
+        setattr_(self, "fillers", frozenset(word.lower() for word in fillers))
+        # Longest alias tried first at the start of a text, in words, e.g. "cuillère à soupe"
+        setattr_(self, "_alias_words", max((alias.count(" ") + 1 for alias in aliases), default=0))
+
+        quantity, range_pattern = lexicon.quantity_pattern, lexicon.range_pattern
+        # "1,5 l", "5ml" or "1-2 EL", the grammar of `parse_quantity_unit`
+        setattr_(self, "_quantity_unit", _compile_grammar(lexicon))
+        # "大さじ1": the unit is written before the quantity
+        setattr_(self, "_unit_quantity", re.compile(rf"(?P<unit>[^\d\s][^\d]*?)\s*(?P<quantity>{quantity})"))
+        # Ingredient lines: "2-3 EL Mehl", or the quantity at the end of the line with its unit before or
+        # after it, e.g. "砂糖 大さじ1〜2" or "卵 2個"
+        line_quantity = rf"(?P<low>{quantity})(?:\s*(?:{range_pattern})\s*(?P<high>{quantity}))?"
+        setattr_(self, "_line", re.compile(rf"{line_quantity}(?=\s|[^\W\d_]|$)\s*"))
+        setattr_(self, "_trailing", re.compile(
+            rf"(?:^|\s)(?P<unit>[^\d\s]*?)\s*{line_quantity}(?P<counter>[^\d\s]*)$"
+        ))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LocalePack is immutable")
+
+    def __repr__(self) -> str:
+        return f"LocalePack({self.name!r}, aliases={len(self.unit_aliases)}, country={self.country!r})"
+
+    def unit(self, unit: Optional[str]) -> Optional[str]:
+        """
+        Unit an alias of the locale stands for, other spellings are returned unchanged.
+        """
+        if not isinstance(unit, str):
+            return unit
+        return self.unit_aliases.get(_alias_key(unit), unit)
+
+    def split_unit(self, text: str) -> Tuple[Optional[str], str]:
+        """
+        Unit alias at the start of a text and the rest of the text, the longest alias wins.
+        Returns:
+            The unit the alias stands for (None if the text does not start with an alias) and the rest of the text
+        """
+        words = text.split(" ", self._alias_words)
+        for count in range(min(self._alias_words, len(words)), 0, -1):
+            unit = self.unit_aliases.get(_alias_key(" ".join(words[:count])))
+            if unit is not None:
+                return unit, " ".join(words[count:])
+        return None, text
+
+    def line_quantity(self, text: str) -> Optional["re.Match"]:
+        """
+        Quantity or range at the start of an ingredient line, e.g. "2-3" in "2-3 EL Mehl".
+        Returns:
+            The match, with the groups "low" and "high", None if the line does not start with a quantity
+        """
+        return self._line.match(text)
+
+    def trailing_quantity(self, text: str) -> Optional["re.Match"]:
+        """
+        Unit and quantity ending an ingredient line, e.g. "大さじ1" in "砂糖 大さじ1" or "2個" in "卵 2個".
+        Returns:
+            The match, with the groups "unit", "low", "high" and "counter", None if the line does not end
+            with a quantity
+        """
+        return self._trailing.search(text)
+
+    def parse_quantity_unit(self, value: str, is_exact: bool = False) -> ParsedQuantity:
+        """
+        Parse a quantity + unit string in a single pass, the unit may also be written before the quantity.
+        Args:
+            value: The string to parse, e.g. "1,5 l" in German or "大さじ1" in Japanese
+            is_exact: Return decimals, fractions and mixed numbers as exact Fractions instead of floats
+        Returns:
+            ParsedQuantity: The quantity and the unit, unit aliases are replaced by the unit they stand for
+        """
+        text = clean(self.lexicon.normalize(value))
+        match = self._quantity_unit.match(text)
+        if not match.group("quantity"):
+            unit_first = self._unit_quantity.fullmatch(text)
+            if unit_first is not None:
+                number = self.lexicon.evaluate(unit_first.group("quantity"), is_exact)
+                return ParsedQuantity(number, self.unit(unit_first.group("unit").strip()), number is not None)
+        parsed = _parse_match(match, self.lexicon, is_exact)
+        return parsed._replace(unit=self.unit(parsed.unit))
+
+
+_GERMAN_NUMBERS = {
+    "null": 0, "ein": 1, "eine": 1, "einen": 1, "eins": 1, "zwei": 2, "drei": 3, "vier": 4, "fünf": 5, "sechs": 6,
+    "sieben": 7, "acht": 8, "neun": 9, "zehn": 10, "elf": 11, "zwölf": 12, "zwanzig": 20, "dreißig": 30,
+    "vierzig": 40, "fünfzig": 50, "hundert": 100, "tausend": 1000, "halb": 0.5, "halbe": 0.5,
+}
+_FRENCH_NUMBERS = {
+    "zéro": 0, "un": 1, "une": 1, "deux": 2, "trois": 3, "quatre": 4, "cinq": 5, "six": 6, "sept": 7, "huit": 8,
+    "neuf": 9, "dix": 10, "onze": 11, "douze": 12, "vingt": 20, "trente": 30, "quarante": 40, "cinquante": 50,
+    "cent": 100, "mille": 1000, "demi": 0.5, "demie": 0.5,
+}
+_SPANISH_NUMBERS = {
+    "cero": 0, "un": 1, "una": 1, "uno": 1, "dos": 2, "tres": 3, "cuatro": 4, "cinco": 5, "seis": 6, "siete": 7,
+    "ocho": 8, "nueve": 9, "diez": 10, "once": 11, "doce": 12, "veinte": 20, "treinta": 30, "cuarenta": 40,
+    "cincuenta": 50, "cien": 100, "ciento": 100, "mil": 1000, "media": 0.5, "medio": 0.5,
+}
+# "gr" is gram in French and Spanish recipes, but grain in English ones
+_GRAM_ALIASES = {"gr": "g"}
+
+# Arguments of the built-in packs, each pack is compiled the first time it is requested
+_BUILTIN_LOCALES = {
+    "en": dict(lexicon=ENGLISH, fillers=("of",)),
+    "de": dict(
+        decimal_separator=",",
+        number_words=_GERMAN_NUMBERS,
+        scales=("hundert", "tausend"),
+        range_words=("bis",),
+        conjunctions=("und",),
+        unit_aliases={
+            "el": "tablespoon", "essl": "tablespoon", "esslöffel": "tablespoon",
+            "tl": "teaspoon", "teel": "teaspoon", "teelöffel": "teaspoon",
+            "tasse": "cup", "tassen": "cup", "prise": "pinch", "prisen": "pinch",
+            "liter": "l", "gramm": "g", "kilogramm": "kg", "milliliter": "ml",
+            "scheibe": "slice", "scheiben": "slice", "dose": "can", "dosen": "can", "bund": "bunch",
+            "zehe": "clove", "zehen": "clove", "stück": "piece", "stk": "piece",
+        },
+        country="metric",
+        descriptors=("fein", "frisch", "gehackt", "geschält", "geschmolzen", "gesiebt", "gewürfelt", "groß", "klein",
+                     "weich", "warm", "kalt"),
+    ),
+    "fr": dict(
+        decimal_separator=",",
+        number_words=_FRENCH_NUMBERS,
+        scales=("cent", "mille"),
+        range_words=("à",),
+        conjunctions=("et",),
+        unit_aliases={
+            **_GRAM_ALIASES,
+            "c à soupe": "tablespoon", "c à s": "tablespoon", "cas": "tablespoon",
+            "cuillère à soupe": "tablespoon", "cuillères à soupe": "tablespoon",
+            "c à café": "teaspoon", "c à c": "teaspoon", "cac": "teaspoon",
+            "cuillère à café": "teaspoon", "cuillères à café": "teaspoon",
+            "tasse": "cup", "tasses": "cup", "pincée": "pinch", "pincées": "pinch",
+            "litre": "l", "litres": "l", "gramme": "g", "grammes": "g", "kilogramme": "kg", "kilogrammes": "kg",
+            "millilitre": "ml", "millilitres": "ml", "tranche": "slice", "tranches": "slice",
+            "gousse": "clove", "gousses": "clove", "botte": "bunch", "boîte": "can",
+        },
+        country="metric",
+        descriptors=("frais", "fraîche", "fondu", "fondue", "haché", "hachée", "râpé", "râpée", "tamisé", "tamisée",
+                     "émincé", "émincée", "gros", "grosse", "petit", "petite"),
+        fillers=("de", "du", "des"),
+    ),
+    "es": dict(
+        decimal_separator=",",
+        number_words=_SPANISH_NUMBERS,
+        scales=("cien", "ciento", "mil"),
+        range_words=("a",),
+        conjunctions=("y",),
+        unit_aliases={
+            **_GRAM_ALIASES,
+            "cucharada": "tablespoon", "cucharadas": "tablespoon", "cda": "tablespoon", "cdas": "tablespoon",
+            "cucharadita": "teaspoon", "cucharaditas": "teaspoon", "cdta": "teaspoon", "cdtas": "teaspoon",
+            "taza": "cup", "tazas": "cup", "pizca": "pinch", "pizcas": "pinch",
+            "litro": "l", "litros": "l", "gramo": "g", "gramos": "g", "kilogramo": "kg", "kilogramos": "kg",
+            "mililitro": "ml", "mililitros": "ml", "rebanada": "slice", "rebanadas": "slice",
+            "diente": "clove", "dientes": "clove", "lata": "can", "latas": "can",
+        },
+        country="metric",
+        descriptors=("fresco", "fresca", "picado", "picada", "rallado", "rallada", "derretido", "derretida",
+                     "grande", "pequeño", "pequeña", "tamizado", "tamizada"),
+        fillers=("de",),
+    ),
+    "ja": dict(
+        range_words=("〜", "～"),
+        unit_aliases={
+            "大さじ": "tablespoon", "小さじ": "teaspoon", "カップ": "cup",
+            "グラム": "g", "キログラム": "kg", "ミリリットル": "ml", "cc": "ml", "リットル": "l",
+            "少々": "pinch", "ひとつまみ": "pinch", "個": "piece", "枚": "slice", "缶": "can", "片": "clove",
+        },
+        country="jp",
+    ),
+}
+# Compiled packs: the built-in ones already requested, and the registered ones
+LOCALES: Dict[str, LocalePack] = {}
+
+
+def register_locale(pack: LocalePack) -> LocalePack:
+    """
+    Add a locale pack, or replace the pack of the same name.
+    Examples:
+        >>> register_locale(LocalePack("nl", decimal_separator=",", unit_aliases={"el": "tablespoon"}))
+        >>> units_convertor("1,5 el", to_unit="ml", locale="nl")
+    """
+    LOCALES[pack.name] = pack
+    return pack
+
+
+def get_locale(locale: Union[str, LocalePack]) -> LocalePack:
+    """
+    Load a locale pack by name, regional names fall back to their language, e.g. "de-AT" to "de".
+    Args:
+        locale: The name of a registered pack, or a pack
+    Returns:
+        LocalePack: The pack
+    Raises:
+        ValueError: If no pack is registered under the name
+    """
+    if isinstance(locale, LocalePack):
+        return locale
+    name = locale.lower().replace("_", "-")
+    pack = _load_locale(name) or _load_locale(name.split("-")[0])
+    if pack is None:
+        names = tuple(sorted({*LOCALES, *_BUILTIN_LOCALES}))
+        raise ValueError(f"Unknown locale {locale!r}, expected one of {names}")
+    return pack
+
+
+def _load_locale(name: str) -> Optional[LocalePack]:
+    """
+    Internal: Pack registered under a name, a built-in pack is compiled on its first request.
+    """
+    pack = LOCALES.get(name)
+    if pack is None and name in _BUILTIN_LOCALES:
+        pack = register_locale(LocalePack(name, **_BUILTIN_LOCALES[name]))
+    return pack
@@ -0,0 +1,121 @@
+"""Module run food unit conversion over many processes"""
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Sequence, Tuple
+from foodunits.batch import units_convertor_batch, BatchResult
+from foodunits.utils.units import Convert_Dict
+from foodunits.utils.utils import find_country
+
+# value, to_unit, from_unit, ingredient, ingredient_density, country
+_ROW_SIZE = 6
+
+
+def _init_worker(database: str = None):
+    """
+    Internal: Build the lookup tables once per worker process, before the first chunk.
+    """
+    if database:
+        from foodunits.database import use_database
+        use_database(database)
+    # The unit registry is built when this module is imported
+    from foodunits.utils.ingredients import ingredient_index
+    ingredient_index(Convert_Dict.ml_to_g_by_ingredient_dict())
+    find_country("us")
+
+
+def _convert_chunk(rows: List[Sequence], decimal_places: int = None) -> BatchResult:
+    """
+    Internal: Convert one chunk of rows with the batch convertor.
+    """
+    padded = (tuple(row) + (None,) * (_ROW_SIZE - len(row)) for row in rows)
+    values, to_units, from_units, ingredients, densities, countries = zip(*padded)
+    return units_convertor_batch(
+        values, to_units, from_units,
+        ingredients=ingredients,
+        ingredient_densities=densities,
+        countries=countries,
+        decimal_places=decimal_places,
+    )
+
+
+def _chunks(rows: Iterable[Sequence], chunksize: int) -> Iterator[List[Sequence]]:
+    """
+    Internal: Read the rows lazily, one chunk at a time.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_result(result: BatchResult) -> Iterator[Tuple[float, str, int]]:
+    """
+    Internal: Iterate over the rows of a batch result.
+    """
+    return zip(result.values.tolist(), result.units.tolist(), result.errors.tolist())
+
+
+def units_convertor_parallel(
+    rows: Iterable[Sequence],
+    workers: int = None,
+    chunksize: int = 10000,
+    max_pending: int = None,
+    decimal_places: int = None,
+    executor: Executor = None,
+    database: str = None,
+) -> Iterator[Tuple[float, str, int]]:
+    """
+    Convert many rows over a pool of worker processes.
+    Rows are read lazily and sent to the workers in chunks, every worker builds the unit registry,
+    ingredient index and country table once. At most `max_pending` chunks are in flight, so memory stays
+    bounded for any input size, and results are yielded in the order of the input.
+
+    Args:
+        rows: Iterable of rows in the argument order of `units_convertor`:
+            (value, to_unit, from_unit, ingredient, ingredient_density, country), trailing items can be omitted
+        workers: Number of worker processes (default: number of CPUs), 0 converts in the current process
+        chunksize: Number of rows sent to a worker at once
+        max_pending: Maximum number of chunks in flight (default: twice the number of workers)
+        decimal_places: Number of decimal places for the converted values (default: None, not rounded)
+        executor: An existing executor to use instead of starting a process pool
+        database: A database file compiled by `build_database` to load in the worker processes,
+            the workers share one memory-mapped copy
+    Returns:
+        Iterator of (converted value, unit, error code) per row, see `units_convertor_batch`
+
+    Examples:
+        >>> rows = [("1 cup", "ml", None, None, None, "us"), (2.5, "g", "lb")]
+        >>> list(units_convertor_parallel(rows, workers=2, decimal_places=3))
+        # Output: [(240.0, 'ml', 0), (1133.98, 'g', 0)]
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = _chunks(rows, chunksize)
+
+    if workers == 0 and executor is None:
+        for chunk in chunks:
+            yield from _iter_result(_convert_chunk(chunk, decimal_places))
+        return
+
+    if max_pending is None:
+        max_pending = 2 * max(workers, 1)
+    owned = executor is None
+    if owned:
+        executor = ProcessPoolExecutor(max_workers=max(workers, 1), initializer=_init_worker, initargs=(database,))
+    try:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_convert_chunk, chunk, decimal_places))
+            # Backpressure: wait for the oldest chunk before reading more rows
+            if len(pending) >= max_pending:
+                yield from _iter_result(pending.popleft().result())
+        while pending:
+            yield from _iter_result(pending.popleft().result())
+    finally:
+        if owned:
+            executor.shutdown(cancel_futures=True)
+
@@ -0,0 +1,204 @@
+"""Module scale and localize whole recipes"""
+from numbers import Real
+from typing import Iterable, List, NamedTuple, Optional, Tuple, Union
+from foodunits.batch import _Resolver
+from foodunits.lines import IngredientLine, parse_ingredient_lines
+from foodunits.utils.registry import REGISTRY
+from foodunits.exceptions import ErrorCode
+
+# Output units of a unit system per category, largest first, with the smallest quantity written in the unit,
+# e.g. 1/4 cup is nicer than 4 tablespoons, but 1/8 cup is not
+NICE_UNITS = {
+    "metric": {
+        "volume": (("l", 1), ("ml", 0)),
+        "weight": (("kg", 1), ("g", 0)),
+    },
+    "us": {
+        "volume": (("cup", 0.25), ("tablespoon", 1), ("teaspoon", 0)),
+        "weight": (("lb", 1), ("oz", 0)),
+    },
+}
+# Country of the containers of a unit system, if the recipe has none
+_SYSTEM_COUNTRIES = {"us": "us", "metric": "metric"}
+# Fractions written in the systems measured with cups and spoons, nice quantities are snapped to their multiples
+NICE_FRACTIONS = {"us": (1 / 8, 1 / 3)}
+# Largest relative change of a quantity snapped to a nice fraction, e.g. 0.986 cup is written as 1 cup
+SNAP_TOLERANCE = 0.025
+
+
+class ScaledIngredient(NamedTuple):
+    """
+    One ingredient line of a scaled recipe.
+    Attributes:
+        line: The parsed line
+        quantity: The scaled and converted quantity, the lower bound of a range, None if the line has no quantity
+        quantity_max: The scaled and converted upper bound of a range, otherwise None
+        unit: The output unit, the unit of the line if it is not converted
+        error: ErrorCode.OK, or the reason the quantity is only scaled and kept in the unit of the line
+    """
+    line: IngredientLine
+    quantity: Optional[float]
+    quantity_max: Optional[float]
+    unit: Optional[str]
+    error: ErrorCode = ErrorCode.OK
+
+
+class Recipe:
+    """
+    Recipe of ingredient lines, parsed once and scaled or localized in one pass.
+    Densities, countries and conversion factors are resolved once per recipe, however many lines share them.
+
+    Examples:
+        >>> recipe = Recipe(["16 tsp sugar", "2 1/2 cups sifted all-purpose flour", "2 large eggs"], country="US")
+        >>> recipe.scale(3)
+        # Output: [ScaledIngredient(..., quantity=1.0, quantity_max=None, unit='cup', ...),
+        #          ScaledIngredient(..., quantity=7.5, quantity_max=None, unit='cup', ...),
+        #          ScaledIngredient(..., quantity=6, quantity_max=None, unit=None, ...)]
+        >>> recipe.scale(2, system="metric", measure="weight")
+        # Output: quantities in g and kg
+    """
+    def __init__(self, lines: Iterable[Union[str, IngredientLine]], country: str = None):
+        """
+        Initialization
+        Args:
+            lines: Ingredient lines, or a path or file object read line by line, or parsed IngredientLines
+            country: Country of the cup, teaspoon and tablespoon of the recipe, by default the containers of the
+                unit system the lines are converted to, e.g. US cups for the "us" system
+        """
+        if not isinstance(lines, (str, bytes)) and not hasattr(lines, "read"):
+            lines = list(lines)
+        if isinstance(lines, list) and lines and all(isinstance(line, IngredientLine) for line in lines):
+            self.lines = tuple(lines)
+        else:
+            self.lines = tuple(parse_ingredient_lines(lines))
+        self.country = country
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def scale(
+        self,
+        factor: float = 1,
+        system: str = None,
+        measure: str = None,
+        nice: bool = True,
+        decimal_places: Optional[int] = 2,
+    ) -> List[ScaledIngredient]:
+        """
+        Scale the recipe, and convert its quantities to a unit system.
+        Args:
+            factor: Scale factor, e.g. new servings / servings
+            system: "metric" or "us", by default the system of every line is kept
+            measure: "weight" or "volume" to convert the lines to, with the density of their ingredient;
+                by default every line keeps its category
+            nice: Write every quantity in the largest unit of its system where it is not too small, e.g. 48 tsp as
+                1 cup; otherwise lines are only converted if the system changes, to its smallest unit
+            decimal_places: Number of decimal places of the quantities (default: 2), None to keep them as computed
+        Returns:
+            List[ScaledIngredient]: One scaled ingredient per line, in the order of the recipe
+        Raises:
+            ValueError: If the factor is not positive, or the system or measure is unknown
+        """
+        if isinstance(factor, bool) or not isinstance(factor, Real) or not factor > 0:
+            raise ValueError(f"The factor should be a positive number, got {factor!r}")
+        if system is not None and system not in NICE_UNITS:
+            raise ValueError(f"Unknown system {system!r}, expected one of {tuple(NICE_UNITS)}")
+        if measure not in ("weight", "volume", None):
+            raise ValueError(f"Unknown measure {measure!r}, expected 'weight', 'volume' or None")
+        resolver = _Resolver()
+        return [
+            self._scale_line(line, factor, system, measure, nice, decimal_places, resolver, self.country)
+            for line in self.lines
+        ]
+
+    @staticmethod
+    def _scale_line(
+        line: IngredientLine, factor, system, measure, nice, decimal_places, resolver: _Resolver, country
+    ) -> ScaledIngredient:
+        """
+        Internal: Scale and convert one line, the resolver shares the densities and factors of the recipe.
+        """
+        quantities = tuple(
+            None if quantity is None else quantity * factor for quantity in (line.quantity, line.quantity_max)
+        )
+        unit, error = line.unit, ErrorCode.OK
+        record = REGISTRY.get(unit) if unit else None
+        if quantities[0] is not None and record is not None and record.system:
+            category = measure or record.category
+            target_system = system or ("metric" if record.system == "metric" else "us")
+            ladder = NICE_UNITS[target_system][category]
+            if nice or category != record.category or (system and record.si not in dict(ladder)):
+                country = country or _SYSTEM_COUNTRIES.get(target_system)
+                converted, unit, error = _convert(quantities, record.si, ladder, nice, line.ingredient, resolver, country)
+                if error == ErrorCode.OK:
+                    quantities = converted
+                    if nice and target_system in NICE_FRACTIONS:
+                        quantities = tuple(_snap(quantity, NICE_FRACTIONS[target_system]) for quantity in quantities)
+                else:
+                    unit = line.unit
+        if decimal_places is not None:
+            quantities = tuple(_round(quantity, decimal_places) for quantity in quantities)
+        return ScaledIngredient(line, quantities[0], quantities[1], unit, error)
+
+
+def _convert(quantities: Tuple, from_unit: str, ladder: Tuple, nice: bool, ingredient: str, resolver, country):
+    """
+    Internal: Convert the quantities to the nicest unit of a ladder, or to its smallest unit.
+    Returns:
+        The converted quantities, the unit and the ErrorCode
+    """
+    # The smallest unit of the ladder first, every other unit is a step from it
+    base = ladder[-1][0]
+    factor, _, error = resolver.resolve(from_unit, base, ingredient, None, country)
+    if error != ErrorCode.OK:
+        return quantities, None, error
+    values = tuple(None if quantity is None else quantity * factor for quantity in quantities)
+    if nice:
+        for unit, smallest in ladder[:-1]:
+            step, _, step_error = resolver.resolve(base, unit, None, None, country)
+            # Quantities a snap away from the smallest one are nice too, e.g. 0.99 cup
+            if step_error == ErrorCode.OK and values[0] * step >= smallest * (1 - SNAP_TOLERANCE):
+                return tuple(None if value is None else value * step for value in values), unit, ErrorCode.OK
+    return values, base, ErrorCode.OK
+
+
+def _snap(quantity, fractions: Tuple[float, ...]):
+    """
+    Internal: Closest multiple of the fractions to a quantity, unless it changes the quantity beyond the tolerance.
+    """
+    if not quantity:
+        return quantity
+    best, best_error = quantity, SNAP_TOLERANCE * abs(quantity)
+    for fraction in fractions:
+        multiple = round(quantity / fraction) * fraction
+        error = abs(multiple - quantity)
+        if multiple and error < best_error:
+            best, best_error = multiple, error
+    return best
+
+
+def _round(quantity, decimal_places: int):
+    """
+    Internal: Round a quantity, integers stay integers.
+    """
+    if quantity is None or isinstance(quantity, int):
+        return quantity
+    return round(quantity, decimal_places)
+
+
+def scale_recipe(
+    lines: Iterable[str],
+    factor: float = 1,
+    system: str = None,
+    measure: str = None,
+    country: str = None,
+    nice: bool = True,
+    decimal_places: Optional[int] = 2,
+) -> List[ScaledIngredient]:
+    """
+    Parse, scale and convert a recipe in one call, see `Recipe.scale`.
+    Examples:
+        >>> scale_recipe(["48 tsp sugar"], system="us")
+        # Output: [ScaledIngredient(..., quantity=1.0, quantity_max=None, unit='cup', error=<ErrorCode.OK: 0>)]
+    """
+    return Recipe(lines, country=country).scale(factor, system, measure, nice, decimal_places)
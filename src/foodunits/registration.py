@@ -0,0 +1,151 @@
+"""Module register units, aliases, container sizes and densities at runtime"""
+from collections.abc import MutableMapping
+from numbers import Real
+from typing import Dict, Iterable
+from foodunits.cache import invalidate_caches, invalidate_results
+from foodunits.utils.planner import container_sizes
+from foodunits.utils.registry import REGISTRY, UnitRecord
+from foodunits.utils.singular import register_plural
+from foodunits.utils.units import Convert_Dict
+from foodunits.utils.utils import find_country
+
+
+def _check_size(value, name: str):
+    """
+    Internal: Raise ValueError unless the value is a positive number.
+    """
+    if isinstance(value, bool) or not isinstance(value, Real) or not value > 0:
+        raise ValueError(f"The {name} should be a positive number, got {value!r}")
+
+
+def _register_plurals(spellings: Iterable[str], plurals: Iterable[str]):
+    """
+    Internal: Teach the singularizer the new spellings, irregular plurals map to the first spelling.
+    """
+    spellings = [spelling for spelling in spellings if spelling]
+    for spelling in spellings:
+        register_plural(spelling)
+    for plural in plurals:
+        register_plural(spellings[0], plural)
+
+
+def register_unit(
+    name: str,
+    category: str,
+    si: str = None,
+    factor: float = None,
+    system: str = None,
+    aliases: Iterable[str] = (),
+    plurals: Iterable[str] = (),
+    sizes: Dict[str, float] = None,
+) -> UnitRecord:
+    """
+    Register a unit, it can be validated and converted right away.
+    Args:
+        name: Full name of the unit, e.g. "stick of butter"
+        category: "volume", "weight" or another category of non-convertible units, e.g. "other"
+        si: Symbol of the unit
+        factor: Size of the unit in liter for volumes or gram for weights (metric system),
+            or in fluid ounce or pound if system is "imperial"
+        system: "metric", "imperial" or "container", by default "container" if sizes are given,
+            "metric" if a factor is given, otherwise the unit is not convertible
+        aliases: Other spellings of the unit
+        plurals: Irregular plural spellings, e.g. "sticks of butter"
+        sizes: Size in liter per country of a container unit, e.g. {"uk": 0.01, "au": 0.01}
+    Returns:
+        UnitRecord: The record of the unit
+    Raises:
+        ValueError: If the unit is invalid or one of its spellings belongs to another unit
+
+    Examples:
+        >>> register_unit("gō", "volume", sizes={"jp": 0.18})
+        >>> units_convertor("2 gō", "ml", country="Japan")
+        # Output: {"converted value": 360.0, "unit": "ml"}
+        >>> register_unit("stick of butter", "weight", factor=113.4, plurals=["sticks of butter"])
+    """
+    aliases, plurals = tuple(aliases), tuple(plurals)
+    if system is None:
+        system = "container" if sizes else "metric" if factor is not None else None
+    if sizes and system != "container":
+        raise ValueError("Only container units have sizes per country")
+    for size in (sizes or {}).values():
+        _check_size(size, "container size")
+    # Validated before the unit is added, so that an invalid country leaves no half-registered unit
+    sizes = {_country_key(country): float(size) for country, size in (sizes or {}).items()}
+
+    record = REGISTRY.add(name, category, si=si, system=system, factor=factor, aliases=aliases, plurals=plurals)
+    _register_plurals((name, si, *aliases), plurals)
+    if sizes:
+        container_sizes(record.name).update(sizes)
+    invalidate_caches()
+    return record
+
+
+def register_alias(alias: str, unit: str, plurals: Iterable[str] = ()) -> UnitRecord:
+    """
+    Register another spelling of a unit.
+    Args:
+        alias: The new spelling, e.g. "dsp"
+        unit: Any accepted spelling of the unit, e.g. "dessertspoon"
+        plurals: Irregular plural spellings of the alias
+    Returns:
+        UnitRecord: The record of the unit
+    Raises:
+        ValueError: If the unit is unknown or the alias belongs to another unit
+    """
+    plurals = tuple(plurals)
+    record = REGISTRY.add_alias(alias, unit, plurals=plurals)
+    _register_plurals((alias,), plurals)
+    invalidate_caches()
+    return record
+
+
+def _country_key(country: str) -> str:
+    """
+    Internal: Country code the convertor resolves a country to, the key of the container sizes.
+    """
+    if not isinstance(country, str) or not country.strip():
+        raise ValueError("The country should be a non-empty string")
+    return find_country(country.strip().lower())
+
+
+def register_container_size(unit: str, country: str, size: float):
+    """
+    Register the size of cup, teaspoon, tablespoon or a registered container unit for a country.
+    Args:
+        unit: Any accepted spelling of the container unit
+        country: Country name or code, or region, e.g. "Japan"
+        size: Size in liter
+    Raises:
+        ValueError: If the unit is not a container unit or the size is invalid
+    """
+    if not REGISTRY.is_container(unit):
+        raise ValueError(f"{unit!r} is not a container unit")
+    _check_size(size, "container size")
+    container_sizes(REGISTRY.get(unit).name)[_country_key(country)] = float(size)
+    invalidate_caches()
+
+
+def register_density(ingredient: str, density: float):
+    """
+    Register or update the density of an ingredient, a new ingredient is added to the ingredient index incrementally.
+    Only the cached responses are invalidated, the conversion plans do not depend on densities.
+    Args:
+        ingredient: The ingredient name, e.g. "smoked paprika"
+        density: The density in g/ml
+    Raises:
+        ValueError: If the density is invalid
+        TypeError: If the densities are served from a compiled database, which is read-only
+    """
+    if not isinstance(ingredient, str) or not ingredient.strip():
+        raise ValueError("The ingredient should be a non-empty string")
+    _check_size(density, "density")
+    densities = Convert_Dict.ml_to_g_by_ingredient_dict()
+    if not isinstance(densities, MutableMapping):
+        raise TypeError("The densities are read from a compiled database, rebuild it with build_database")
+    is_new = ingredient not in densities
+    densities[ingredient] = float(density)
+    if is_new:
+        from foodunits.utils.ingredients import index_new_key  # deferred, fuzzywuzzy is only needed for densities
+        index_new_key(densities, ingredient)
+    invalidate_results()
@@ -0,0 +1,160 @@
+"""Indexed ingredient matching"""
+# -*- coding: utf-8 -*-
+import heapq
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Optional, Tuple
+from fuzzywuzzy import fuzz, utils as fuzz_utils
+from foodunits import instrumentation
+from foodunits.utils.units import Convert_Dict
+
+
+def normalize_ingredient(ingredient: str) -> str:
+    """Normalize an ingredient name the way `fuzz.token_sort_ratio` does.
+    The normalization keeps only ascii letters and numbers, lowers the case and sorts the tokens.
+    Args:
+        ingredient: The ingredient name.
+    Returns:
+        The normalized name, e.g. "Milk, skimmed" -> "milk skimmed".
+    """
+    return " ".join(sorted(fuzz_utils.full_process(ingredient, force_ascii=True).split()))
+
+
+def _trigrams(normalized: str):
+    """Internal: Character trigrams of a normalized name, padded to include word boundaries."""
+    padded = f" {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class IngredientIndex:
+    """Ingredient index built once from a dictionary of ingredient densities.
+    A lookup first tries the exact and normalized names with hash maps. Otherwise a trigram inverted index
+    selects a short list of candidates, and only those are scored with `fuzz.token_sort_ratio`.
+
+    Examples:
+        >>> index = IngredientIndex({"sugar": 1.59, "skimmed milk": 1.03})
+        >>> index.match("skimme milk")
+        # Output: ('skimmed milk', 96)
+    """
+    # Number of candidates scored with fuzzywuzzy per lookup
+    candidates = 16
+    # Scorer of the candidates
+    _score = staticmethod(fuzz.ratio)
+
+    def __init__(self, ingredient_dict: Dict[str, float]):
+        self.ingredient_dict = ingredient_dict
+        self.size = 0
+        self._keys = []
+        self._normalized = []
+        self._by_normalized = {}
+        self._postings = defaultdict(list)
+        for key in ingredient_dict:
+            self.add(key)
+
+    def add(self, key: str):
+        """Index one more key of the ingredient dictionary.
+        Args:
+            key: The ingredient name, as stored in the dictionary.
+        """
+        position = len(self._keys)
+        normalized = normalize_ingredient(key)
+        self._keys.append(key)
+        self._normalized.append(normalized)
+        # The first key wins, as in the dictionary order
+        self._by_normalized.setdefault(normalized, position)
+        for trigram in _trigrams(normalized):
+            self._postings[trigram].append(position)
+        self.size += 1
+
+    def match(self, ingredient: str) -> Optional[Tuple[str, int]]:
+        """Find the closest ingredient name.
+        Args:
+            ingredient: The ingredient to search for.
+        Returns:
+            The matching key and its `fuzz.token_sort_ratio` score, or None if there is no candidate.
+        """
+        if not ingredient:
+            return None
+        if ingredient in self.ingredient_dict:
+            return ingredient, 100
+        normalized = normalize_ingredient(ingredient)
+        if not normalized:
+            return None
+        position = self._by_normalized.get(normalized)
+        if position is not None:
+            return self._keys[position], 100
+
+        overlaps = defaultdict(int)
+        for trigram in _trigrams(normalized):
+            for position in self._postings.get(trigram, ()):
+                overlaps[position] += 1
+        shortlist = heapq.nlargest(self.candidates, overlaps, key=lambda position: (overlaps[position], -position))
+
+        if instrumentation.ENABLED:
+            instrumentation.count("ingredient_candidate_scored", len(shortlist))
+        best_position, best_score = None, 0
+        for position in sorted(shortlist):
+            score = self._score(normalized, self._normalized[position])
+            if score > best_score:
+                best_position, best_score = position, score
+        if best_position is None:
+            return None
+        return self._keys[best_position], best_score
+
+    def density(self, ingredient: str, threshold: int = 85) -> Optional[float]:
+        """Retrieve the density of the closest ingredient.
+        Args:
+            ingredient: The ingredient to search for.
+            threshold: The match is only valid if its score is above the threshold.
+        Returns:
+            The density, or None if no close match is found.
+        """
+        result = self.match(ingredient)
+        if not result or result[1] <= threshold:
+            return None
+        return self.ingredient_dict.get(result[0])
+
+
+_INDEXES = {}
+_MAX_INDEXES = 64
+
+
+def ingredient_index(ingredient_dict: Dict[str, float]) -> IngredientIndex:
+    """Load the index of an ingredient dictionary, it is built once per dictionary and tables version.
+    Keys added to the dictionary since are indexed incrementally, the index is rebuilt if the dictionary has shrunk
+    or `invalidate_caches` was called, e.g. by `register_density` and `use_database`.
+    Args:
+        ingredient_dict: Dictionary of ingredient densities.
+    Returns:
+        The IngredientIndex of the dictionary.
+    """
+    if isinstance(ingredient_dict, IngredientIndex):
+        # Already indexed, e.g. the ingredients of a compiled database
+        return ingredient_dict
+    version = Convert_Dict.version
+    index, indexed_version = _INDEXES.get(id(ingredient_dict), (None, None))
+    if index is None or index.ingredient_dict is not ingredient_dict or indexed_version != version:
+        index = None
+    elif index.size < len(ingredient_dict):
+        # New keys are appended to the dictionary, only index them
+        for key in islice(ingredient_dict, index.size, None):
+            index.add(key)
+    if index is None or index.size != len(ingredient_dict):
+        if len(_INDEXES) >= _MAX_INDEXES:
+            _INDEXES.clear()
+        index = IngredientIndex(ingredient_dict)
+        _INDEXES[id(ingredient_dict)] = index, version
+    return index
+
+
+def index_new_key(ingredient_dict: Dict[str, float], key: str):
+    """Index a key just added to an ingredient dictionary, if its index is loaded and up to date.
+    Otherwise the index is built or refreshed on its next lookup.
+    Args:
+        ingredient_dict: Dictionary of ingredient densities.
+        key: The new key, the last one of the dictionary.
+    """
+    index, version = _INDEXES.get(id(ingredient_dict), (None, None))
+    if index is not None and index.ingredient_dict is ingredient_dict and version == Convert_Dict.version \
+            and index.size == len(ingredient_dict) - 1:
+        index.add(key)
@@ -0,0 +1,209 @@
+"""Numeric literal engine"""
+# -*- coding: utf-8 -*-
+import re
+from fractions import Fraction
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional, Tuple, Union
+
+Number = Union[int, float, Fraction]
+
+NUMBER_WORDS = MappingProxyType({
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9,
+    "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
+    "seventeen": 17, "eighteen": 18, "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90, "hundred": 100, "thousand": 1000, "million": 1000000,
+    "billion": 1000000000,
+    "and": 0,
+})
+SCALE_WORDS = frozenset(("hundred", "thousand", "million", "billion"))
+# Unicode vulgar fractions, "1¼" is read as the mixed number "1 1/4"
+VULGAR_FRACTIONS = MappingProxyType({
+    "½": "1/2", "⅓": "1/3", "⅔": "2/3", "¼": "1/4", "¾": "3/4", "⅕": "1/5", "⅖": "2/5", "⅗": "3/5", "⅘": "4/5",
+    "⅙": "1/6", "⅚": "5/6", "⅐": "1/7", "⅛": "1/8", "⅜": "3/8", "⅝": "5/8", "⅞": "7/8", "⅑": "1/9", "⅒": "1/10",
+})
+_DIGITS = re.compile(r"\d+")
+_ZERO_DENOMINATOR = re.compile(r"/0+(?!\d)")
+
+
+class Lexicon:
+    """
+    Immutable number grammar of a language: number words, decimal separator and range words.
+    The patterns are compiled once when the lexicon is created, parsing never raises on invalid input.
+    `quantity_pattern` and `range_pattern` are the regular expressions of one quantity and of the words
+    between the ends of a range, to build other grammars on.
+
+    Examples:
+        >>> ENGLISH.parse("1¼")
+        # Output: 1.25
+        >>> Lexicon(decimal_separator=",").parse_range("1,5-2")
+        # Output: (1.5, 2)
+    """
+    __slots__ = (
+        "words", "scales", "decimal_separator", "conjunctions", "range_words", "quantity_pattern", "range_pattern",
+        "_translation", "_token", "_quantity", "_range",
+    )
+
+    def __init__(
+        self,
+        words: Mapping[str, int] = NUMBER_WORDS,
+        scales: Iterable[str] = SCALE_WORDS,
+        decimal_separator: str = ".",
+        range_words: Iterable[str] = ("to", "or"),
+        conjunctions: Iterable[str] = ("and",),
+    ):
+        """
+        Initialization
+        Args:
+            words: Number words and their values
+            scales: Words multiplying the number before them, e.g. "hundred"
+            decimal_separator: "." or ",", e.g. "1,5" in German
+            range_words: Words joining the two ends of a range, besides dashes, e.g. "to"
+            conjunctions: Words joining number words, they are not a number on their own, e.g. "and"
+        """
+        if decimal_separator not in (".", ","):
+            raise ValueError(f"The decimal separator should be '.' or ',', got {decimal_separator!r}")
+        setattr_ = object.__setattr__
+        setattr_(self, "words", MappingProxyType({word.lower(): value for word, value in words.items()}))
+        setattr_(self, "scales", frozenset(scale.lower() for scale in scales))
+        setattr_(self, "decimal_separator", decimal_separator)
+        setattr_(self, "conjunctions", frozenset(word.lower() for word in conjunctions))
+        setattr_(self, "range_words", tuple(range_words))
+
+        translation = {ord(char): f" {fraction}" for char, fraction in VULGAR_FRACTIONS.items()}
+        translation[ord("⁄")] = "/"  # fraction slash
+        setattr_(self, "_translation", translation)
+        separator = re.escape(decimal_separator)
+        # Longest words first, so "sixteen" is not read as "six"
+        words_pattern = "|".join(map(re.escape, sorted({*self.words, *self.conjunctions}, key=len, reverse=True)))
+        token = rf"\d+/\d+|\d+(?:{separator}\d*)?|{separator}\d+" + (rf"|(?:{words_pattern})\b" if words_pattern else "")
+        setattr_(self, "_token", re.compile(token))
+        # Tokens are joined by spaces, a dash before a word (e.g. "twenty-five") or before a fraction (e.g. "1-1/2")
+        quantity = rf"(?:{token})(?:(?:\s+|\s*-(?=\d+/\d+|[^\W\d_]))(?:{token}))*"
+        setattr_(self, "quantity_pattern", quantity)
+        # Range words are whole words, unless they are symbols, e.g. "〜"
+        range_pattern = "|".join(["-", "–", "—", *(
+            rf"\b{re.escape(word)}\b" if word[0].isalnum() else re.escape(word) for word in self.range_words
+        )])
+        setattr_(self, "range_pattern", range_pattern)
+        setattr_(self, "_quantity", re.compile(rf"\s*({quantity})\s*"))
+        setattr_(self, "_range", re.compile(rf"\s*({quantity})\s*(?:{range_pattern})\s*({quantity})\s*"))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Lexicon is immutable")
+
+    def __repr__(self) -> str:
+        return f"Lexicon(decimal_separator={self.decimal_separator!r}, words={len(self.words)})"
+
+    def normalize(self, text: str) -> str:
+        """
+        Lower a text and write its unicode fractions as ASCII fractions, e.g. "1½ Cups" -> "1 1/2 cups".
+        """
+        return (text if text.isascii() else text.translate(self._translation)).lower()
+
+    def evaluate(self, quantity: str, is_exact: bool = False) -> Optional[Number]:
+        """
+        Value of a quantity matched by the grammar, None if it is not a valid number.
+        The types follow Python literals: int for integers and number words, float (or Fraction if exact) otherwise.
+        """
+        # Tokens are split by spaces, or by dashes in words like "twenty-five"
+        tokens = self._token.findall(quantity) if "-" in quantity else quantity.split()
+        if not tokens:
+            return None
+        if not any(token[0].isalpha() for token in tokens):
+            # Numbers, fractions and mixed numbers
+            if len(tokens) == 1 and "/" not in tokens[0]:
+                token = tokens[0]
+                if _DIGITS.fullmatch(token):
+                    return int(token)
+                if self.decimal_separator != ".":
+                    token = token.replace(self.decimal_separator, ".")
+                return Fraction(token) if is_exact else float(token)
+            if "/0" in quantity and _ZERO_DENOMINATOR.search(quantity):
+                return None
+            if self.decimal_separator != ".":
+                tokens = [token.replace(self.decimal_separator, ".") for token in tokens]
+            total = sum(Fraction(token) for token in tokens)
+            return total if is_exact else float(total)
+
+        # Number words, possibly mixed with integers, e.g. "one hundred and 2"
+        value = 0
+        temp_value = 0
+        for token in tokens:
+            if token in self.conjunctions:
+                continue
+            if token in self.words:
+                if token in self.scales:
+                    value += temp_value * self.words[token]
+                    temp_value = 0
+                else:
+                    temp_value += self.words[token]
+            elif _DIGITS.fullmatch(token):
+                temp_value += int(token)
+            else:
+                return None
+        if all(token in self.conjunctions for token in tokens):
+            return None
+        return value + temp_value
+
+    def parse(self, text: str, is_exact: bool = False) -> Optional[Number]:
+        """
+        Parse a number written with digits, decimals, fractions, unicode fractions, mixed numbers or words.
+        Args:
+            text: The text to parse, e.g. "1 1/2", "1½", "twenty-five"
+            is_exact: Return decimals and fractions as exact Fractions instead of floats
+        Returns:
+            The number, None if the text is not a single number (ranges included)
+        """
+        if not isinstance(text, str):
+            return None
+        text = self.normalize(text)
+        match = self._quantity.fullmatch(text)
+        return self.evaluate(match.group(1), is_exact) if match else None
+
+    def parse_range(self, text: str, is_exact: bool = False) -> Optional[Tuple[Number, Optional[Number]]]:
+        """
+        Parse a number or a range of two numbers joined by a dash or a range word, e.g. "2-3" or "2 to 3".
+        Returns:
+            (low, high), high is None for a single number; None if the text is neither
+        """
+        if not isinstance(text, str):
+            return None
+        text = self.normalize(text)
+        match = self._quantity.fullmatch(text)
+        if match:
+            low = self.evaluate(match.group(1), is_exact)
+            return None if low is None else (low, None)
+        match = self._range.fullmatch(text)
+        if not match:
+            return None
+        low, high = self.evaluate(match.group(1), is_exact), self.evaluate(match.group(2), is_exact)
+        return None if low is None or high is None else (low, high)
+
+
+ENGLISH = Lexicon()
+
+
+def parse_number(text: str, lexicon: Lexicon = ENGLISH, is_exact: bool = False) -> Optional[Number]:
+    """
+    Parse a number, see `Lexicon.parse`.
+    Examples:
+        >>> parse_number("1¼")
+        # Output: 1.25
+        >>> parse_number("twenty-five")
+        # Output: 25
+        >>> parse_number("1,5", Lexicon(decimal_separator=","))
+        # Output: 1.5
+    """
+    return lexicon.parse(text, is_exact)
+
+
+def parse_range(text: str, lexicon: Lexicon = ENGLISH, is_exact: bool = False) -> Optional[Tuple[Number, Optional[Number]]]:
+    """
+    Parse a number or a range, see `Lexicon.parse_range`.
+    Examples:
+        >>> parse_range("2-3")
+        # Output: (2, 3)
+        >>> parse_range("½ to ¾")
+        # Output: (0.5, 0.75)
+    """
+    return lexicon.parse_range(text, is_exact)
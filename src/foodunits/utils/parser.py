@@ -0,0 +1,137 @@
+"""Single-pass quantity and unit parser"""
+# -*- coding: utf-8 -*-
+import re
+from fractions import Fraction
+from typing import Iterable, List, NamedTuple, Optional, Union
+# NUMBER_WORDS and SCALE_WORDS are defined with the numeric literal engine, and kept importable from here
+from foodunits.utils.numbers import ENGLISH, NUMBER_WORDS, SCALE_WORDS, Lexicon
+
+# Same cleaning as `preprocess` in one substitution: punctuation except next to digits,
+# and spaces inside float like digits, e.g. "1. 5" -> "1.5"
+_CLEAN = re.compile(r'(?<!\d)[^\w\s](?!\d)|(?<=\d[.,:%])\s(?=\d)')
+_NON_UNIT_CHARS = re.compile(r'[^\w\s]+|_+')
+
+# A string starting with a number, the number is invalid if the grammar does not match it
+_LEADING_NUMBER = re.compile(r"-?\.?\d")
+
+
+class ParsedQuantity(NamedTuple):
+    """
+    Result of parsing a quantity + unit string.
+    Attributes:
+        quantity: The numeric quantity, None if there is no quantity or it is not a valid number
+        unit: The unit, None if there is no unit
+        valid: False if the string starts with a quantity which is not a valid number, e.g. "one 1/2 cup" or "1,5 l",
+            or with a range whose upper bound is below its lower bound
+        quantity_max: The upper bound of a range, e.g. 2 for "1-2 cups", otherwise None
+    """
+    quantity: Optional[Union[int, float, Fraction]]
+    unit: Optional[str]
+    valid: bool = True
+    quantity_max: Optional[Union[int, float, Fraction]] = None
+
+
+def _compile_grammar(lexicon: Lexicon) -> "re.Pattern":
+    """Internal: Compile the quantity + unit pattern of a number grammar.
+    The quantity is a number, a negative number (e.g. "-1 cup") or a range (e.g. "1-2 cups", "1 to 2 cups"),
+    it ends before a space, a letter or the end, so "1,5" is not an English quantity.
+    Args:
+        lexicon: The number grammar.
+    Returns:
+        The pattern, to read with `_parse_match`.
+    """
+    quantity = lexicon.quantity_pattern
+    return re.compile(
+        rf"(?:(?P<sign>-)?(?P<quantity>{quantity})"
+        rf"(?:\s*(?:{lexicon.range_pattern})\s*(?P<quantity_max>{quantity}))?(?=\s|[^\W\d_]|$))?"
+        rf"\s*(?P<unit>.*)"
+    )
+
+
+def _parse_match(match: "re.Match", lexicon: Lexicon, is_exact: bool = False) -> ParsedQuantity:
+    """Internal: Evaluate a match of a pattern compiled by `_compile_grammar`.
+    Args:
+        match: The match of the cleaned string.
+        lexicon: The number grammar of the pattern.
+        is_exact: Return decimals, fractions and mixed numbers as exact Fractions instead of floats.
+    Returns:
+        ParsedQuantity: The quantity and unit.
+    """
+    quantity, unit = match.group("quantity"), match.group("unit") or None
+    if not quantity:
+        if _LEADING_NUMBER.match(match.string):
+            return ParsedQuantity(None, None, False)
+        return ParsedQuantity(None, unit)
+    number = lexicon.evaluate(quantity, is_exact)
+    if number is None:
+        return ParsedQuantity(None, unit, False)
+    if not match.group("quantity_max"):
+        return ParsedQuantity(-number if match.group("sign") else number, unit)
+    high = lexicon.evaluate(match.group("quantity_max"), is_exact)
+    if high is None or high < number or match.group("sign"):
+        return ParsedQuantity(None, unit, False)
+    return ParsedQuantity(number, unit, True, high)
+
+
+_QUANTITY_UNIT = _compile_grammar(ENGLISH)
+
+
+def clean(value: str) -> str:
+    """Preprocess a string, equivalent to `preprocess` with precompiled patterns.
+    Args:
+        value: The string to preprocess.
+    Returns:
+        The preprocessed string.
+    """
+    return " ".join(_CLEAN.sub("", value).split()).lower()
+
+
+def normalize_unit(unit: str) -> str:
+    """Keep only letters, digits and one space in a unit string.
+    Args:
+        unit: The unit string, e.g. " fl.  oz. "
+    Returns:
+        The normalized unit, e.g. "fl oz"
+    """
+    return " ".join(_NON_UNIT_CHARS.sub("", unit).split())
+
+
+def parse_quantity_unit(value: str, is_exact: bool = False) -> ParsedQuantity:
+    """Parse a quantity + unit string in a single pass.
+    The quantity can be a number, a float, a fraction, a unicode fraction, a mixed number or number words,
+    negative, or a range of two of them.
+    Args:
+        value: The string to parse.
+        is_exact: Return decimals, fractions and mixed numbers as exact Fractions instead of floats.
+    Returns:
+        ParsedQuantity: The quantity and unit.
+    Examples:
+        >>> parse_quantity_unit("2 1/2 Cups.")
+        # Output: ParsedQuantity(quantity=2.5, unit='cups', valid=True)
+        >>> parse_quantity_unit("one hundred and 2 fl ozs")
+        # Output: ParsedQuantity(quantity=102, unit='fl ozs', valid=True)
+        >>> parse_quantity_unit("5mls")
+        # Output: ParsedQuantity(quantity=5, unit='mls', valid=True)
+        >>> parse_quantity_unit("1-2 cups")
+        # Output: ParsedQuantity(quantity=1, unit='cups', valid=True, quantity_max=2)
+    """
+    if not value.isascii():
+        value = ENGLISH.normalize(value)
+    return _parse_match(_QUANTITY_UNIT.match(clean(value)), ENGLISH, is_exact)
+
+
+def parse_quantity_units(values: Iterable[str]) -> List[ParsedQuantity]:
+    """Parse many quantity + unit strings, repeated strings are only parsed once.
+    Args:
+        values: The strings to parse.
+    Returns:
+        The list of ParsedQuantity, in the order of the input.
+    """
+    parsed = {}
+    results = []
+    for value in values:
+        result = parsed.get(value)
+        if result is None:
+            result = parsed[value] = parse_quantity_unit(value)
+        results.append(result)
+    return results
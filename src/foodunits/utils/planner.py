@@ -0,0 +1,235 @@
+"""Compiled conversion plans"""
+# -*- coding: utf-8 -*-
+from decimal import Decimal
+from fractions import Fraction
+from collections import deque
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, Mapping, NamedTuple, Optional, Tuple
+from foodunits.utils.registry import REGISTRY, CONTAINER_UNITS, UnitRecord
+from foodunits.utils.units import Convert_Dict, L_TO_FL_OZ, FL_OZ_TO_L, G_TO_LB, LB_TO_G, G_PER_L_DENSITY
+from foodunits.exceptions import ConversionFailure
+
+# Density steps of a plan
+NO_DENSITY = 0
+VOLUME_TO_MASS = 1
+MASS_TO_VOLUME = -1
+
+
+class ConversionPlan(NamedTuple):
+    """
+    Compiled conversion between two units.
+    Attributes:
+        factor: Scalar factor from the source unit to the target unit, a float or an exact Fraction
+        density_step: NO_DENSITY, VOLUME_TO_MASS (multiply by the density) or MASS_TO_VOLUME (divide by the density)
+    """
+    factor: float
+    density_step: int = NO_DENSITY
+
+    def apply(self, value, density: float = None):
+        """
+        Convert a value with the plan.
+        Args:
+            value: Value in the source unit
+            density: Ingredient density in g/ml, required for conversions between mass and volume
+        Returns:
+            The value in the target unit
+        """
+        if self.density_step == NO_DENSITY:
+            return value * self.factor
+        if not density:
+            raise ConversionFailure("Converstion between volume and mass requires the ingredient density.")
+        if self.density_step == VOLUME_TO_MASS:
+            return value * self.factor * density
+        return value * self.factor / density
+
+
+# Sizes of the container units registered at runtime, by unit then country
+_REGISTERED_CONTAINER_SIZES = {}
+
+
+def container_sizes(unit: str) -> dict:
+    """
+    Load the size in liter of a physical container unit per country.
+    Args:
+        unit: "cup", "teaspoon", "tablespoon" or a registered container unit
+    Returns:
+        Dict: Country or region to size in liter
+    """
+    if unit in CONTAINER_UNITS:
+        return getattr(Convert_Dict, f"{unit}_by_country_dict")()
+    if not REGISTRY.is_container(unit):
+        raise KeyError(unit)
+    return _REGISTERED_CONTAINER_SIZES.setdefault(REGISTRY.get(unit).name, {})
+
+
+def _container_size(record: UnitRecord, country: str) -> float:
+    """Internal: Size in liter of a container unit for the given country."""
+    sizes = container_sizes(record.name)
+    size = sizes.get(country, None)
+    # No country is found
+    if not size:
+        raise ConversionFailure(
+            f"""
+            The converted units involve physical containers, such as cup, teaspoon, or tablespoon, which depend on the country.
+            Provide the accepted value from the followings(or corresponding full name) for the "country" argument:
+                {sizes.keys()}
+            """
+        )
+    return size
+
+
+def exact(value) -> Fraction:
+    """
+    Exact rational of a number as it is written, e.g. 0.1 -> 1/10 rather than the binary float value.
+    Args:
+        value: int, float, Decimal or Fraction
+    Returns:
+        Fraction: The rational number
+    """
+    if isinstance(value, (int, Fraction, Decimal)):
+        return Fraction(value)
+    return Fraction(repr(value))
+
+
+def _to_metric_base(record: UnitRecord, country: str, number: Callable = float):
+    """Internal: Factor from a unit to the metric base unit of its category (g or l)."""
+    if record.system == "metric":
+        return number(record.factor)
+    if record.system == "container":
+        return number(_container_size(record, country))
+    if record.category == "volume":
+        return number(record.factor) * number(FL_OZ_TO_L)
+    return number(record.factor) * number(LB_TO_G)
+
+
+def _from_metric_base(record: UnitRecord, country: str, number: Callable = float):
+    """Internal: Factor from the metric base unit of a category (g or l) to a unit."""
+    if record.system == "metric":
+        return number(1) / number(record.factor)
+    if record.system == "container":
+        return number(1) / number(_container_size(record, country))
+    if record.category == "volume":
+        return number(L_TO_FL_OZ) / number(record.factor)
+    return number(G_TO_LB) / number(record.factor)
+
+
+def _volume_edges(country: str, number: Callable) -> Dict[str, Dict[str, float]]:
+    """
+    Internal: Edges of the volume graph, every unit is linked to the base of its system (l or fl oz),
+    the containers available for the country to l, and fl oz to l.
+    """
+    edges = {"l": {"fl oz": number(L_TO_FL_OZ)}, "fl oz": {"l": number(FL_OZ_TO_L)}}
+    for record in REGISTRY.records:
+        if record.category != "volume" or not record.system:
+            continue
+        if record.system == "container":
+            size = container_sizes(record.name).get(country) if country else None
+            if not size:
+                continue
+            base, factor = "l", number(size)
+        else:
+            base = "l" if record.system == "metric" else "fl oz"
+            factor = number(record.factor)
+        if record.si != base:
+            edges.setdefault(record.si, {})[base] = factor
+            edges[base][record.si] = number(1) / factor
+    return edges
+
+
+@lru_cache(maxsize=256)
+def volume_graph(country: str = None, is_exact: bool = False) -> Mapping[str, Mapping[str, float]]:
+    """
+    Load the factors between every pair of volume units for a country, computed once along the shortest paths
+    of the volume graph: metric, imperial and the container units available for the country.
+    Args:
+        country: Country code or region, containers are left out if it is None
+        is_exact: Compute the factors as exact Fractions, see `exact`
+    Returns:
+        Mapping: {from_unit: {to_unit: factor}} of unit symbols
+    """
+    edges = _volume_edges(country, exact if is_exact else float)
+    factors = {}
+    for source in edges:
+        # Breadth-first search, the factor of a unit is the product along its shortest path from the source
+        reached = {source: 1 if is_exact else 1.0}
+        queue = deque((source,))
+        while queue:
+            unit = queue.popleft()
+            for neighbor, factor in edges[unit].items():
+                if neighbor not in reached:
+                    reached[neighbor] = reached[unit] * factor
+                    queue.append(neighbor)
+        factors[source] = MappingProxyType(reached)
+    return MappingProxyType(factors)
+
+
+def _compile(from_record: UnitRecord, to_record: UnitRecord, country: str, number: Callable = float) -> ConversionPlan:
+    """Internal: Compile the plan between two convertible units, the factors are computed with `number`."""
+    if from_record.category == to_record.category and "container" in (from_record.system, to_record.system):
+        # Raise the missing country failure of the containers unavailable for the country
+        for record in (from_record, to_record):
+            if record.system == "container":
+                _container_size(record, country)
+        return ConversionPlan(volume_graph(country, number is exact)[from_record.si][to_record.si])
+    if from_record.category == to_record.category and from_record.system == to_record.system:
+        # Same system, e.g. gal to qt, no bridge needed
+        return ConversionPlan(number(from_record.factor) / number(to_record.factor))
+
+    factor = _to_metric_base(from_record, country, number)
+    density_step = NO_DENSITY
+    if from_record.category == "volume" and to_record.category == "weight":
+        factor *= number(G_PER_L_DENSITY)
+        density_step = VOLUME_TO_MASS
+    elif from_record.category == "weight" and to_record.category == "volume":
+        factor /= number(G_PER_L_DENSITY)
+        density_step = MASS_TO_VOLUME
+    return ConversionPlan(factor * _from_metric_base(to_record, country, number), density_step)
+
+
+@lru_cache(maxsize=4096)
+def _cached_plan(from_unit: str, to_unit: str, country: str, is_exact: bool = False) -> Optional[ConversionPlan]:
+    """Internal: Cached plan lookup, country is None unless a container unit is involved."""
+    from_record, to_record = REGISTRY.get(from_unit), REGISTRY.get(to_unit)
+    if not from_record or not to_record or not from_record.system or not to_record.system:
+        return None
+    return _compile(from_record, to_record, country, exact if is_exact else float)
+
+
+def get_plan(from_unit: str, to_unit: str, country: str = None, is_exact: bool = False) -> Optional[ConversionPlan]:
+    """
+    Load the compiled plan between two units, plans are compiled once and cached.
+    Args:
+        from_unit: The source unit to convert from
+        to_unit: The target unit to convert to
+        country: Country code or region, only used by cup, teaspoon and tablespoon, e.g. cup to teaspoon
+        is_exact: Compile the factor as an exact Fraction of the tables, see `exact`, instead of a float
+    Returns:
+        ConversionPlan: The plan or None if the units can not be converted
+    Raises:
+        ConversionFailure: If a container unit is not available for the country
+    """
+    if not REGISTRY.is_container(from_unit) and not REGISTRY.is_container(to_unit):
+        country = None
+    return _cached_plan(from_unit, to_unit, country, is_exact)
+
+
+def supported_pairs(country: str = None) -> Iterator[Tuple[str, str]]:
+    """
+    List every pair of units which can be converted.
+    Args:
+        country: Country code or region; pairs involving cup, teaspoon or tablespoon are only listed
+            if they are available for the country
+    Returns:
+        Iterator of (from_unit, to_unit) symbols
+    """
+    symbols = list(dict.fromkeys(record.si for record in REGISTRY.records if record.system))
+    for from_unit in symbols:
+        for to_unit in symbols:
+            if from_unit == to_unit:
+                continue
+            try:
+                if get_plan(from_unit, to_unit, country):
+                    yield from_unit, to_unit
+            except ConversionFailure:
+                continue
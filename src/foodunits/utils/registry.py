@@ -0,0 +1,211 @@
+"""Precompiled unit lookup index"""
+# -*- coding: utf-8 -*-
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Optional
+from foodunits.utils.units import UNITS, Convert_Dict
+
+# Units whose size depends on the country, they are referred by full name
+CONTAINER_UNITS = ("cup", "teaspoon", "tablespoon")
+
+
+class UnitRecord(NamedTuple):
+    """Compact description of one unit.
+    Attributes:
+        name: Full name of the unit, e.g. "milliliter"
+        si: Canonical symbol used by the convertor, e.g. "ml" (full name for containers and units without symbol)
+        category: Name of the category in the UNITS array, e.g. "volume"
+        system: "metric", "imperial", "container" or None if the unit is not convertible
+        factor: Size relative to the base unit of its system (g or l for metric, lb or fl oz for imperial),
+            None for containers and non-convertible units
+    """
+    name: str
+    si: str
+    category: str
+    system: Optional[str]
+    factor: Optional[float]
+
+
+def _unit_system(category: str, name: str, si: str):
+    """Internal: Work out the measurement system and base factor of a unit."""
+    if category == "volume":
+        imperial_dict, metric_base = Convert_Dict.imperial_vol_dict(), "l"
+    elif category == "weight":
+        imperial_dict, metric_base = Convert_Dict.imperial_mass_dict(), "g"
+    else:
+        return None, None
+
+    if name in CONTAINER_UNITS:
+        return "container", None
+    if si in imperial_dict:
+        return "imperial", imperial_dict[si]
+    metric_dict = Convert_Dict.metric_dict()
+    if si and si.endswith(metric_base):
+        prefix = si[:-len(metric_base)] or None
+        if prefix in metric_dict:
+            return "metric", metric_dict[prefix]
+    return None, None
+
+
+def pluralize(spelling: str) -> str:
+    """Plural of a unit spelling, only the last word is changed (e.g. "fl oz" -> "fl ozs")."""
+    if spelling.endswith(("ss", "x", "ch", "sh")):
+        return spelling + "es"
+    return spelling + "s"
+
+
+def _spellings(spelling: str):
+    """Internal: All accepted forms of one spelling: as is, lower case, without spaces and plural."""
+    lower = spelling.lower()
+    forms = [spelling, lower, pluralize(lower)]
+    if " " in lower:
+        forms += [lower.replace(" ", ""), pluralize(lower).replace(" ", "")]
+    return forms
+
+
+class UnitRegistry:
+    """Index of units, built once from a UNITS array and extended with `add` and `add_alias`.
+    Every accepted spelling (name, symbol, plural and normalized forms) maps to a `UnitRecord`,
+    so resolving a unit is a single dictionary lookup.
+
+    Examples:
+        >>> registry = UnitRegistry(UNITS)
+        >>> registry.get("mls")
+        # Output: UnitRecord(name='milliliter', si='ml', category='volume', system='metric', factor=0.001)
+    """
+    __slots__ = ("_index", "_lookup", "_records")
+
+    def __init__(self, units: List[Dict] = None):
+        if units is None:
+            units = UNITS
+        self._index = {}
+        self._lookup = MappingProxyType(self._index)
+        self._records = []
+        for category in units:
+            for unit in category["units"]:
+                name, si = unit["name"], unit["si"]
+                system, factor = _unit_system(category["name"], name, si)
+                symbol = name if name in CONTAINER_UNITS or not si else si
+                self._insert(UnitRecord(name, symbol, category["name"], system, factor), (name, si, symbol))
+
+    def _insert(self, record: UnitRecord, spellings, plurals=()):
+        """Internal: Add a record and index it."""
+        self._records.append(record)
+        self._index_spellings(record, spellings, plurals)
+
+    def _index_spellings(self, record: UnitRecord, spellings, plurals=()):
+        """Internal: Index a record under all forms of its spellings, the first unit declaring a form wins."""
+        for spelling in spellings:
+            if spelling:
+                for form in _spellings(spelling):
+                    self._index.setdefault(form, record)
+        for plural in plurals:
+            for form in (plural.lower(), plural.lower().replace(" ", "")):
+                self._index.setdefault(form, record)
+
+    def _check_free(self, spellings, record: UnitRecord = None):
+        """Internal: Raise ValueError if a spelling already belongs to another unit."""
+        for spelling in spellings:
+            if not spelling or not isinstance(spelling, str):
+                continue
+            existing = self._index.get(spelling.lower())
+            if existing is not None and existing != record:
+                raise ValueError(f"{spelling!r} is already a spelling of {existing.name!r}")
+
+    def add(
+        self,
+        name: str,
+        category: str,
+        si: str = None,
+        system: str = None,
+        factor: float = None,
+        aliases=(),
+        plurals=(),
+    ) -> UnitRecord:
+        """
+        Register a unit, only the spellings of the new unit are indexed.
+        Args:
+            name: Full name of the unit, e.g. "dessertspoon"
+            category: "volume", "weight" or any other category, e.g. "other"
+            si: Symbol of the unit, e.g. "dstspn"
+            system: "metric" (factor relative to l or g), "imperial" (factor relative to fl oz or lb),
+                "container" (size per country, see `register_container_size`), or None if the unit is not convertible
+            factor: Size of the unit in the base unit of its system
+            aliases: Other spellings of the unit
+            plurals: Irregular plural spellings, e.g. "sticks of butter"
+        Returns:
+            UnitRecord: The record of the unit
+        Raises:
+            ValueError: If the unit is invalid or one of its spellings belongs to another unit
+        """
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("The unit name should be a non-empty string")
+        if system not in ("metric", "imperial", "container", None):
+            raise ValueError(f"Unknown system {system!r}, expected 'metric', 'imperial', 'container' or None")
+        if system and category not in ("volume", "weight"):
+            raise ValueError("Only volume and weight units can be converted")
+        if system in ("metric", "imperial"):
+            if isinstance(factor, bool) or not isinstance(factor, (int, float)) or not factor > 0:
+                raise ValueError(f"The factor of a {system} unit should be a positive number")
+            factor = float(factor)
+        else:
+            factor = None
+        symbol = name if system == "container" or not si else si
+        self._check_free((name, si, *aliases, *plurals))
+        record = UnitRecord(name, symbol, category, system, factor)
+        self._insert(record, (name, si, *aliases), plurals)
+        return record
+
+    def add_alias(self, alias: str, unit: str, plurals=()) -> UnitRecord:
+        """
+        Register another spelling of a unit, e.g. "tbl" for "tablespoon".
+        Args:
+            alias: The new spelling
+            unit: Any accepted spelling of the unit
+            plurals: Irregular plural spellings of the alias
+        Returns:
+            UnitRecord: The record of the unit
+        Raises:
+            ValueError: If the unit is unknown or the alias belongs to another unit
+        """
+        record = self.get(unit)
+        if record is None:
+            raise ValueError(f"Unknown unit {unit!r}")
+        if not isinstance(alias, str) or not alias.strip():
+            raise ValueError("The alias should be a non-empty string")
+        self._check_free((alias, *plurals), record)
+        self._index_spellings(record, (alias,), plurals)
+        return record
+
+    def get(self, unit: str) -> Optional[UnitRecord]:
+        """
+        Load the record of a unit.
+        Args:
+            unit: Any accepted spelling of the unit
+        Returns:
+            UnitRecord: The record or None if none was found
+        """
+        return self._lookup.get(unit)
+
+    def is_container(self, unit: str) -> bool:
+        """Whether a unit is a physical container whose size depends on the country, e.g. cup."""
+        record = self._lookup.get(unit)
+        return record is not None and record.system == "container"
+
+    def __contains__(self, unit: str) -> bool:
+        return unit in self._lookup
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def spellings(self):
+        """All accepted spellings."""
+        return self._lookup.keys()
+
+    @property
+    def records(self):
+        """All unit records, in the order of the UNITS array then of registration."""
+        return tuple(self._records)
+
+
+REGISTRY = UnitRegistry(UNITS)
@@ -0,0 +1,85 @@
+"""Unit singularization"""
+# -*- coding: utf-8 -*-
+import re
+from functools import lru_cache
+from typing import Dict, List
+from foodunits.utils.units import UNITS
+from foodunits.utils.registry import pluralize
+from foodunits import instrumentation
+
+# Fallback rules for words missing from the table, checked in order
+_RULES = (
+    (re.compile(r"(?<=[^aeiou])ies$"), "y"),  # e.g. "berries" -> "berry"
+    (re.compile(r"(?<=ch|sh|ss|.x)es$"), ""),  # e.g. "pinches" -> "pinch"
+    (re.compile(r"(?<=[^su])s$"), ""),  # e.g. "cups" -> "cup", but not "glass" or "asparagus"
+)
+
+_pattern_singularize = None
+
+
+def _plural_table(units: List[Dict]) -> Dict[str, str]:
+    """Internal: Map the plural forms of every unit name and symbol to the singular form."""
+    table = {}
+    for category in units:
+        for unit in category["units"]:
+            for spelling in (unit["name"], unit["si"]):
+                if not spelling:
+                    continue
+                lower = spelling.lower()
+                for singular in (lower, lower.replace(" ", "")):
+                    table.setdefault(singular, singular)
+                    table.setdefault(pluralize(singular), singular)
+    return table
+
+
+_PLURALS = _plural_table(UNITS)
+
+
+def register_plural(singular: str, plural: str = None):
+    """Add a word to the plural table.
+    Args:
+        singular: The singular form, e.g. "dessertspoon".
+        plural: The plural form, defaults to the regular plural (e.g. "dessertspoons").
+    """
+    singular = singular.lower()
+    _PLURALS[singular] = singular
+    _PLURALS[(plural or pluralize(singular)).lower()] = singular
+    singularize.cache_clear()
+
+
+def _fallback(word: str) -> str:
+    """Internal: Singularize a word missing from the table, with Pattern if it is installed, otherwise with rules."""
+    global _pattern_singularize
+    if _pattern_singularize is None:
+        try:
+            from pattern.text.en import singularize as pattern_singularize
+        except ImportError:
+            pattern_singularize = False
+        _pattern_singularize = pattern_singularize
+    if _pattern_singularize:
+        return _pattern_singularize(word)
+
+    head, _, last = word.rpartition(" ")
+    for pattern, replacement in _RULES:
+        if pattern.search(last):
+            last = pattern.sub(replacement, last)
+            break
+    return f"{head} {last}" if head else last
+
+
+@lru_cache(maxsize=4096)
+def singularize(word: str) -> str:
+    """Singularize a unit.
+    Units and their symbols are served from a plural table generated from UNITS, other words
+    are singularized with Pattern if it is installed (`pip install foodunits[pattern]`), otherwise with simple rules.
+    Args:
+        word: The unit, e.g. "fl ozs".
+    Returns:
+        The singular form, e.g. "fl oz".
+    """
+    singular = _PLURALS.get(word.lower())
+    if singular is not None:
+        return singular
+    if instrumentation.ENABLED:
+        instrumentation.count("singularize_fallback")
+    return _fallback(word)
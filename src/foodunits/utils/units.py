@@ -4,6 +4,8 @@ class Dictionary():
     """
     Convertion rate
     """
+    # Bumped by `invalidate_caches` whenever the tables change, indexes of the tables are keyed on it
+    version = 0
     # Metric and Imperial systems
     __metric_dict = {
         'E': 1000000000000000000,
@@ -64,6 +66,7 @@ class Dictionary():
         'other': 0.005,
         'us': 0.00492892,
         'imperial': 0.005919,
+        'jp': 0.005,
     } # to be expend
 
     # tablespoon to liter
@@ -75,6 +78,7 @@ class Dictionary():
         'uk': 0.015,
         'us': 0.0147868,
         'imperial': 0.0177582,
+        'jp': 0.015,
     } # to be expend
 
     # add custom conversion rate
@@ -199,8 +203,30 @@ class Dictionary():
     def ml_to_g_by_ingredient_dict(self):
         return self.__ml_to_g_by_ingredient_dict
 
+    def load_tables(self, **tables):
+        """
+        Serve tables from another source, e.g. a compiled database.
+        Args:
+            tables: Tables by accessor name, e.g. ml_to_g_by_ingredient_dict={...}, None restores the built-in table
+        """
+        for name, table in tables.items():
+            if not callable(getattr(self, name, None)) or name == "load_tables":
+                raise ValueError(f"Unknown table {name}")
+            if table is None:
+                self.__dict__.pop(f"_Dictionary__{name}", None)
+            else:
+                setattr(self, f"_Dictionary__{name}", table)
 
 
+
+# Bridges between the metric and imperial systems, rounded separately in each direction
+L_TO_FL_OZ = 33.814
+FL_OZ_TO_L = 0.0295735
+G_TO_LB = 0.00220462
+LB_TO_G = 453.592
+# Density is given in g/ml, 1 l of density 1 weights 1000 g
+G_PER_L_DENSITY = 1000
+
 # UNITS list, all the values should be lower case
 UNITS = [
     {
@@ -1,15 +1,15 @@
 """Utils."""
 import re
 import logging
-from typing import Callable, Any, Tuple, List
+from typing import Callable, Any, Dict, Tuple, List
 from inspect import getfullargspec
 from itertools import chain
-from functools import wraps
-import pycountry
-import fractions
-from pattern.text.en import singularize
-from fuzzywuzzy import fuzz
+from functools import wraps, lru_cache
+from foodunits.utils.singular import singularize
 from foodunits.exceptions import ConversionFailure, ValidationFailure
+from foodunits.utils.units import Convert_Dict, UNITS
+from foodunits.utils.numbers import parse_number
+from foodunits import instrumentation
 
 
 def _func_args_as_dict(func: Callable[..., Any], *args: Any, **kwargs: Any):
@@ -53,48 +53,18 @@ def validator(func: Callable[..., Any]):
 
 def validate_numeric_string(input_string: str) -> Tuple[bool, float]:
     """Validate a numeric string.
+    Integers, decimals, fractions, unicode fractions (e.g. "1¼"), mixed numbers and number words are accepted,
+    see `foodunits.utils.numbers`; no exception is raised for invalid strings.
     Args:
         input_string: The input string to validate.
     Returns:
-        A tuple containing a boolean indicating whether the input string is numeric and the converted float value.
+        A tuple containing a boolean indicating whether the input string is numeric and the converted value,
+        an int for integers and number words, otherwise a float; (False, 0) if it is not numeric.
     """
-    numeric_words = {
-        "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9,
-        "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
-        "seventeen": 17, "eighteen": 18, "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
-        "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90, "hundred": 100, "thousand": 1000, "million": 1000000,
-        "billion": 1000000000,
-        "and": 0,
-    }
-    try:
-        # Try converting the input string to an integer or float
-        return True, int(input_string)  # Try converting to integer
-    except ValueError:
-        try:
-            return True, float(input_string)  # Try converting to float
-        except ValueError:
-            try:
-                # Convert the fraction string to float using the fractions module
-                return True, float(sum(fractions.Fraction(s) for s in input_string.split()))
-            except ValueError:
-                # If conversion to integer fails, check if it is a valid numeric word
-                words = input_string.lower().replace('-', ' ').split()
-                value = 0
-                temp_value = 0
-                for word in words:
-                    if word not in numeric_words:
-                        try:
-                            temp_value += int(word)
-                        except ValueError:
-                            return False, 0
-                    else:
-                        if word in ["hundred", "thousand", "million", "billion"]:
-                            value += temp_value * numeric_words[word]
-                            temp_value = 0
-                        else:
-                            temp_value += numeric_words[word]
-                value += temp_value
-                return True, value
+    number = parse_number(input_string)
+    if number is None:
+        return False, 0
+    return True, number
 
 def split_quantity_unit(value: str) -> Tuple[str, str]:
     """Split a quantity + unit type string into quantity and unit.
@@ -153,13 +123,36 @@ def preprocess(input_string: str) -> str:
 def single(input_string):
     return singularize(re.sub(r"\s+", " ", re.sub(r'[^A-Za-z\s\d]+', '', input_string)).strip())
 
-def find_country(country: str):
-    """Find the country by name or code.
-    Args:
-        country: The country name or code.
-    Returns:
-        The country code if found, otherwise "not founded".
+# Aliases of countries whose container units are stored under another key
+_COUNTRY_KEY_ALIASES = {"gb": "uk", "gbr": "uk", "united kingdom": "uk"}
+
+@lru_cache(maxsize=None)
+def _country_aliases() -> Dict[str, str]:
+    """Build the country alias table once.
+    The table maps the region keys of the cup, teaspoon and tablespoon dictionaries ("metric", "us customary", ...),
+    and the alpha-2, alpha-3, names and common names of the countries to the lower case alpha-2 code.
     """
+    aliases = {}
+    for sizes in (
+        Convert_Dict.cup_by_country_dict(),
+        Convert_Dict.teaspoon_by_country_dict(),
+        Convert_Dict.tablespoon_by_country_dict(),
+    ):
+        aliases.update((key, key) for key in sizes)
+    aliases.update(_COUNTRY_KEY_ALIASES)
+    import pycountry  # deferred, loading the country database is slow
+    for country in pycountry.countries:
+        code = country.alpha_2.lower()
+        for attr in ("alpha_2", "alpha_3", "name", "common_name", "official_name"):
+            alias = getattr(country, attr, None)
+            if alias:
+                aliases.setdefault(alias.lower(), code)
+    return aliases
+
+@lru_cache(maxsize=1024)
+def _search_country(country: str):
+    """Search the country with pycountry, the results of the last 1024 searches are memoized."""
+    import pycountry  # deferred, loading the country database is slow
     try:
         return pycountry.countries.search_fuzzy(country)[0].alpha_2.lower()
     except Exception as exc:
@@ -171,6 +164,24 @@ def find_country(country: str):
         )
         return country
 
+def find_country(country: str):
+    """Find the country by name or code.
+    Known codes, names and regions are resolved with the alias table, others with a memoized fuzzy search.
+    Args:
+        country: The country name or code.
+    Returns:
+        The country code if found, otherwise the input country.
+    """
+    if country is None:
+        return None
+    if isinstance(country, str):
+        code = _country_aliases().get(country.strip().lower())
+        if code:
+            return code
+    if instrumentation.ENABLED:
+        instrumentation.count("country_fuzzy_search")
+    return _search_country(country)
+
 def find_ingredient(ingredient: str):
     """Find the ingredient by name or code.
     Args:
@@ -178,32 +189,54 @@ def find_ingredient(ingredient: str):
     Returns:
         The ingredient code if found, otherwise "not founded".
     """
+    import pycountry  # deferred, loading the country database is slow
     try:
         return pycountry.countries.search_fuzzy(ingredient)[0].alpha_2
     except Exception as exc:
         raise ConversionFailure(f"Ingredient {ingredient} is not found") from exc
 
+# Processed units per units list id: the list, the tables version and the processed set
+_PROCESSED_UNITS = {}
+_MAX_PROCESSED_UNITS = 32
+
+def _process_units(units: List) -> frozenset:
+    """Internal: Lower-cased and singularized spellings of the units of a units list."""
+    units_processed = set()
+    for category in units:
+        for unit in category["units"]:
+            for spelling in (unit["name"], unit["si"]):
+                if spelling:
+                    unit_lower = spelling.lower().replace(" ", "")
+                    units_processed.add(singularize(unit_lower))
+                    units_processed.add(unit_lower)
+    return frozenset(units_processed)
+
 def process_saved_units(units: List = None):
     """Process and extract saved units.
+    The result is computed once per units list and tables version, call `invalidate_caches` after changing
+    a custom list in place.
     Args:
-        units: The list of units to process.
+        units: The list of units to process (default: UNITS).
     Returns:
-        A set of processed units.
+        A frozen set of processed units.
     """
-    # Extract and process all the saved units
-    units_processed = set()
-    extracted_unit = [(unit['name'], unit['si']) for sub in units for unit in sub['units']]
-    extracted_unit = [item for sublist in extracted_unit for item in sublist]
-    for unit in extracted_unit:
-        if unit:
-            unit_lower = unit.lower().replace(" ", "")
-            units_processed.add(singularize(unit_lower))
-            units_processed.add(unit_lower)
+    if units is None:
+        units = UNITS
+    version = Convert_Dict.version
+    entry = _PROCESSED_UNITS.get(id(units))
+    if entry is not None and entry[0] is units and entry[1] == version:
+        return entry[2]
+    units_processed = _process_units(units)
+    if len(_PROCESSED_UNITS) >= _MAX_PROCESSED_UNITS:
+        _PROCESSED_UNITS.clear()
+    _PROCESSED_UNITS[id(units)] = units, version, units_processed
     return units_processed
 
 def get_ingredient_density(ingredient, ingredient_dict:dict=None, threshold:int=85):
     """
     Retrieves the density value for a given ingredient by performing token-based matching using fuzzywuzzy.
+    Exact and normalized names are found with a hash lookup; otherwise only a short list of candidates,
+    selected by an index of the dictionary built once, is scored.
 
     Args:
         ingredient (str): The ingredient to search for.
@@ -227,28 +260,21 @@ def get_ingredient_density(ingredient, ingredient_dict:dict=None, threshold:int=
     """
 
     if not ingredient_dict:
-        ingredient_dict = {}
-
-    best_match = None
-    best_score = 0
-
-    for key in ingredient_dict:
-        score = fuzz.token_sort_ratio(ingredient, key)
-        if score == 100:
-            best_match = key
-            best_score = score
-            break
-        if score > best_score:
-            best_score = score
-            best_match = key
-
-    if best_score <= threshold:
         return None
-    else:
-        logging.info(
-            f"""
-            Find key-value pair {best_match}-{ingredient_dict[best_match]} for input ingredient {ingredient}.
-            Double check the matching result.
-            """
-        )
-        return ingredient_dict[best_match]
+
+    # deferred, fuzzywuzzy is only needed for densities
+    from foodunits.utils.ingredients import ingredient_index
+    index = ingredient_index(ingredient_dict)
+    result = index.match(ingredient)
+    if not result or result[1] <= threshold:
+        return None
+    best_match = result[0]
+    density = ingredient_dict.get(best_match)
+    logging.info(
+        """
+        Find key-value pair %s-%s for input ingredient %s.
+        Double check the matching result.
+        """,
+        best_match, density, ingredient
+    )
+    return density
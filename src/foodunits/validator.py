@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 """foodunit validator"""
 import warnings
-from typing import List
-from pattern.text.en import singularize
-from foodunits.utils.units import UNITS
-from foodunits.utils.utils import validator, split_quantity_unit, validate_numeric_string, preprocess, process_saved_units
+from os import PathLike
+from typing import IO, Iterable, Iterator, List, NamedTuple, Optional, Union
+from foodunits.utils.singular import singularize
+from foodunits.utils.registry import REGISTRY
+from foodunits.utils.utils import validator, process_saved_units
+from foodunits.utils.parser import parse_quantity_unit
+from foodunits.exceptions import ErrorCode
 
 @validator
 def units_validator(
@@ -40,25 +43,103 @@ def units_validator(
         # Output: ValidationFailure(func=unit_validator, args={'value': 'mlls'})
 
     """
-    if not value:
-        return False
-
     if units is None:
-        units = UNITS
+        units_processed = REGISTRY
+    else:
+        units_processed = process_saved_units(units)
+    result = _validate(value, units_processed)
+    if result.quantity is not None and result.unit is not None:
+        # Display a warning
+        warnings.warn(f"This food unit {value} contains quantity")
+    return result.valid
+
+
+class ValidationResult(NamedTuple):
+    """
+    Result of validating one food unit string.
+    Attributes:
+        valid: True if the string is a valid food unit
+        quantity: The quantity found in the string, None if there is none
+        unit: The unit; its SI form when validating against the default units, otherwise the normalized spelling
+        reason: ErrorCode.OK, ErrorCode.INVALID_VALUE (empty string or invalid quantity) or ErrorCode.UNKNOWN_UNIT
+    """
+    valid: bool
+    quantity: Optional[Union[int, float]]
+    unit: Optional[str]
+    reason: ErrorCode
+
 
-    units_processed = process_saved_units(units)
-    cleaned_value = preprocess(value)
-    quantity, unit = split_quantity_unit(cleaned_value)
+_EMPTY = ValidationResult(False, None, None, ErrorCode.INVALID_VALUE)
+
+
+def _validate(value: str, units_processed) -> ValidationResult:
+    """
+    Internal: Validate a food unit string against processed units, without warnings.
+    """
+    if not value:
+        return _EMPTY
+    parsed = parse_quantity_unit(value)
+    if not parsed.valid:
+        return ValidationResult(False, None, parsed.unit, ErrorCode.INVALID_VALUE)
+    if not parsed.unit:
+        return ValidationResult(False, parsed.quantity, None, ErrorCode.UNKNOWN_UNIT)
     # Remove spaces and periods, and singularize the unit
-    unit = singularize(unit.replace(" ", "").replace(".", ""))
-
-    if quantity:
-        valid, _ = validate_numeric_string(quantity)
-        if valid:
-            # Display a warning
-            warnings.warn(f"This food unit {value} contains quantity")
-            return unit in units_processed
-        else:
-            return False
+    unit = singularize(parsed.unit.replace(" ", "").replace(".", ""))
+    if unit not in units_processed:
+        return ValidationResult(False, parsed.quantity, unit, ErrorCode.UNKNOWN_UNIT)
+    if units_processed is REGISTRY:
+        unit = REGISTRY.get(unit).si
+    return ValidationResult(True, parsed.quantity, unit, ErrorCode.OK)
+
+
+def _lines(source: Union[str, PathLike, IO, Iterable[str]]) -> Iterator[str]:
+    """
+    Internal: Iterate over the strings of a source, a path or file object is read line by line.
+    """
+    if isinstance(source, (str, PathLike)):
+        with open(source, encoding="utf-8") as file:
+            yield from _lines(file)
+    elif hasattr(source, "read"):
+        for line in source:
+            yield line.rstrip("\r\n")
     else:
-        return unit in units_processed
+        yield from source
+
+
+def units_validator_many(
+    values: Union[str, PathLike, IO, Iterable[str]],
+    units: List[str] = None,
+    cache_size: int = 4096,
+) -> Iterator[ValidationResult]:
+    """
+    Validate many food unit strings as a stream.
+    Unlike `units_validator`, no warning is displayed and no `ValidationFailure` is created.
+    Results of repeated strings are reused from a bounded cache, so memory stays flat for any input size.
+
+    Args:
+        values:
+            Iterable of food unit strings, or a path or file object read line by line.
+        units:
+            Legitimate food units.
+        cache_size:
+            Number of distinct strings whose results are kept.
+
+    Returns:
+        Iterator[ValidationResult]:
+            One result per string, in the order of the input.
+
+    Examples:
+        >>> list(units_validator_many(["5 mls", "mlls"]))
+        # Output: [ValidationResult(valid=True, quantity=5, unit='ml', reason=<ErrorCode.OK: 0>),
+        #          ValidationResult(valid=False, quantity=None, unit='mll', reason=<ErrorCode.UNKNOWN_UNIT: 2>)]
+    """
+    units_processed = REGISTRY if units is None else process_saved_units(units)
+    cache = {}
+    for value in _lines(values):
+        result = cache.get(value)
+        if result is None:
+            result = _validate(value, units_processed)
+            if len(cache) >= cache_size:
+                cache.clear()
+            cache[value] = result
+        yield result
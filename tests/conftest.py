@@ -0,0 +1,29 @@
+"""Shared test fixtures"""
+# -*- coding: utf-8 -*-
+import pytest
+from foodunits.cache import invalidate_caches
+from foodunits.utils import planner, singular
+from foodunits.utils.planner import container_sizes
+from foodunits.utils.registry import CONTAINER_UNITS, REGISTRY
+from foodunits.utils.units import Convert_Dict
+
+
+@pytest.fixture
+def restore_registry():
+    """Restore the registry, the container sizes, the densities and the plurals after a test."""
+    index, records = dict(REGISTRY._index), list(REGISTRY._records)
+    tables = [Convert_Dict.ml_to_g_by_ingredient_dict(), singular._PLURALS]
+    tables += [container_sizes(unit) for unit in CONTAINER_UNITS]
+    saved = [dict(table) for table in tables]
+    registered_sizes = {unit: dict(sizes) for unit, sizes in planner._REGISTERED_CONTAINER_SIZES.items()}
+    yield
+    REGISTRY._index.clear()
+    REGISTRY._index.update(index)
+    REGISTRY._records[:] = records
+    for table, content in zip(tables, saved):
+        table.clear()
+        table.update(content)
+    planner._REGISTERED_CONTAINER_SIZES.clear()
+    planner._REGISTERED_CONTAINER_SIZES.update(registered_sizes)
+    singular.singularize.cache_clear()
+    invalidate_caches()
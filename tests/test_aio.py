@@ -0,0 +1,98 @@
+"""Test asyncio food unit convertor"""
+# -*- coding: utf-8 -*-
+import asyncio
+import pytest
+from foodunits import units_convertor
+from foodunits.aio import AsyncConvertor, convert_async
+from foodunits.exceptions import ConversionFailure
+
+REQUESTS = [
+    (("1 fluid ounce", "ml"), {}),
+    ((2.5, "gram", "pounds"), {"decimal_places": 3}),
+    (("2.5 cups", "g"), {"ingredient": "skimmed milk", "country": "United States"}),
+    ((1, "ml", "ml"), {}),
+    (("2 mls", "milliliter"), {}),
+]
+
+
+def test_convert_async_matches_units_convertor():
+    async def main():
+        return await asyncio.gather(*(convert_async(*args, **kwargs) for args, kwargs in REQUESTS))
+
+    for (args, kwargs), response in zip(REQUESTS, asyncio.run(main())):
+        expected = units_convertor(*args, **kwargs)
+        assert response == expected
+        assert type(response["converted value"]) is type(expected["converted value"])
+
+
+def test_convert_async_failure():
+    async def main():
+        return await convert_async(2.5, "tsp", "foo", country="US")
+
+    with pytest.raises(ConversionFailure):
+        asyncio.run(main())
+
+
+def test_coalescing_and_batching():
+    async def main():
+        convertor = AsyncConvertor(batch_window=0.01)
+        responses = await asyncio.gather(
+            *(convertor.convert("1 ml", "fl oz") for _ in range(10)),
+            convertor.convert("2 ml", "fl oz"),
+            convertor.convert("missing value", "fl oz", "ml"),
+            return_exceptions=True,
+        )
+        await convertor.close()
+        return responses, convertor.metrics()
+
+    responses, metrics = asyncio.run(main())
+    assert responses[:10] == [{"converted value": 0, "unit": "fl oz"}] * 10
+    assert responses[10] == {"converted value": 0, "unit": "fl oz"}
+    assert isinstance(responses[11], ConversionFailure)
+    assert metrics["requests"] == 12
+    assert metrics["coalesced"] == 9
+    assert metrics["batches"] == 1
+    assert metrics["mean_batch_size"] == 3
+    assert metrics["queue_depth"] == metrics["in_flight"] == 0
+    assert 0 < metrics["latency_p50"] <= metrics["latency_p99"] <= metrics["latency_max"]
+
+
+def test_max_batch():
+    async def main():
+        convertor = AsyncConvertor(max_batch=2, batch_window=10)
+        await asyncio.gather(*(convertor.convert(i, "g", "kg") for i in range(4)))
+        await convertor.close()
+        return convertor.metrics()
+
+    assert asyncio.run(main())["batches"] == 2
+
+
+def test_unhashable_value_is_not_coalesced():
+    async def main():
+        convertor = AsyncConvertor()
+        responses = await asyncio.gather(
+            convertor.convert([1, 2], "ml", "l"), convertor.convert([1, 2], "ml", "l"), return_exceptions=True
+        )
+        await convertor.close()
+        return responses, convertor.metrics()
+
+    responses, metrics = asyncio.run(main())
+    assert all(isinstance(response, ConversionFailure) for response in responses)
+    assert metrics["coalesced"] == 0
+    assert metrics["in_flight"] == 0
+
+
+def test_cancelled_batch_cancels_requests():
+    async def main():
+        convertor = AsyncConvertor(max_batch=1)
+        request = asyncio.ensure_future(convertor.convert("1 ml", "fl oz"))
+        await asyncio.sleep(0)
+        for task in convertor._tasks:
+            task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        await convertor.close()
+        return convertor.metrics()
+
+    metrics = asyncio.run(main())
+    assert metrics["in_flight"] == 0
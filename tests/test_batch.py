@@ -0,0 +1,68 @@
+"""Test batch food unit convertor"""
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+from foodunits import units_convertor, units_convertor_batch
+from foodunits.exceptions import ErrorCode
+
+
+def test_batch_numeric_array():
+    result = units_convertor_batch(np.array([1, 2.5]), "g", "pounds", decimal_places=3)
+    assert result.values.tolist() == [453.592, 1133.98]
+    assert result.units.tolist() == ["g", "g"]
+    assert result.errors.tolist() == [ErrorCode.OK, ErrorCode.OK]
+
+
+def test_batch_matches_units_convertor():
+    values = ["1 ml", "1 fluid ounce", "2.5 cups", "2.5 lbs", 2.5]
+    to_units = ["fl oz", "ml", "g", "gram", "g"]
+    from_units = [None, None, None, None, "fl oz"]
+    result = units_convertor_batch(values, to_units, from_units, ingredients="skimmed milk", countries="US")
+    for i, value in enumerate(values):
+        expected = units_convertor(
+            value, to_units[i], from_units[i], ingredient="skimmed milk", country="US", decimal_places=3
+        )
+        assert result.values[i] == pytest.approx(expected["converted value"], abs=1e-3)
+        assert result.units[i] == expected["unit"]
+
+
+@pytest.mark.parametrize(
+    "value, to_unit, from_unit, ingredient, country, error",
+    [
+        ("missing value", "fl oz", "ml", None, "US", ErrorCode.INVALID_VALUE),
+        (2.5, "foo_to_unit", "foo_from_unit", None, "metric", ErrorCode.UNKNOWN_UNIT),
+        (2.5, "cm", "ml", None, "metric", ErrorCode.UNKNOWN_UNIT),
+        (2.5, "g", "ml", "foo_ingredient", "US", ErrorCode.MISSING_DENSITY),
+        (2.5, "ml", "cup", "water", None, ErrorCode.MISSING_COUNTRY),
+    ],
+)
+def test_batch_error_codes(value, to_unit, from_unit, ingredient, country, error):
+    result = units_convertor_batch([value, 1], [to_unit, "g"], [from_unit, "kg"], [ingredient, None], countries=country)
+    assert result.errors.tolist() == [error, ErrorCode.OK]
+    assert np.isnan(result.values[0])
+    assert result.units[0] is None
+    assert result.values[1] == 1000
+
+
+def test_batch_length_mismatch():
+    with pytest.raises(ValueError):
+        units_convertor_batch([1, 2], ["g"], "kg")
+
+
+def test_batch_container_to_container():
+    result = units_convertor_batch([2.5, 2.5], "tsp", "cup", countries=["US", "kr"], decimal_places=3)
+    assert result.values[0] == 121.731
+    assert result.errors.tolist() == [ErrorCode.OK, ErrorCode.MISSING_COUNTRY]
+
+
+def test_batch_nan_density_is_missing():
+    result = units_convertor_batch(["1 cup", "1 cup"], "g", ingredients=["water", "foo_ingredient"],
+                                   ingredient_densities=[np.nan, np.nan], countries="US")
+    assert result.values[0] == pytest.approx(240)
+    assert result.errors.tolist() == [ErrorCode.OK, ErrorCode.MISSING_DENSITY]
+
+
+def test_batch_decimal_places_default():
+    # Not rounded by default, while units_convertor rounds to the precision of the input
+    assert units_convertor_batch(["1 fluid ounce"], "ml").values[0] == pytest.approx(29.5735)
+    assert units_convertor("1 fluid ounce", "ml")["converted value"] == 30
@@ -0,0 +1,82 @@
+"""Test conversion result cache"""
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from foodunits import units_convertor
+from foodunits.cache import ResultCache, cached_units_convertor, invalidate_caches
+from foodunits.exceptions import ConversionFailure
+
+
+def test_cache_hits_match_units_convertor():
+    cache = ResultCache()
+    expected = units_convertor("2.5 cups", "g", ingredient="skimmed milk", country="United States")
+    for _ in range(3):
+        assert cache.convert("2.5 cups", "g", ingredient="skimmed milk", country="United States") == expected
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+    assert info.hit_rate == pytest.approx(2 / 3)
+
+
+def test_cache_key_normalizes_units():
+    cache = ResultCache()
+    cache.convert(1, "fl oz", "ml")
+    cache.convert(1, "fl.  ozs", "mls")
+    assert cache.cache_info().hits == 1
+    # 1 and 1.0 are rounded differently
+    assert cache.convert(1.0, "fl oz", "ml") == units_convertor(1.0, "fl oz", "ml")
+    assert cache.cache_info().currsize == 2
+
+
+def test_cache_returns_copies():
+    cache = ResultCache()
+    cache.convert(1, "g", "kg")["unit"] = "changed"
+    assert cache.convert(1, "g", "kg")["unit"] == "g"
+
+
+def test_cache_lru_eviction():
+    cache = ResultCache(maxsize=2)
+    cache.convert(1, "g", "kg")
+    cache.convert(2, "g", "kg")
+    cache.convert(1, "g", "kg")
+    cache.convert(3, "g", "kg")
+    assert cache.cache_info().currsize == 2
+    cache.convert(1, "g", "kg")
+    assert cache.cache_info().hits == 2
+
+
+def test_cache_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("foodunits.cache.time.monotonic", lambda: now[0])
+    cache = ResultCache(ttl=10)
+    cache.convert(1, "g", "kg")
+    now[0] += 5
+    cache.convert(1, "g", "kg")
+    now[0] += 10
+    cache.convert(1, "g", "kg")
+    assert cache.cache_info()[:2] == (1, 2)
+
+
+def test_cache_failures_not_cached():
+    cache = ResultCache()
+    for _ in range(2):
+        with pytest.raises(ConversionFailure):
+            cache.convert(1, "g", "cup")
+    assert cache.cache_info().currsize == 0
+
+
+def test_cache_thread_safe():
+    cache = ResultCache(maxsize=8)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda i: cache.convert(i % 16, "g", "kg"), range(1000)))
+    assert responses[17] == units_convertor(1, "g", "kg")
+    info = cache.cache_info()
+    assert info.hits + info.misses == 1000
+    assert info.currsize == 8
+
+
+def test_invalidate_caches():
+    cached_units_convertor.cache_clear()
+    cached_units_convertor(1, "g", "kg")
+    invalidate_caches()
+    cached_units_convertor(1, "g", "kg")
+    assert cached_units_convertor.cache_info()[:3] == (0, 2, 4096)
@@ -1,7 +1,10 @@
 """Test food unit convertor"""
 # -*- coding: utf-8 -*-
+from decimal import Decimal
+from fractions import Fraction
 import pytest
 from foodunits import units_convertor
+from foodunits.base import ConversionResult, FoodUnitConvertor
 from foodunits.exceptions import ConversionFailure
 
 def test_convert_same_unit():
@@ -72,6 +75,8 @@ def test_convert_mass_volume_units(value, to_unit, from_unit, ingredient, ingred
         (618, "cup", "g", "skimmed milk", None, "united states", 3, {"converted value": 2.5, "unit": "cup"}), # mass to cups
         ("2.5", "g", "tsps", "skimmed milk", None, "united states", 3, {"converted value": 12.692, "unit": "g"}), # teaspoon
         ("2.5", "g", "tbsps", "skimmed milk", None, "united states", 3, {"converted value": 38.076, "unit": "g"}), # tablespoon
+        (2.5, "tsp", "cup", None, None, "US", 3, {"converted value": 121.731, "unit": "teaspoon"}), # cup to teaspoon
+        ("3 tsps", "tbsp", None, None, None, "metric", 3, {"converted value": 1.0, "unit": "tablespoon"}), # teaspoon to tablespoon
     ],
 )
 def test_physical_container_units(value, to_unit, from_unit, ingredient, ingredient_density, country, decimal_places, expected_result):
@@ -91,8 +96,9 @@ def test_physical_container_units(value, to_unit, from_unit, ingredient, ingredi
         (2.5, "foo_to_unit", "foo_from_unit", None, None, "metric", 3,  ConversionFailure),
         (2.5, "g", "ml", "foo_ingredient", None, "US", 3,  ConversionFailure), # wrong ingredient
         (2.5, "g", "ml", None, None, "US", 3,  ConversionFailure), # missing ingredient
-        (2.5, "tsp", "cup", None, None, "US", 3,  ConversionFailure), # can not convert between cup, tsp, tbsp.
+        (2.5, "tsp", "cup", None, None, "kr", 3,  ConversionFailure), # no teaspoon for the country.
         (2.5, "ml", "cup", "water", None, None, 3,  ConversionFailure), # missing country.
+        ("1-2 cups", "ml", None, None, None, "US", 3,  ConversionFailure), # ranges are not converted.
     ],
 )
 def test_convert_failure(value, to_unit, from_unit, ingredient, ingredient_density, country, decimal_places, expected_result):
@@ -106,3 +112,72 @@ def test_convert_failure(value, to_unit, from_unit, ingredient, ingredient_densi
             country=country,
             decimal_places=decimal_places,
         )
+
+
+@pytest.mark.parametrize(
+    "value, to_unit, from_unit, mode, decimal_places, expected_result",
+    [
+        ("1 fluid ounce", "ml", None, "auto", None, 30),
+        ("1 fluid ounce", "ml", None, "fast", None, pytest.approx(29.5735)),
+        ("1 fluid ounce", "ml", None, "fast", 2, 29.57),
+        ("1 fluid ounce", "ml", None, "exact", None, Fraction("29.5735")),
+        ("1/3 cup", "ml", None, "exact", None, Fraction(80)),
+        (7, "lb", "gr", "exact", None, Fraction(7) * Fraction("0.00014285714")),
+        ("1 fluid ounce", "ml", None, "exact", 2, Fraction("29.57")),
+        ("1 fluid ounce", "ml", None, "decimal", None, Decimal("29.5735")),
+        ("1.50 kg", "kg", None, "decimal", None, Decimal("1.5")),
+    ],
+)
+def test_convert_modes(value, to_unit, from_unit, mode, decimal_places, expected_result):
+    result = units_convertor(value, to_unit, from_unit, country="US", decimal_places=decimal_places, mode=mode)
+    assert result["converted value"] == expected_result
+    if mode == "exact":
+        assert isinstance(result["converted value"], Fraction)
+    elif mode == "decimal":
+        assert isinstance(result["converted value"], Decimal)
+
+
+def test_convert_exact_density():
+    result = units_convertor("2.5 fl oz", "g", ingredient_density=1.03, mode="exact")
+    assert result["converted value"] == Fraction("2.5") * Fraction("0.0295735") * 1000 * Fraction("1.03")
+
+
+def test_convert_unknown_mode():
+    with pytest.raises(ValueError):
+        units_convertor(1, "ml", "l", mode="approximate")
+
+
+def test_convert_compact_result():
+    result = units_convertor("1 fluid ounce", "ml", mode="fast", as_dict=False)
+    assert isinstance(result, ConversionResult)
+    assert result == (pytest.approx(29.5735), "ml")
+    assert result.as_dict() == units_convertor("1 fluid ounce", "ml", mode="fast")
+    assert units_convertor(2, "ml", "ml", as_dict=False) == ConversionResult(2, "ml")
+
+
+def test_food_unit_convertor_is_stateless():
+    assert FoodUnitConvertor.apply(2, "lb", "g") == ConversionResult(pytest.approx(907.184), "g")
+    convertor = FoodUnitConvertor(2, "lb", "g", decimal_places=1)
+    assert not hasattr(convertor, "__dict__")
+    assert convertor.convert() == {"converted value": 907.2, "unit": "g"}
+
+
+def test_food_unit_convertor_deprecated_helpers():
+    with pytest.deprecated_call():
+        assert FoodUnitConvertor.volume_mass_conversion(0.25, 0.6) == pytest.approx(150)
+    with pytest.deprecated_call():
+        assert FoodUnitConvertor.volume_mass_conversion(150, 0.6, vol_to_mass=False) == pytest.approx(0.25)
+    with pytest.deprecated_call():
+        assert FoodUnitConvertor.metric_to_metric(2, 1, 1000) == 2000
+    with pytest.deprecated_call():
+        metric_dict = FoodUnitConvertor.metric_dict
+    assert metric_dict["k"] == 1000
+    with pytest.deprecated_call():
+        assert FoodUnitConvertor.physical_container_unit["cup"]["uk"] == 0.2841
+
+
+def test_food_unit_convertor_ignores_extra_arguments():
+    with pytest.deprecated_call(match="ingredient"):
+        convertor = FoodUnitConvertor(2, "lb", "g", ingredient="flour")
+    assert not hasattr(convertor, "ingredient")
+    assert convertor.convert() == {"converted value": pytest.approx(907.184), "unit": "g"}
@@ -0,0 +1,133 @@
+"""Test compiled conversion database"""
+# -*- coding: utf-8 -*-
+import json
+import pytest
+from foodunits import units_convertor
+from foodunits.database import Database, build_database, use_database, main
+from foodunits.registration import register_unit
+from foodunits.utils.registry import REGISTRY
+from foodunits.utils.ingredients import IngredientIndex
+from foodunits.utils.units import Convert_Dict
+from foodunits.utils.utils import get_ingredient_density
+from foodunits.exceptions import ConversionFailure
+
+
+@pytest.fixture
+def database(tmp_path):
+    with Database(build_database(tmp_path / "foods.fudb")) as database:
+        yield database
+
+
+@pytest.fixture
+def restore_tables(restore_registry):
+    yield
+    use_database(None)
+
+
+def test_database_tables(database):
+    ingredients = Convert_Dict.ml_to_g_by_ingredient_dict()
+    assert database.container_sizes("cup") == Convert_Dict.cup_by_country_dict()
+    assert dict(database.ingredients) == ingredients
+    assert database.ingredients["skimmed milk"] == ingredients["skimmed milk"]
+    assert "skimme milk" not in database.ingredients
+    with pytest.raises(KeyError):
+        database.ingredients["skimme milk"]
+
+
+@pytest.mark.parametrize("ingredient", ["skimmed milk", "Milk, Skimmed", "skimme milk", "sugr", "qqq", "", "!!"])
+def test_database_match_as_index(database, ingredient):
+    index = IngredientIndex(Convert_Dict.ml_to_g_by_ingredient_dict())
+    assert database.ingredients.match(ingredient) == index.match(ingredient)
+
+
+def test_build_from_csv_and_json(tmp_path):
+    (tmp_path / "ingredients.csv").write_text("ingredient,density\nsmoked paprika,0.46\nbuttermilk,1.03\n")
+    (tmp_path / "containers.csv").write_text("unit,country,size\ncup,US,0.24\nteaspoon,US,0.005\n")
+    (tmp_path / "teaspoons.json").write_text(json.dumps({"teaspoon": {"US": 0.005}}))
+    path = build_database(
+        tmp_path / "custom.fudb",
+        ingredients=tmp_path / "ingredients.csv",
+        containers=tmp_path / "containers.csv",
+    )
+    with Database(path) as database:
+        assert database.container_sizes("cup") == {"us": 0.24}
+        assert database.container_sizes("tablespoon") == {}
+        assert database.ingredients.density("smoked paprik") == 0.46
+    # Countries are lower-cased as for CSV files
+    with Database(build_database(tmp_path / "json.fudb", containers=tmp_path / "teaspoons.json")) as database:
+        assert database.container_sizes("teaspoon") == {"us": 0.005}
+
+
+def test_build_errors(tmp_path):
+    with pytest.raises(ValueError):
+        build_database(tmp_path / "bad.fudb", containers={"mug": {"us": 0.3}})
+    (tmp_path / "bad.fudb").write_bytes(b"not a database")
+    with pytest.raises(ValueError):
+        Database(tmp_path / "bad.fudb")
+
+
+def test_use_database(tmp_path, restore_tables):
+    path = build_database(
+        tmp_path / "foods.fudb",
+        ingredients={"smoked paprika": 0.46},
+        containers={"cup": {"us": 0.25}},
+    )
+    use_database(path)
+    assert get_ingredient_density("smoked paprik", Convert_Dict.ml_to_g_by_ingredient_dict()) == 0.46
+    assert units_convertor("1 cup", "ml", country="US") == {"converted value": 250.0, "unit": "ml"}
+    assert units_convertor("1 cup", "g", ingredient="smoked paprika", country="US")["converted value"] == 115
+    with pytest.raises(ConversionFailure):
+        units_convertor("1 cup", "g", ingredient="skimmed milk", country="US")
+    use_database(None)
+    assert units_convertor("1 cup", "ml", country="US") == {"converted value": 240.0, "unit": "ml"}
+
+
+def test_use_database_units(tmp_path, restore_tables):
+    (tmp_path / "units.csv").write_text(
+        "name,category,si,system,factor,aliases,plurals\n"
+        "gō,volume,,container,,go,\n"
+        "stick of butter,weight,,metric,113,stick|sob,sticks of butter\n"
+    )
+    path = build_database(
+        tmp_path / "units.fudb",
+        units=tmp_path / "units.csv",
+        aliases={"tbsn": "tablespoon", "bu": "stick of butter"},
+        containers={"cup": {"us": 0.24}, "gō": {"jp": 0.18}},
+    )
+    with Database(path) as database:
+        assert [unit["name"] for unit in database.units] == ["gō", "stick of butter"]
+        assert database.units[1]["aliases"] == ["stick", "sob"]
+        assert database.container_sizes("gō") == {"jp": 0.18}
+    assert "gō" not in REGISTRY
+    use_database(path)
+    assert units_convertor("2 go", "ml", country="Japan") == {"converted value": 360.0, "unit": "ml"}
+    assert units_convertor("2 sticks of butter", "g") == {"converted value": 226.0, "unit": "g"}
+    assert units_convertor("1 bu", "g") == {"converted value": 113.0, "unit": "g"}
+    assert REGISTRY.get("tbsn") == REGISTRY.get("tablespoon")
+    # Using the database again keeps the units registered by the first use
+    use_database(None)
+    use_database(path)
+    assert units_convertor("2 gō", "ml", country="jp") == {"converted value": 360.0, "unit": "ml"}
+
+
+def test_build_unit_errors(tmp_path, restore_tables):
+    with pytest.raises(ValueError):
+        build_database(tmp_path / "bad.fudb", units={"gō": {"category": "volume", "system": "container", "si": "go"},
+                                                     "go cup": {"category": "volume", "aliases": ["go"]}})
+    with pytest.raises(ValueError):
+        build_database(tmp_path / "bad.fudb", units={"pinch": {"category": "volume", "system": "metric"}})
+    path = build_database(tmp_path / "conflict.fudb", units={"glass": {"category": "volume", "aliases": ["ml"]}})
+    with pytest.raises(ValueError):
+        use_database(path)
+    assert isinstance(Convert_Dict.ml_to_g_by_ingredient_dict(), dict)
+    # Sizes of the container units registered at runtime
+    register_unit("jigger", "volume", system="container")
+    path = build_database(tmp_path / "jigger.fudb", containers={"jiggers": {"us": 0.044}})
+    with Database(path) as database:
+        assert database.container_sizes("jigger") == {"us": 0.044}
+
+
+def test_main(tmp_path, capsys):
+    (tmp_path / "aliases.json").write_text(json.dumps({"tbsn": "tablespoon"}))
+    main([str(tmp_path / "foods.fudb"), "--aliases", str(tmp_path / "aliases.json")])
+    assert "1 aliases" in capsys.readouterr().out
@@ -0,0 +1,69 @@
+"""Test DataFrame and Arrow table conversions"""
+# -*- coding: utf-8 -*-
+from unittest import mock
+import numpy as np
+import pytest
+from foodunits import units_convertor
+from foodunits.exceptions import ErrorCode
+
+pd = pytest.importorskip("pandas")
+from foodunits.frame import convert_columns  # noqa: E402
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "amount": [1, 2.5, 1, 3, 2],
+        "unit": ["cup", "lb", "cup", None, "ml"],
+        "ingredient": ["flour", None, "flour", "milk", "foo_ingredient"],
+        "country": ["US", "US", "US", None, "US"],
+    })
+
+
+def test_convert_columns(df):
+    amount = df["amount"].to_numpy()
+    result = convert_columns(df, "amount", "g", unit="unit", ingredient="ingredient", country="country")
+    assert result is df
+    assert df["amount"].to_numpy() is amount or np.shares_memory(df["amount"].to_numpy(), amount)
+    expected = units_convertor(1, "g", "cup", "flour", country="US", mode="fast")["converted value"]
+    assert df["converted_value"].iloc[[0, 1, 2]].tolist() == pytest.approx([expected, 1133.98, expected])
+    assert df["conversion_error"].tolist() == [
+        ErrorCode.OK, ErrorCode.OK, ErrorCode.OK, ErrorCode.UNKNOWN_UNIT, ErrorCode.MISSING_DENSITY
+    ]
+    assert np.isnan(df["converted_value"].iloc[3]) and np.isnan(df["converted_value"].iloc[4])
+
+
+def test_convert_columns_value_unit_strings():
+    df = pd.DataFrame({"value": ["1 fluid ounce", "2 fl oz", "1 fluid ounce", "foo", None]})
+    convert_columns(df, "value", "ml", output="ml", errors="error")
+    assert df["ml"].tolist()[:3] == pytest.approx([29.5735, 59.147, 29.5735], abs=1e-3)
+    assert df["error"].tolist()[3:] == [ErrorCode.INVALID_VALUE, ErrorCode.INVALID_VALUE]
+
+
+def test_convert_columns_value_unit_strings_and_unit_column():
+    from foodunits import units_convertor_batch
+    values, units = ["1 cup", "2 fl oz", "3", "1 cup"], ["tbsp", None, "ml", None]
+    df = pd.DataFrame({"value": values, "unit": units, "country": "US"})
+    convert_columns(df, "value", "ml", unit="unit", country="country")
+    batch = units_convertor_batch(values, "ml", units, countries="US")
+    assert df["converted_value"].tolist() == pytest.approx([14.79, 59.15, 3, 240], abs=1e-2)
+    assert df["converted_value"].tolist() == pytest.approx(batch.values.tolist())
+    assert df["conversion_error"].tolist() == [ErrorCode.OK] * 4
+
+
+def test_accessor_resolves_each_combination_once(df):
+    from foodunits import batch
+    big = pd.concat([df] * 100, ignore_index=True)
+    with mock.patch.object(batch._Resolver, "resolve", autospec=True, side_effect=batch._Resolver.resolve) as resolve:
+        big.foodunits.convert("amount", "g", unit="unit", ingredient="ingredient", country="country")
+    keys = [call.args[1:] for call in resolve.call_args_list]
+    assert len(keys) == len(set(keys)) == 4
+    assert big["converted_value"].iloc[1::5].tolist() == [1133.98] * 100
+
+
+def test_convert_arrow_table():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"amount": [1.0, 2.0], "unit": ["kg", "g"]})
+    result = convert_columns(table, "amount", "g", unit="unit")
+    assert result.column("converted_value").to_pylist() == [1000.0, 2.0]
+    assert result.column("amount").chunks[0].buffers()[1].address == table.column("amount").chunks[0].buffers()[1].address
@@ -0,0 +1,91 @@
+"""Test ingredient index"""
+# -*- coding: utf-8 -*-
+import pytest
+from foodunits.cache import invalidate_caches
+from foodunits.utils.ingredients import IngredientIndex, ingredient_index, normalize_ingredient
+from foodunits.utils.utils import get_ingredient_density
+from foodunits.utils.units import Convert_Dict
+
+INGREDIENTS = {
+    "sugar": 1.59,
+    "salt": 2.16,
+    "flour": 0.81,
+    "butter": 0.95,
+    "skimmed milk": 1.03,
+}
+
+
+def test_normalize_ingredient():
+    assert normalize_ingredient("Milk, Skimmed ") == "milk skimmed"
+
+
+@pytest.mark.parametrize(
+    "ingredient, expected",
+    [
+        ("sugar", ("sugar", 100)),  # exact
+        ("Milk, skimmed", ("skimmed milk", 100)),  # normalized
+        ("sugr", ("sugar", 89)),  # fuzzy
+        ("", None),
+        ("zzz", None),  # no candidate
+    ],
+)
+def test_index_match(ingredient, expected):
+    assert IngredientIndex(INGREDIENTS).match(ingredient) == expected
+
+
+@pytest.mark.parametrize(
+    "ingredient, threshold, expected",
+    [
+        ("sugr", 85, 1.59),
+        ("sugr", 90, None),
+        ("skimme milk", 85, 1.03),
+        ("foo_ingredient", 85, None),
+        (None, 85, None),
+    ],
+)
+def test_get_ingredient_density(ingredient, threshold, expected):
+    assert get_ingredient_density(ingredient, INGREDIENTS, threshold) == expected
+
+
+def test_index_built_once_and_refreshed():
+    ingredient_dict = dict(INGREDIENTS)
+    index = ingredient_index(ingredient_dict)
+    assert ingredient_index(ingredient_dict) is index
+    # New keys are indexed incrementally
+    ingredient_dict["honey"] = 1.42
+    assert ingredient_index(ingredient_dict) is index
+    assert index.size == len(ingredient_dict)
+    assert get_ingredient_density("hony", ingredient_dict) == 1.42
+    # The index is rebuilt if keys are removed
+    del ingredient_dict["honey"], ingredient_dict["sugar"]
+    assert ingredient_index(ingredient_dict) is not index
+    assert get_ingredient_density("hony", ingredient_dict) is None
+
+
+def test_index_rebuilt_after_invalidate_caches():
+    ingredient_dict = dict(INGREDIENTS)
+    index = ingredient_index(ingredient_dict)
+    # Same size, other keys: only the tables version tells the index is stale
+    del ingredient_dict["sugar"]
+    ingredient_dict["honey"] = 1.42
+    invalidate_caches()
+    assert ingredient_index(ingredient_dict) is not index
+    assert get_ingredient_density("hony", ingredient_dict) == 1.42
+    assert get_ingredient_density("sugar", ingredient_dict) is None
+
+
+def test_index_density_missing_key():
+    index = IngredientIndex(dict(INGREDIENTS))
+    del index.ingredient_dict["sugar"]
+    assert index.density("sugar") is None
+
+
+def test_index_add():
+    index = IngredientIndex(dict(INGREDIENTS))
+    index.ingredient_dict["honey"] = 1.42
+    index.add("honey")
+    assert index.density("honey") == 1.42
+
+
+def test_default_dictionary():
+    assert get_ingredient_density("skimme milk", Convert_Dict.ml_to_g_by_ingredient_dict()) == 1.03
@@ -0,0 +1,34 @@
+"""Test lazy package import"""
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+import pytest
+import foodunits
+
+HEAVY_MODULES = ("numpy", "pycountry", "fuzzywuzzy", "pattern")
+
+
+def _loaded_modules(statement: str):
+    """Modules loaded by a statement in a fresh interpreter."""
+    script = f"import sys; {statement}; print(' '.join(sys.modules))"
+    return set(subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout.split())
+
+
+@pytest.mark.parametrize(
+    "statement, unexpected",
+    [
+        ("import foodunits", HEAVY_MODULES + ("foodunits.convertor", "foodunits.validator")),
+        ("from foodunits import units_validator", HEAVY_MODULES + ("foodunits.convertor", "foodunits.locales")),
+        ("from foodunits import units_convertor", HEAVY_MODULES + ("foodunits.locales",)),
+    ],
+)
+def test_import_is_lazy(statement, unexpected):
+    assert not _loaded_modules(statement) & set(unexpected)
+
+
+def test_public_names():
+    for name in foodunits.__all__:
+        assert getattr(foodunits, name) is not None
+    assert "units_convertor" in dir(foodunits)
+    with pytest.raises(AttributeError):
+        foodunits.foo
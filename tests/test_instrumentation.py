@@ -0,0 +1,93 @@
+"""Test conversion instrumentation"""
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+import pytest
+from foodunits import units_convertor, units_convertor_batch
+from foodunits.lines import convert_ingredient_line
+from foodunits import instrumentation
+from foodunits.cache import invalidate_caches
+from foodunits.exceptions import ConversionFailure
+
+
+@pytest.fixture(autouse=True)
+def clean_instrumentation():
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_records_nothing():
+    instrumentation.enable()
+    instrumentation.disable()
+    units_convertor("1 ml", "fl oz")
+    assert instrumentation.snapshot()["stages"] == {}
+
+
+def test_module_imported_while_enabled():
+    # A module imported while instrumentation is on must not keep recording after `disable`
+    script = (
+        "from foodunits import instrumentation; instrumentation.enable(); "
+        "from foodunits import units_convertor_batch; "
+        "units_convertor_batch(['1 cup'], 'ml', countries='US'); "
+        "assert instrumentation.snapshot()['stages']; "
+        "instrumentation.disable(); instrumentation.reset(); "
+        "units_convertor_batch(['2 cups'], 'ml', countries='UK'); "
+        "assert instrumentation.snapshot()['stages'] == {}, instrumentation.snapshot()"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True)
+
+
+def test_batch_and_lines_are_instrumented():
+    with instrumentation.profile() as report:
+        units_convertor_batch(["1 cup", "2 tbsp"], "ml", countries="US")
+        convert_ingredient_line("2 cups flour", "ml", country="US")
+    assert report.stages["parse"].calls == 3
+    assert report.stages["normalize_unit"].calls >= 3
+    assert {"country", "math"} <= set(report.stages)
+
+
+def test_profile():
+    with instrumentation.profile() as report:
+        units_convertor("2.5 cups", "g", ingredient="skimme milk", country="US")
+        with pytest.raises(ConversionFailure):
+            units_convertor(1, "g", "ml", ingredient="unobtainium")
+    assert not instrumentation.is_enabled()
+    assert report.stages["parse"].calls == 1
+    assert report.stages["normalize_unit"].calls == 4
+    assert report.stages["can_convert"] == instrumentation.StageStats(2, 1, report.stages["can_convert"].seconds)
+    assert report.stages["country"].calls == report.stages["math"].calls == 1
+    assert report.events["ingredient_candidate_scored"] > 0
+    assert 0 < report.stages["density"].seconds <= report.stages["can_convert"].seconds <= report.seconds
+    assert "can_convert" in report.report()
+
+
+def test_hooks():
+    calls = []
+    hook = lambda stage, seconds, failed: calls.append((stage, failed))
+    instrumentation.add_hook(hook)
+    try:
+        with instrumentation.profile():
+            units_convertor(1, "ml", "l")
+    finally:
+        instrumentation.remove_hook(hook)
+    assert ("can_convert", False) in calls and ("math", False) in calls
+
+
+def test_invalidate_caches_while_enabled():
+    instrumentation.enable()
+    invalidate_caches()
+    units_convertor("1 cup", "ml", country="US")
+    assert instrumentation.snapshot()["caches"]["plan"][1] == 1
+
+
+@pytest.mark.parametrize("openmetrics", [False, True])
+def test_export_metrics(openmetrics):
+    with instrumentation.profile():
+        units_convertor(1, "ml", "l")
+    text = instrumentation.export_metrics(openmetrics=openmetrics)
+    assert 'foodunits_stage_calls_total{stage="math"} 1' in text
+    assert 'foodunits_cache_hits_total{cache="plan"}' in text
+    assert ("# TYPE foodunits_stage_calls counter" in text) is openmetrics
+    assert text.endswith("# EOF\n") is openmetrics
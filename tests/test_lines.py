@@ -0,0 +1,68 @@
+"""Test ingredient line parser"""
+# -*- coding: utf-8 -*-
+import io
+from fractions import Fraction
+import pytest
+from foodunits.lines import IngredientLine, parse_ingredient_line, parse_ingredient_lines, convert_ingredient_line
+from foodunits.exceptions import ConversionFailure
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("2 1/2 cups sifted all-purpose flour", IngredientLine(2.5, None, "cup", "all-purpose flour", ("sifted",))),
+        ("2-3 large eggs, beaten", IngredientLine(2, 3, None, "eggs", ("large", "beaten"))),  # range, no unit
+        ("2 to 3 Tbsp. melted butter", IngredientLine(2, 3, "tablespoon", "butter", ("melted",))),
+        ("1 1/2 - 2 lbs chicken", IngredientLine(1.5, 2, "lb", "chicken")),
+        ("1 or 2 cups flour", IngredientLine(1, 2, "cup", "flour")),  # "or" followed by a number is a range
+        ("1 cup or 2 tbsp water", IngredientLine(1, None, "cup", "water", ("or 2 tbsp",))),  # alternative measure
+        ("2 tbsp butter or margarine, melted", IngredientLine(2, None, "tablespoon", "butter", ("or margarine", "melted"))),
+        ("3-2 cups flour", IngredientLine(None, None, "cup", "flour", (), False)),  # reversed range
+        ("1-1/2 cups sugar", IngredientLine(1.5, None, "cup", "sugar")),  # mixed number, not a range
+        ("1½ cups sugar", IngredientLine(1.5, None, "cup", "sugar")),
+        ("1 (14 oz) can diced tomatoes, drained", IngredientLine(1, None, "can", "tomatoes", ("14 oz", "diced", "drained"))),
+        ("3 fl oz. whole milk", IngredientLine(3, None, "fl oz", "whole milk")),  # multiword unit
+        ("5mls vanilla extract", IngredientLine(5, None, "ml", "vanilla extract")),  # glued unit
+        ("one hundred g sugar", IngredientLine(100, None, "g", "sugar")),  # number words
+        ("2 cups of flour", IngredientLine(2, None, "cup", "flour")),
+        ("salt, to taste", IngredientLine(None, None, None, "salt", ("to taste",))),
+        ("one 1/2 cup flour", IngredientLine(None, None, "cup", "flour", (), False)),  # invalid quantity
+        ("1,5 cups flour", IngredientLine(None, None, "cup", "flour", (), False)),  # decimal comma in English
+        ("1.5.2 cups flour", IngredientLine(None, None, "cup", "flour", (), False)),
+        ("", IngredientLine(None, None, None, None)),
+    ],
+)
+def test_parse_ingredient_line(line, expected):
+    assert parse_ingredient_line(line) == expected
+
+
+def test_default_is_english_locale():
+    for line in ("1-1/2 cups sugar", "2 to 3 Tbsp. melted butter", "twenty-five g salt", "1 1/2 - 2 lbs chicken"):
+        assert parse_ingredient_line(line) == parse_ingredient_line(line, locale="en")
+
+
+def test_parse_ingredient_line_exact():
+    assert parse_ingredient_line("1/3 cup milk", is_exact=True).quantity == Fraction(1, 3)
+
+
+def test_parse_ingredient_lines_stream():
+    lines = ["1 cup milk", "2 g salt", "1 cup milk"]
+    results = parse_ingredient_lines(iter(lines), cache_size=1)
+    assert next(results) == IngredientLine(1, None, "cup", "milk")
+    assert list(results) == [IngredientLine(2, None, "g", "salt"), IngredientLine(1, None, "cup", "milk")]
+    assert list(parse_ingredient_lines(io.StringIO("1 cup milk\n2 g salt\n"))) == list(map(parse_ingredient_line, lines[:2]))
+
+
+def test_convert_ingredient_line():
+    # The ingredient of the line is used for the density lookup
+    assert convert_ingredient_line("2 1/2 cups sifted all-purpose flour", "g", country="US") == \
+        {"converted value": 317.4, "unit": "g"}
+    assert convert_ingredient_line("2-3 tbsp melted butter", "g", country="US") == \
+        {"converted value": 27.0, "unit": "g", "converted value max": 40.0}
+    assert convert_ingredient_line(parse_ingredient_line("1 lb chicken"), "oz") == {"converted value": 16, "unit": "oz"}
+
+
+@pytest.mark.parametrize("line", ["salt, to taste", "3 large eggs", "one 1/2 cup flour"])
+def test_convert_ingredient_line_failure(line):
+    with pytest.raises(ConversionFailure):
+        convert_ingredient_line(line, "g", country="US")
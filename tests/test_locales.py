@@ -0,0 +1,127 @@
+"""Test locale packs"""
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+import numpy as np
+import pytest
+from foodunits.batch import units_convertor_batch
+from foodunits.convertor import units_convertor
+from foodunits.exceptions import ErrorCode
+from foodunits.lines import convert_ingredient_line, parse_ingredient_line, parse_ingredient_lines
+from foodunits.locales import LOCALES, LocalePack, get_locale, register_locale
+from foodunits.utils.parser import ParsedQuantity
+
+
+@pytest.mark.parametrize(
+    "locale, value, expected",
+    [
+        ("de", "1,5 l", ParsedQuantity(1.5, "l")),
+        ("de", "2 EL", ParsedQuantity(2, "tablespoon")),
+        ("de", "zwei Tassen", ParsedQuantity(2, "cup")),
+        ("fr", "1,5 c. à soupe", ParsedQuantity(1.5, "tablespoon")),
+        ("es", "una pizca", ParsedQuantity(1, "pinch")),
+        ("ja", "大さじ1", ParsedQuantity(1, "tablespoon")),  # unit before the quantity
+        ("ja", "小さじ½", ParsedQuantity(0.5, "teaspoon")),
+        ("ja", "200cc", ParsedQuantity(200, "ml")),
+        ("en", "2 1/2 cups", ParsedQuantity(2.5, "cups")),
+        ("de", "Mehl", ParsedQuantity(None, "mehl")),
+        ("fr", "5 gr", ParsedQuantity(5, "g")),  # gram in French and Spanish
+        ("es", "5 gr", ParsedQuantity(5, "g")),
+        ("de", "5 gr", ParsedQuantity(5, "gr")),  # grain elsewhere
+        ("en", "5 gr", ParsedQuantity(5, "gr")),
+    ],
+)
+def test_parse_quantity_unit(locale, value, expected):
+    assert get_locale(locale).parse_quantity_unit(value) == expected
+
+
+def test_get_locale():
+    assert get_locale("de-AT") is get_locale("de")
+    assert get_locale("JA_JP") is get_locale("ja")
+    pack = get_locale("fr")
+    assert get_locale(pack) is pack
+    assert LOCALES["fr"] is pack
+    with pytest.raises(ValueError):
+        get_locale("xx")
+
+
+def test_locale_pack_is_immutable():
+    pack = get_locale("de")
+    assert pack.unit("EL") == pack.unit("el") == "tablespoon"
+    assert pack.unit("cups") == "cups"  # other spellings are kept
+    with pytest.raises(AttributeError):
+        pack.country = "us"
+    with pytest.raises(ValueError):
+        LocalePack("xx", unit_aliases={"foo": "not a unit"})
+
+
+def test_register_locale():
+    pack = register_locale(LocalePack("nl", decimal_separator=",", unit_aliases={"el": "tablespoon"}, country="metric"))
+    try:
+        assert units_convertor("1,5 el", to_unit="ml", locale="nl-BE") == {"converted value": 22.5, "unit": "ml"}
+    finally:
+        del LOCALES[pack.name]
+
+
+@pytest.mark.parametrize(
+    "value, to_unit, locale, expected",
+    [
+        ("1,5 l", "ml", "de", 1500.0),
+        ("2 EL", "ml", "de", 30.0),
+        ("大さじ1", "ml", "ja", 15.0),
+        ("1 カップ", "ml", "ja", 200.0),  # Japanese cup
+        ("2 cucharadas", "ml", "es", 30.0),
+    ],
+)
+def test_units_convertor(value, to_unit, locale, expected):
+    assert units_convertor(value, to_unit, locale=locale)["converted value"] == pytest.approx(expected)
+
+
+def test_units_convertor_units_and_country():
+    # Aliases are accepted as units, the country of the call wins over the country of the locale
+    assert units_convertor(1, "ml", from_unit="Tasse", locale="de")["converted value"] == 250.0
+    assert units_convertor(1, "ml", from_unit="Tasse", country="US", locale="de")["converted value"] == 240.0
+    assert units_convertor("1.5 cups", "ml", country="US", locale="en")["converted value"] == 360.0
+
+
+def test_units_convertor_batch():
+    result = units_convertor_batch(["1,5 l", "2 EL", "zwei Tassen", "1,5 l", "Mehl"], "ml", locale="de")
+    np.testing.assert_allclose(result.values[:4], [1500.0, 30.0, 500.0, 1500.0])
+    assert result.errors.tolist() == [0, 0, 0, 0, ErrorCode.INVALID_VALUE]
+    result = units_convertor_batch(np.array([1, 2]), "ml", from_units=["大さじ", "小さじ"], locale="ja")
+    np.testing.assert_allclose(result.values, [15.0, 10.0])
+
+
+@pytest.mark.parametrize(
+    "line, locale, expected",
+    [
+        ("2 EL Mehl", "de", (2, None, "tablespoon", "mehl", ())),
+        ("2-3 Tassen Mehl, gesiebt", "de", (2, 3, "cup", "mehl", ("gesiebt",))),
+        ("eine Prise Salz", "de", (1, None, "pinch", "salz", ())),
+        ("1 c. à soupe de sucre", "fr", (1, None, "tablespoon", "sucre", ())),
+        ("2 cucharadas de azúcar", "es", (2, None, "tablespoon", "azúcar", ())),
+        ("砂糖 大さじ1〜2", "ja", (1, 2, "tablespoon", "砂糖", ())),  # the quantity ends the line
+        ("卵 2個", "ja", (2, None, "piece", "卵", ())),
+        ("Eier 2", "de", (2, None, None, "eier", ())),
+        ("2 cups of flour", "en", (2, None, "cup", "flour", ())),
+    ],
+)
+def test_parse_ingredient_line(line, locale, expected):
+    parsed = parse_ingredient_line(line, locale=locale)
+    assert (parsed.quantity, parsed.quantity_max, parsed.unit, parsed.ingredient, parsed.descriptors) == expected
+
+
+def test_ingredient_lines():
+    lines = list(parse_ingredient_lines(["2 EL Mehl", "1,5 l Milch", "2 EL Mehl"], locale="de"))
+    assert [line.unit for line in lines] == ["tablespoon", "l", "tablespoon"]
+    assert lines[1].quantity == 1.5
+    assert convert_ingredient_line("水 大さじ2", "ml", locale="ja") == {"converted value": 30.0, "unit": "ml"}
+
+
+def test_packs_compiled_on_request():
+    script = (
+        "from foodunits import units_convertor_batch; from foodunits.locales import LOCALES, get_locale; "
+        "print(sorted(LOCALES)); get_locale('de-AT'); print(sorted(LOCALES))"
+    )
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+    assert output.split("\n")[:2] == ["[]", "['de']"]
@@ -0,0 +1,84 @@
+"""Test numeric literal engine"""
+# -*- coding: utf-8 -*-
+from fractions import Fraction
+import pytest
+from foodunits.utils.numbers import ENGLISH, Lexicon, parse_number, parse_range
+from foodunits.utils.utils import validate_numeric_string
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("5", 5),
+        (" 5.5 ", 5.5),
+        ("1 1/2", 1.5),  # mixed number
+        ("1-1/2", 1.5),
+        ("1/2", 0.5),
+        ("½", 0.5),  # unicode fractions
+        ("1¼", 1.25),
+        ("2 ⅓", pytest.approx(7 / 3)),
+        ("1⁄4", 0.25),  # fraction slash
+        ("Twenty-Five", 25),  # number words
+        ("one hundred and 2", 102),
+        ("1,5", None),  # not an English decimal
+        ("2-3", None),  # a range is not a number
+        ("1/0", None),
+        ("and", None),
+        ("", None),
+        ("abc", None),
+        (None, None),
+    ],
+)
+def test_parse_number(text, expected):
+    assert parse_number(text) == expected
+
+
+def test_parse_number_types():
+    assert isinstance(parse_number("5"), int)
+    assert isinstance(parse_number("5.0"), float)
+    assert isinstance(parse_number("five"), int)
+    assert parse_number("1¼", is_exact=True) == Fraction(5, 4)
+    assert parse_number("0.1", is_exact=True) == Fraction(1, 10)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2-3", (2, 3)),
+        ("2 – 3", (2, 3)),
+        ("½ to ¾", (0.5, 0.75)),
+        ("one or two", (1, 2)),
+        ("4", (4, None)),
+        ("2-x", None),
+        ("1/0-2", None),
+    ],
+)
+def test_parse_range(text, expected):
+    assert parse_range(text) == expected
+
+
+def test_lexicon_decimal_separator():
+    comma = Lexicon(decimal_separator=",", range_words=("bis",))
+    assert comma.parse("1,5") == 1.5
+    assert comma.parse("1.5") is None
+    assert comma.parse_range("1,5 bis 2") == (1.5, 2)
+    with pytest.raises(ValueError):
+        Lexicon(decimal_separator=";")
+
+
+def test_lexicon_is_immutable():
+    with pytest.raises(AttributeError):
+        ENGLISH.decimal_separator = ","
+    with pytest.raises(TypeError):
+        ENGLISH.words["dozen"] = 12
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("5", (True, 5)), ("5.5", (True, 5.5)), ("1 1/2", (True, 1.5)), ("five", (True, 5)), ("1/0", (False, 0)),
+     ("foo", (False, 0))],
+)
+def test_validate_numeric_string(text, expected):
+    result = validate_numeric_string(text)
+    assert result == expected
+    assert type(result[1]) is type(expected[1])
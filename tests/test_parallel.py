@@ -0,0 +1,44 @@
+"""Test multiprocess food unit convertor"""
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from foodunits import units_convertor
+from foodunits.parallel import units_convertor_parallel
+from foodunits.exceptions import ErrorCode
+
+ROWS = [
+    ("1 cup", "ml", None, None, None, "US"),
+    (2.5, "g", "lb"),
+    ("2.5 fl oz", "g", None, "skimme milk"),
+    ("missing value", "ml", "cup"),
+]
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_parallel_preserves_order(workers):
+    rows = ROWS * 10
+    results = list(units_convertor_parallel(rows, workers=workers, chunksize=3, decimal_places=3))
+    assert len(results) == len(rows)
+    for row, (value, unit, error) in zip(rows, results):
+        if error == ErrorCode.OK:
+            expected = units_convertor(*row, decimal_places=3)
+            assert (value, unit) == (expected["converted value"], expected["unit"])
+        else:
+            assert error == ErrorCode.INVALID_VALUE
+            assert unit is None
+
+
+def test_parallel_backpressure():
+    read = []
+
+    def rows():
+        for i in range(100):
+            read.append(i)
+            yield (i, "g", "kg")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = units_convertor_parallel(rows(), chunksize=5, max_pending=2, executor=executor)
+        assert next(results) == (0, "g", 0)
+        # Only the chunks in flight are read
+        assert len(read) <= 3 * 5
+        assert [value for value, _, _ in results] == [i * 1000 for i in range(1, 100)]
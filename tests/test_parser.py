@@ -0,0 +1,47 @@
+"""Test quantity and unit parser"""
+# -*- coding: utf-8 -*-
+import pytest
+from foodunits.utils.parser import ParsedQuantity, parse_quantity_unit, parse_quantity_units, clean, normalize_unit
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("1 ml.", ParsedQuantity(1, "ml")),
+        ("1. 5 fluid ounce. ", ParsedQuantity(1.5, "fluid ounce")),  # float string
+        ("1 1/2 fluid ounce", ParsedQuantity(1.5, "fluid ounce")),  # mixed number
+        ("1/2 cup", ParsedQuantity(0.5, "cup")),  # fraction
+        ("5mls", ParsedQuantity(5, "mls")),  # glued unit
+        ("1.5ml", ParsedQuantity(1.5, "ml")),
+        ("one hundred and 2 fl ozs", ParsedQuantity(102, "fl ozs")),  # number words
+        ("2.5", ParsedQuantity(2.5, None)),  # quantity only
+        ("Fluid Ounce", ParsedQuantity(None, "fluid ounce")),  # unit only
+        ("1,5 l", ParsedQuantity(None, None, False)),  # a leading number which is not an English quantity
+        ("1.5.2 cups", ParsedQuantity(None, None, False)),
+        ("-1 cup", ParsedQuantity(-1, "cup")),  # negative
+        ("1-2 cups", ParsedQuantity(1, "cups", True, 2)),  # range
+        ("1 to 2 cups", ParsedQuantity(1, "cups", True, 2)),
+        ("2-1 cups", ParsedQuantity(None, "cups", False)),  # reversed range
+        ("1-1/2 cups", ParsedQuantity(1.5, "cups")),  # mixed number, not a range
+        ("one 1/2 cup", ParsedQuantity(None, "cup", False)),  # invalid quantity
+        ("1/0 cup", ParsedQuantity(None, "cup", False)),
+        ("", ParsedQuantity(None, None)),
+    ],
+)
+def test_parse_quantity_unit(value, expected):
+    assert parse_quantity_unit(value) == expected
+
+
+def test_parse_quantity_unit_types():
+    assert isinstance(parse_quantity_unit("5 ml").quantity, int)
+    assert isinstance(parse_quantity_unit("5.0 ml").quantity, float)
+
+
+def test_parse_quantity_units():
+    values = ["1 ml", "2 cups", "1 ml"]
+    assert parse_quantity_units(values) == [parse_quantity_unit(value) for value in values]
+
+
+def test_clean_and_normalize_unit():
+    assert clean(" 1. 5  Fl. Oz. ") == "1.5 fl oz"
+    assert normalize_unit(" fl.  oz. ") == "fl oz"
@@ -0,0 +1,69 @@
+"""Test compiled conversion plans"""
+# -*- coding: utf-8 -*-
+import pytest
+from fractions import Fraction
+from foodunits.utils.planner import (
+    get_plan, supported_pairs, volume_graph, NO_DENSITY, VOLUME_TO_MASS, MASS_TO_VOLUME
+)
+from foodunits.exceptions import ConversionFailure
+
+
+@pytest.mark.parametrize(
+    "from_unit, to_unit, country, factor, density_step",
+    [
+        ("gal", "qt", None, 4, NO_DENSITY),  # same system
+        ("ml", "l", None, .001, NO_DENSITY),
+        ("fl oz", "ml", None, 29.5735, NO_DENSITY),  # imperial to metric
+        ("lb", "g", None, 453.592, NO_DENSITY),
+        ("cup", "ml", "us", 240, NO_DENSITY),  # container
+        ("cup", "tablespoon", "metric", 16 + 2 / 3, NO_DENSITY),  # container to container
+        ("teaspoon", "fl oz", "us", 0.00492892 * 33.814, NO_DENSITY),
+        ("fl oz", "g", None, 29.5735, VOLUME_TO_MASS),  # volume to mass
+        ("g", "ml", None, 1, MASS_TO_VOLUME),  # mass to volume
+    ],
+)
+def test_plan_factor(from_unit, to_unit, country, factor, density_step):
+    plan = get_plan(from_unit, to_unit, country)
+    assert plan.factor == pytest.approx(factor)
+    assert plan.density_step == density_step
+
+
+def test_plan_apply_density():
+    assert get_plan("ml", "g").apply(10, 1.03) == pytest.approx(10.3)
+    assert get_plan("g", "ml").apply(10.3, 1.03) == pytest.approx(10)
+    with pytest.raises(ConversionFailure):
+        get_plan("ml", "g").apply(10)
+
+
+def test_plan_country_ignored_without_container():
+    assert get_plan("ml", "fl oz", "us") is get_plan("ml", "fl oz", "jp")
+
+
+def test_plan_failures():
+    assert get_plan("ml", "cm") is None
+    assert get_plan("foo", "ml") is None
+    with pytest.raises(ConversionFailure):
+        get_plan("cup", "ml", "foo")
+
+
+def test_volume_graph():
+    graph = volume_graph("uk")
+    assert graph is volume_graph("uk")
+    assert graph["cup"]["tablespoon"] == pytest.approx(0.2841 / 0.015)
+    assert graph["gal"]["cup"] == pytest.approx(get_plan("gal", "cup", "uk").factor)
+    assert "teaspoon" not in graph  # no teaspoon size for the country
+    assert "cup" not in volume_graph()
+    assert volume_graph("metric", is_exact=True)["tablespoon"]["teaspoon"] == Fraction(3)
+    with pytest.raises(ConversionFailure):
+        get_plan("teaspoon", "cup", "uk")
+
+
+def test_supported_pairs():
+    pairs = set(supported_pairs("us"))
+    assert ("cup", "g") in pairs
+    assert ("gal", "qt") in pairs
+    assert ("cup", "teaspoon") in pairs
+    assert ("ml", "cm") not in pairs
+    assert not any("cup" in pair for pair in supported_pairs())
+    for from_unit, to_unit in pairs:
+        assert get_plan(from_unit, to_unit, "us").apply(1, 1) > 0
@@ -0,0 +1,82 @@
+"""Test recipe scaling"""
+# -*- coding: utf-8 -*-
+from unittest import mock
+import pytest
+from foodunits import units_convertor
+from foodunits.exceptions import ErrorCode
+from foodunits.recipe import Recipe, scale_recipe
+
+LINES = [
+    "16 tsp granulated sugar",
+    "2 1/2 cups sifted all-purpose flour",
+    "2-3 large eggs",
+    "1 pinch salt",
+    "500 g butter",
+    "1 tsp vanilla extract",
+    "salt, to taste",
+]
+
+
+def _quantities(scaled):
+    return [(ingredient.quantity, ingredient.quantity_max, ingredient.unit, ingredient.error) for ingredient in scaled]
+
+
+def test_scale_nice_units():
+    assert _quantities(Recipe(LINES, country="US").scale(3)) == [
+        (1.0, None, "cup", ErrorCode.OK),  # 48 tsp
+        (7.5, None, "cup", ErrorCode.OK),
+        (6, 9, None, ErrorCode.OK),  # no unit, only scaled
+        (3, None, "pinch", ErrorCode.OK),  # not convertible, only scaled
+        (1.5, None, "kg", ErrorCode.OK),
+        (1.0, None, "tablespoon", ErrorCode.OK),  # 3 tsp
+        (None, None, None, ErrorCode.OK),
+    ]
+
+
+def test_scale_to_metric_weight():
+    scaled = scale_recipe(LINES, 2, system="metric", measure="weight", country="US")
+    flour = units_convertor("5 cups", "g", ingredient="all-purpose flour", country="US", mode="fast")
+    assert scaled[1].quantity == pytest.approx(flour["converted value"], abs=0.01)
+    assert scaled[1].unit == "g"
+    assert (scaled[4].quantity, scaled[4].unit) == (1.0, "kg")
+
+
+def test_scale_mixed_number():
+    scaled, = scale_recipe(["1-1/2 cups sugar"], 2, country="US")
+    assert (scaled.quantity, scaled.quantity_max, scaled.unit) == (3.0, None, "cup")
+
+
+def test_scale_without_nice_units():
+    scaled = Recipe(LINES, country="US").scale(3, system="us", nice=False)
+    assert (scaled[0].quantity, scaled[0].unit) == (48, "teaspoon")
+    assert scaled[4].unit == "oz"  # converted to the smallest unit of the system
+
+
+def test_scale_missing_density_keeps_unit():
+    scaled = scale_recipe(["2 cups foo_ingredient"], 0.5, measure="weight", country="US")
+    assert _quantities(scaled) == [(1.0, None, "cup", ErrorCode.MISSING_DENSITY)]
+
+
+def test_recipe_resolves_once():
+    from foodunits import batch
+    with mock.patch.object(batch, "get_ingredient_density", wraps=batch.get_ingredient_density) as density:
+        Recipe(["1 cup whole milk"] * 50, country="US").scale(2, system="metric", measure="weight")
+    assert [call.args for call in density.call_args_list] == [("whole milk",)]
+
+
+def test_scale_invalid_arguments():
+    with pytest.raises(ValueError):
+        Recipe(LINES).scale(system="martian")
+    with pytest.raises(ValueError):
+        Recipe(LINES).scale(measure="length")
+    for factor in (0, -2):
+        with pytest.raises(ValueError):
+            Recipe(LINES).scale(factor)
+
+
+def test_scale_to_metric_without_country():
+    # Cups and spoons take their metric sizes when the recipe has no country
+    scaled = scale_recipe(["2 cups milk", "1 tbsp oil", "1/2 tsp salt"], system="metric")
+    assert _quantities(scaled) == [
+        (500.0, None, "ml", ErrorCode.OK), (15.0, None, "ml", ErrorCode.OK), (2.5, None, "ml", ErrorCode.OK),
+    ]
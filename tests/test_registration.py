@@ -0,0 +1,83 @@
+"""Test runtime registration of units, container sizes and densities"""
+# -*- coding: utf-8 -*-
+import pytest
+from foodunits import units_convertor, units_validator, units_convertor_batch
+from foodunits.cache import ResultCache
+from foodunits.registration import register_unit, register_alias, register_container_size, register_density
+from foodunits.utils.ingredients import ingredient_index
+from foodunits.utils import planner
+from foodunits.utils.registry import REGISTRY
+from foodunits.utils.units import Convert_Dict
+from foodunits.exceptions import ConversionFailure, ErrorCode
+
+pytestmark = pytest.mark.usefixtures("restore_registry")
+
+
+def test_register_container_unit():
+    register_unit("gō", "volume", sizes={"Japan": 0.18})
+    assert units_convertor("2 gō", "ml", country="Japan") == {"converted value": 360.0, "unit": "ml"}
+    assert units_convertor(2, "gō", "ml", country="jp") == {"converted value": 0, "unit": "gō"}
+    with pytest.raises(ConversionFailure):
+        units_convertor("2 gō", "ml", country="US")
+    register_container_size("gō", "Korea, Republic of", 0.18)
+    assert units_convertor("1 gō", "ml", country="kr")["converted value"] == 180.0
+
+
+def test_register_unit_with_factor():
+    register_unit("stick of butter", "weight", factor=113.4, plurals=["sticks of butter"])
+    assert units_convertor("2 sticks of butter", "g") == {"converted value": 227.0, "unit": "g"}
+    assert units_validator("sticks of butter")
+    result = units_convertor_batch([1, 2], "g", "stick of butter")
+    assert result.values.tolist() == [113.4, 226.8]
+
+
+def test_register_alias():
+    register_unit("dessertspoon", "volume", si="dstspn", sizes={"uk": 0.01})
+    register_alias("dspn", "dessertspoon")
+    assert units_convertor(3, "ml", "dspns", country="UK") == {"converted value": 30.0, "unit": "ml"}
+    with pytest.raises(ValueError):
+        register_alias("ml", "dessertspoon")
+
+
+def test_register_invalid():
+    with pytest.raises(ValueError):
+        register_unit("jigger", "volume", sizes={"us": 0})
+    with pytest.raises(ValueError):
+        register_unit("jigger", "volume", factor=0.044, sizes={"us": 0.044}, system="metric")
+    with pytest.raises(ValueError):
+        register_unit("jigger", "volume", sizes={"us": 0.044, "": 0.044})
+    assert units_validator("jigger") is not True
+    assert "jigger" not in REGISTRY
+    with pytest.raises(ValueError):
+        register_container_size("ml", "us", 0.001)
+    with pytest.raises(ValueError):
+        register_density("", 1)
+    with pytest.raises(ValueError):
+        register_density("honey", "heavy")
+
+
+def test_register_invalidates_caches():
+    cache = ResultCache()
+    with pytest.raises(ConversionFailure):
+        cache.convert("1 cup", "ml", country="Brazil")
+    register_container_size("cup", "Brazil", 0.24)
+    assert cache.convert("1 cup", "ml", country="Brazil") == {"converted value": 240.0, "unit": "ml"}
+
+    assert cache.convert("100 ml", "g", ingredient="water")["converted value"] == 100
+    register_density("water", 1.5)
+    assert cache.convert("100 ml", "g", ingredient="water")["converted value"] == 150
+    register_density("smoked paprika", 0.46)
+    assert units_convertor("100 ml", "g", ingredient="smoked paprik")["converted value"] == 46
+    assert units_convertor_batch([100], "g", "ml", ingredients="smoked paprika").errors[0] == ErrorCode.OK
+
+
+def test_register_density_is_incremental():
+    densities = Convert_Dict.ml_to_g_by_ingredient_dict()
+    index = ingredient_index(densities)
+    units_convertor("1 cup", "ml", country="US")
+    plans = planner._cached_plan.cache_info().currsize
+    register_density("smoked paprika", 0.46)
+    # The key is added to the loaded index, and the conversion plans are kept
+    assert ingredient_index(densities) is index
+    assert index.size == len(densities)
+    assert planner._cached_plan.cache_info().currsize == plans
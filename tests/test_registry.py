@@ -0,0 +1,100 @@
+"""Test unit registry"""
+# -*- coding: utf-8 -*-
+import pytest
+from foodunits.utils.units import UNITS
+from foodunits.utils.registry import REGISTRY, UnitRegistry
+
+
+@pytest.mark.parametrize(
+    "spelling, si, category",
+    [
+        ("ml", "ml", "volume"),
+        ("milliliter", "ml", "volume"),
+        ("mls", "ml", "volume"),
+        ("fluid ounces", "fl oz", "volume"),
+        ("floz", "fl oz", "volume"),
+        ("tsp", "teaspoon", "volume"),
+        ("cup", "cup", "volume"),
+        ("lbs", "lb", "weight"),
+        ("inches", "in", "distance"),
+        ("slice", "slice", "other"),
+    ],
+)
+def test_registry_lookup(spelling, si, category):
+    record = REGISTRY.get(spelling)
+    assert record.si == si
+    assert record.category == category
+
+
+@pytest.mark.parametrize(
+    "spelling, system, factor",
+    [
+        ("kg", "metric", 1000),
+        ("ml", "metric", .001),
+        ("gal", "imperial", 128),
+        ("oz", "imperial", .0625),
+        ("cup", "container", None),
+        ("inch", None, None),
+    ],
+)
+def test_registry_system_factor(spelling, system, factor):
+    record = REGISTRY.get(spelling)
+    assert record.system == system
+    assert record.factor == factor
+
+
+def test_registry_unknown_unit():
+    assert REGISTRY.get("mll") is None
+    assert "mll" not in REGISTRY
+
+
+def test_registry_is_immutable():
+    with pytest.raises(TypeError):
+        REGISTRY._lookup["foo"] = None
+
+
+def test_registry_covers_all_units():
+    registry = UnitRegistry(UNITS)
+    assert len(registry) == sum(len(category["units"]) for category in UNITS)
+    for category in UNITS:
+        for unit in category["units"]:
+            assert unit["name"] in registry
+
+
+def test_registry_add():
+    registry = UnitRegistry(UNITS)
+    size = len(registry)
+    record = registry.add("dessertspoon", "volume", si="dstspn", system="container", aliases=["dsp"])
+    assert len(registry) == size + 1
+    assert registry.get("dessertspoons") is registry.get("dsp") is record
+    assert record.si == "dessertspoon" and registry.is_container("dstspn")
+    record = registry.add("stick of butter", "weight", system="metric", factor=113.4, plurals=["sticks of butter"])
+    assert registry.get("sticksofbutter") is record
+    assert record.factor == 113.4 and not registry.is_container("stick of butter")
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"name": "", "category": "volume"},
+        {"name": "jar", "category": "other", "system": "metric", "factor": 1},
+        {"name": "jug", "category": "volume", "system": "metric", "factor": -1},
+        {"name": "jug", "category": "volume", "system": "imperial"},
+        {"name": "jug", "category": "volume", "system": "nautical", "factor": 1},
+        {"name": "milliliter", "category": "volume", "system": "metric", "factor": 0.001},
+        {"name": "jug", "category": "volume", "si": "l", "system": "metric", "factor": 1},
+    ],
+)
+def test_registry_add_invalid(kwargs):
+    registry = UnitRegistry(UNITS)
+    with pytest.raises(ValueError):
+        registry.add(**kwargs)
+
+
+def test_registry_add_alias():
+    registry = UnitRegistry(UNITS)
+    assert registry.add_alias("tbl", "tablespoon") is registry.get("tbls") is registry.get("tbsp")
+    with pytest.raises(ValueError):
+        registry.add_alias("tsp", "tablespoon")
+    with pytest.raises(ValueError):
+        registry.add_alias("mug", "unknown unit")
@@ -0,0 +1,76 @@
+"""Test utils"""
+# -*- coding: utf-8 -*-
+import logging
+import pytest
+from foodunits.cache import invalidate_caches
+from foodunits.utils.utils import find_country, _search_country, process_saved_units
+from foodunits.utils.singular import singularize, register_plural
+
+
+@pytest.mark.parametrize(
+    "country, expected",
+    [
+        ("US", "us"),
+        ("united states", "us"),
+        (" JPN ", "jp"),
+        ("metric", "metric"),
+        ("us customary", "us customary"),
+        ("uk", "uk"),
+        ("United Kingdom", "uk"),
+        ("south korea", "kr"),
+        (None, None),
+    ],
+)
+def test_find_country(country, expected):
+    assert find_country(country) == expected
+
+
+def test_find_country_miss_is_memoized(caplog):
+    _search_country.cache_clear()
+    with caplog.at_level(logging.WARNING):
+        assert find_country("foo_country") == "foo_country"
+        assert find_country("foo_country") == "foo_country"
+    assert len(caplog.records) == 1
+    assert _search_country.cache_info().hits == 1
+
+
+@pytest.mark.parametrize(
+    "word, expected",
+    [
+        ("cups", "cup"),
+        ("Fluid Ounces", "fluid ounce"),  # table, lower cased
+        ("fl ozs", "fl oz"),
+        ("flozs", "floz"),
+        ("tsps", "tsp"),
+        ("inches", "inch"),
+        ("ml", "ml"),
+        ("glass", "glass"),  # rules
+        ("berries", "berry"),
+        ("bowls", "bowl"),
+        ("mlls", "mll"),
+    ],
+)
+def test_singularize(word, expected):
+    assert singularize(word) == expected
+
+
+def test_register_plural():
+    register_plural("gō", "gō")
+    assert singularize("gō") == "gō"
+    register_plural("dessertspoon")
+    assert singularize("dessertspoons") == "dessertspoon"
+
+
+def test_process_saved_units_is_cached():
+    units = [{"name": "volume", "units": [{"name": "cup", "si": None}]}]
+    processed = process_saved_units(units)
+    assert processed == {"cup"}
+    assert process_saved_units(units) is processed
+    # Changes of the list are picked up once the tables version is bumped
+    units[0]["units"].append({"name": "Fluid Ounce", "si": "fl oz"})
+    invalidate_caches()
+    assert process_saved_units(units) == {"cup", "fluidounce", "floz"}
+
+
+def test_process_saved_units_default():
+    assert "ml" in process_saved_units()
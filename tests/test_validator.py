@@ -1,7 +1,7 @@
 """Test food unit validator"""
 # -*- coding: utf-8 -*-
 import pytest
-from foodunits import units_validator
+from foodunits import units_validator, units_validator_many, ValidationResult, ErrorCode
 from foodunits.exceptions import ValidationFailure
 
 @pytest.mark.parametrize(
@@ -15,6 +15,8 @@ from foodunits.exceptions import ValidationFailure
         ("2mls",),
         ("2 fl ozs",),
         ("one hundred and 2 fl ozs",),
+        ("1-2 cups",),  # ranges and negative quantities are valid, as before the single-pass parser
+        ("-1 cup",),
     ],
 )
 def test_returns_true_on_valid_food_unit(value: str):
@@ -27,8 +29,46 @@ def test_returns_true_on_valid_food_unit(value: str):
         ("",),
         ("not_a_unit",),
         ("5mlls",),
+        ("1,5 cups",),  # not an English quantity
+        ("2-1 cups",),
     ],
 )
 def test_returns_failed_validation_on_invalid_food_unit(value: str):
     """Test returns failed validation on invalid food unit."""
     assert isinstance(units_validator(value), ValidationFailure)
+
+
+def test_custom_units():
+    """Test validation against a custom units list."""
+    units = [{"name": "other", "units": [{"name": "stick", "si": None}]}]
+    assert units_validator("2 sticks", units=units)
+    assert isinstance(units_validator("2 cups", units=units), ValidationFailure)
+
+
+def test_validator_many(tmp_path, recwarn):
+    """Test streaming validation of iterables, paths and file objects."""
+    values = ["5 mls", "cup", "5mlls", "", "one 1/2 cup", "5 mls"]
+    expected = [
+        ValidationResult(True, 5, "ml", ErrorCode.OK),
+        ValidationResult(True, None, "cup", ErrorCode.OK),
+        ValidationResult(False, 5, "mll", ErrorCode.UNKNOWN_UNIT),
+        ValidationResult(False, None, None, ErrorCode.INVALID_VALUE),
+        ValidationResult(False, None, "cup", ErrorCode.INVALID_VALUE),
+        ValidationResult(True, 5, "ml", ErrorCode.OK),
+    ]
+    assert list(units_validator_many(values)) == expected
+    assert not recwarn.list
+
+    path = tmp_path / "units.txt"
+    path.write_text("\n".join(values) + "\n", encoding="utf-8")
+    assert list(units_validator_many(path)) == expected
+    assert list(units_validator_many(str(path))) == expected
+    with open(path, encoding="utf-8") as file:
+        assert list(units_validator_many(file)) == expected
+
+
+def test_validator_many_matches_validator():
+    values = ["cup", "ounces", "Fluid Ounce", "2 fl ozs", "not_a_unit", "5mlls"]
+    results = units_validator_many(values, cache_size=2)
+    for value, result in zip(values, results):
+        assert result.valid == bool(units_validator(value))